@@ -0,0 +1,43 @@
+"""Shared helpers for the store benchmarks.
+
+The benchmarks import the store package directly from tools/store so they run
+without the tau_bench tool runtime.
+"""
+import json
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(ROOT, "data")
+sys.path.insert(0, os.path.join(ROOT, "tools"))
+
+
+def seed_table(table_name: str) -> Dict[str, Dict[str, Any]]:
+    with open(os.path.join(DATA_DIR, f"{table_name}.json")) as f:
+        return json.load(f)
+
+
+def synthetic_table(table_name: str, count: int) -> Dict[str, Dict[str, Any]]:
+    """Scale a seed table to count rows by cycling its rows under fresh ids"""
+    seed = list(seed_table(table_name).values())
+    pk = next(iter(seed[0]))
+    table = {}
+    for i in range(count):
+        key = str(i + 1)
+        row = dict(seed[i % len(seed)])
+        row[pk] = key
+        table[key] = row
+    return table
+
+
+def timed(fn: Callable[[], Any], repeat: int = 3) -> Tuple[float, Any]:
+    """Best wall time of fn over repeat runs, with the last result"""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
@@ -0,0 +1,52 @@
+"""Bytes per row of dict rows against compact records for the high-cardinality tables.
+
+    python benchmarks/compact_rows.py [row count]
+
+Rows are decoded from JSON text, as at load time, and measured with
+tracemalloc. "rows" is the storage alone ({id: dict} against {id: record});
+"table" adds each table's hash indexes (IndexedTable against CompactTable).
+"""
+import gc
+import json
+import sys
+import tracemalloc
+
+from common import synthetic_table
+
+from store import CompactTable, build_table, record_type
+from store.schema import COMPACT_TABLES
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size, result
+
+
+def run(table_name: str, count: int) -> None:
+    text = json.dumps(synthetic_table(table_name, count))
+    record = record_type(table_name)
+
+    dict_rows, rows = measure(lambda: json.loads(text))
+    compact_rows, _ = measure(lambda: {key: record.from_dict(row) for key, row in json.loads(text).items()})
+    del rows
+    dict_table, table = measure(lambda: build_table(table_name, json.loads(text)))
+    del table
+    compact_table, table = measure(lambda: CompactTable(table_name, json.loads(text)))
+    del table
+    print(f"{table_name:<20} {count:>9,} rows | rows  dict {dict_rows / count:6.0f} B/row"
+          f"  compact {compact_rows / count:6.0f} B/row"
+          f" | table  indexed {dict_table / count:6.0f} B/row  compact {compact_table / count:6.0f} B/row")
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    for table_name in COMPACT_TABLES:
+        run(table_name, count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""SLA deadline queries from the scheduler's heap versus a scan of open incidents.
+
+    python benchmarks/deadlines.py [incidents]
+
+incidents is scaled to the given row count (default 200,000) against the
+seed subscriptions, SLAs and components, with detection times spread over
+30 days. The deadlines due within an hour are listed from the DeadlineScheduler and by computing every open
+incident's deadlines, and the scheduler is timed absorbing status writes.
+"""
+import sys
+
+from common import seed_table, synthetic_table, timed
+
+from store import DeadlineScheduler, build_table, deadline_scheduler, to_epoch, to_timestamp
+
+AS_OF = "2025-09-02T00:00:00"
+
+
+def scan(scheduler, within_minutes):
+    # What a caller without the scheduler does: every open incident, every call
+    horizon = to_epoch(AS_OF) + within_minutes * 60
+    due = []
+    for key, row in scheduler.incidents.items():
+        for kind, deadline in scheduler._compute(row).items():
+            if deadline <= horizon:
+                due.append((deadline, key, kind))
+    return sorted(due)
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    data = {name: build_table(name, seed_table(name))
+            for name in ("subscriptions", "service_level_agreements", "infrastructure_components")}
+    incidents = synthetic_table("incidents", count)
+    start = to_epoch("2025-09-01T00:00:00")
+    for i, row in enumerate(incidents.values()):
+        row["detection_timestamp"] = to_timestamp(start + i * 30 * 86400 // count)
+    data["incidents"] = build_table("incidents", incidents)
+    build_time, scheduler = timed(lambda: deadline_scheduler(data), repeat=1)
+    assert isinstance(scheduler, DeadlineScheduler) and scheduler.observing
+    heap_time, due = timed(lambda: scheduler.due(60, AS_OF))
+    scan_time, scanned = timed(lambda: scan(scheduler, 60), repeat=1)
+    assert [(d["incident_id"], d["deadline_type"]) for d in due] == [(k, kind) for _, k, kind in scanned]
+    keys = list(data["incidents"])[:10_000]
+
+    def writes():
+        for key in keys:
+            data["incidents"][key]["status"] = "investigating"
+            data["incidents"][key]["status"] = "open"
+    write_time, _ = timed(writes, repeat=1)
+    print(f"incidents {count:>10,}: {len(scheduler.deadlines):,} with deadlines, {len(due):,} due within 60 min")
+    print(f"  heap        {heap_time * 1e3:10.3f} ms  (built once in {build_time * 1e3:.1f} ms)")
+    print(f"  scan        {scan_time * 1e3:10.3f} ms")
+    print(f"  reschedule  {write_time / (2 * len(keys)) * 1e6:10.3f} us per status write")
+
+
+if __name__ == "__main__":
+    main()
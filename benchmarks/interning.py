@@ -0,0 +1,47 @@
+"""Memory freed per table by interning id and enum strings at load time.
+
+    python benchmarks/interning.py [rows per table]
+
+Without a row count the seed tables under data/ are measured as shipped;
+with one, every table is scaled to that many rows first. Each table is
+decoded from JSON text, then interned, and the drop in live memory is
+reported next to the estimate intern_rows() returns.
+"""
+import gc
+import json
+import os
+import sys
+import tracemalloc
+
+from common import DATA_DIR, seed_table, synthetic_table
+
+from store import intern_keys, intern_rows, interned_columns
+
+
+def run(table_name: str, text: str) -> None:
+    gc.collect()
+    tracemalloc.start()
+    rows = json.loads(text)
+    loaded = tracemalloc.get_traced_memory()[0]
+    rows = intern_keys(rows)
+    estimate = intern_rows(table_name, rows)
+    gc.collect()
+    interned = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"{table_name:<26} {len(rows):>9,} rows {loaded / 1e6:9.2f} MB -> {interned / 1e6:9.2f} MB"
+          f"  saved {(loaded - interned) / 1e6:8.2f} MB ({(loaded - interned) / max(loaded, 1):5.1%},"
+          f" estimate {estimate / 1e6:.2f} MB)  columns: {', '.join(interned_columns(table_name))}")
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    for file_name in sorted(os.listdir(DATA_DIR)):
+        if not file_name.endswith(".json"):
+            continue
+        table_name = file_name[:-len(".json")]
+        rows = seed_table(table_name) if count is None else synthetic_table(table_name, count)
+        run(table_name, json.dumps(rows))
+
+
+if __name__ == "__main__":
+    main()
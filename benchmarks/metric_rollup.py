@@ -0,0 +1,51 @@
+"""Per-incident metric summaries from the rollup versus a scan of the table.
+
+    python benchmarks/metric_rollup.py [metric rows]
+
+performance_metrics is scaled to the given row count (default 100,000) and
+an incident's {metric_type: [values]} is computed the way log_metric used to,
+by scanning every row, and from the table's MetricRollup. The rollup is also
+timed while absorbing a run of inserts.
+"""
+import sys
+
+from common import synthetic_table, timed
+
+from store import build_table, incident_metric_values, metric_rollup
+
+
+def scan(table, incident_id):
+    calculated_values = {}
+    for metric in table.values():
+        if metric.get("incident_id") == incident_id:
+            calculated_values.setdefault(metric.get("metric_type"), []).append(
+                metric.get("calculated_value_minutes"))
+    return calculated_values
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    table = build_table("performance_metrics", synthetic_table("performance_metrics", count))
+    incident_id = next(iter(table.values()))["incident_id"]
+    build_time, _ = timed(lambda: metric_rollup(table), repeat=1)
+    scan_time, scanned = timed(lambda: scan(table, incident_id))
+    rollup_time, rolled = timed(lambda: incident_metric_values(table, incident_id))
+    assert scanned == rolled
+
+    def insert(n=1000):
+        for i in range(n):
+            key = str(count + 1 + i)
+            table[key] = {"metric_id": key, "incident_id": incident_id, "metric_type": "response_time",
+                          "calculated_value_minutes": i}
+        for i in range(n):
+            del table[str(count + 1 + i)]
+    insert_time, _ = timed(insert, repeat=1)
+    print(f"performance_metrics {count:>9,} rows, incident {incident_id}: "
+          f"{sum(map(len, rolled.values()))} metrics")
+    print(f"  scan          {scan_time * 1e3:10.3f} ms")
+    print(f"  rollup        {rollup_time * 1e3:10.3f} ms  (built once in {build_time * 1e3:.1f} ms)")
+    print(f"  insert+delete {insert_time / 2000 * 1e6:10.3f} us per write with the rollup attached")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Bytes and time saved by projecting get tool output onto a few fields.
+
+    python benchmarks/projection.py [rows per table]
+
+Each table is scaled to the given row count (default 100,000) and read in
+full, as a discover call without filters does. The output is serialized
+three ways: whole rows, a projection the first time it is requested, and
+the same projection once it is hot and its serialized rows are cached.
+"""
+import sys
+
+from common import synthetic_table, timed
+
+from store import build_table, dump_rows, find_rows, projection_cache
+from store.projection import HOT_AFTER
+
+PROJECTIONS = {
+    "users": ["user_id", "role", "status"],
+    "incidents": ["incident_id", "severity", "status"],
+}
+
+
+def run(table_name: str, fields, count: int) -> None:
+    table = build_table(table_name, synthetic_table(table_name, count))
+    rows = find_rows(table)
+    full_time, full_text = timed(lambda: dump_rows(table, rows))
+    cold_time, cold_text = timed(lambda: dump_rows(table, rows, fields), repeat=1)
+    for _ in range(HOT_AFTER):
+        dump_rows(table, rows, fields)
+    hot_time, hot_text = timed(lambda: dump_rows(table, rows, fields))
+    assert hot_text == cold_text
+    cache = projection_cache(table)
+    print(f"{table_name:<10} {count:>9,} rows  fields {', '.join(fields)}")
+    print(f"  whole rows  {len(full_text) / 1e6:8.2f} MB  {full_time * 1e3:8.1f} ms")
+    print(f"  projected   {len(cold_text) / 1e6:8.2f} MB  {cold_time * 1e3:8.1f} ms (first use)"
+          f"  {hot_time * 1e3:8.1f} ms (cached, {cache.hits:,} hits)")
+    print(f"  saved       {(len(full_text) - len(hot_text)) / len(full_text):8.1%} bytes"
+          f"  {(full_time - hot_time) / full_time:8.1%} time")
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    for table_name, fields in PROJECTIONS.items():
+        run(table_name, fields, count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+"""Throughput of the SLA compliance engine.
+
+    python benchmarks/sla_compliance.py [incidents]
+
+incidents and performance_metrics are scaled to the given row count (default
+200,000) against the seed subscriptions, SLAs and components, and every
+incident is evaluated in one sla_compliance() call.
+"""
+import sys
+
+from common import seed_table, synthetic_table, timed
+
+from store import build_table, sla_compliance
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    data = {name: build_table(name, seed_table(name))
+            for name in ("subscriptions", "service_level_agreements", "infrastructure_components")}
+    data["incidents"] = build_table("incidents", synthetic_table("incidents", count))
+    data["performance_metrics"] = build_table("performance_metrics", synthetic_table("performance_metrics", count))
+    elapsed, columns = timed(lambda: sla_compliance(data))
+    breaches = sum(1 for flag in columns["resolution_breached"] if flag)
+    print(f"incidents {count:>10,}: {elapsed * 1e3:8.1f} ms, {elapsed / count * 1e6:6.2f} us per incident, "
+          f"{breaches:,} resolution breaches")
+
+
+if __name__ == "__main__":
+    main()
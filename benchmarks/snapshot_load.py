@@ -0,0 +1,56 @@
+"""Cold load time of a JSON table against the mmap snapshot format.
+
+    python benchmarks/snapshot_load.py [row counts...]
+"""
+import json
+import os
+import random
+import sys
+import tempfile
+
+from common import synthetic_table, timed
+
+from store import open_snapshot, write_snapshot
+
+TABLE = "incidents"
+
+
+def run(count: int, workdir: str) -> None:
+    table = synthetic_table(TABLE, count)
+    json_path = os.path.join(workdir, f"{TABLE}.json")
+    snap_path = os.path.join(workdir, f"{TABLE}.snap")
+    with open(json_path, "w") as f:
+        json.dump(table, f, indent=2)
+    write_snapshot({TABLE: table}, snap_path)
+    del table
+
+    def load_json():
+        with open(json_path) as f:
+            return json.load(f)
+
+    probes = [str(random.randint(1, count)) for _ in range(100)]
+
+    def open_and_probe():
+        incidents = open_snapshot(snap_path)[TABLE]
+        return [incidents[key]["status"] for key in probes]
+
+    def open_and_materialize():
+        return open_snapshot(snap_path)[TABLE].materialize()
+
+    json_time, _ = timed(load_json)
+    probe_time, _ = timed(open_and_probe)
+    full_time, _ = timed(open_and_materialize, repeat=1)
+    print(f"{count:>9,} rows | json {os.path.getsize(json_path) / 1e6:8.1f} MB {json_time * 1e3:9.1f} ms"
+          f" | snapshot {os.path.getsize(snap_path) / 1e6:7.1f} MB open+100 rows {probe_time * 1e3:7.2f} ms"
+          f" | decode all {full_time * 1e3:9.1f} ms")
+
+
+def main() -> None:
+    counts = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+    with tempfile.TemporaryDirectory() as workdir:
+        for count in counts:
+            run(count, workdir)
+
+
+if __name__ == "__main__":
+    main()
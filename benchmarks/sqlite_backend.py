@@ -0,0 +1,67 @@
+"""Dict backend against the SQLite backend: open time, point reads, filtered reads and updates.
+
+    python benchmarks/sqlite_backend.py [row counts...]
+"""
+import os
+import random
+import sys
+import tempfile
+import tracemalloc
+
+from common import synthetic_table, timed
+
+from store import build_table, candidate_rows, open_sqlite, write_sqlite
+
+TABLE = "incidents"
+
+
+def run(count: int, workdir: str) -> None:
+    rows = synthetic_table(TABLE, count)
+    path = os.path.join(workdir, f"{TABLE}-{count}.sqlite")
+    write_sqlite({TABLE: rows}, path)
+
+    tracemalloc.start()
+    dict_table = build_table(TABLE, rows)
+    dict_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del rows
+    database = open_sqlite(path)
+    sql_table = database[TABLE]
+
+    probes = [str(random.randint(1, count)) for _ in range(1000)]
+
+    def point_reads(table):
+        return lambda: [table[key]["status"] for key in probes]
+
+    def filtered(table):
+        # Selective filter, as DiscoverIncident issues it: one client's critical incidents
+        return lambda: sum(1 for row in candidate_rows(table, client_id="3", severity="P1")
+                           if row.get("client_id") == "3" and row.get("severity") == "P1")
+
+    def updates(table):
+        def run_updates():
+            for key in probes[:100]:
+                table[key]["status"] = "in_progress"
+        return run_updates
+
+    open_time, _ = timed(lambda: open_sqlite(path)[TABLE], repeat=1)
+    print(f"{count:>9,} rows | dict {dict_bytes / 1e6:8.1f} MB in memory"
+          f" | sqlite {os.path.getsize(path) / 1e6:8.1f} MB on disk, open {open_time * 1e3:6.2f} ms")
+    for label, bench in (("1000 point reads", point_reads), ("filtered read", filtered),
+                         ("100 field updates", updates)):
+        dict_time, dict_result = timed(bench(dict_table))
+        sql_time, sql_result = timed(bench(sql_table))
+        assert dict_result == sql_result
+        print(f"{'':>14} {label:<18} dict {dict_time * 1e3:9.2f} ms | sqlite {sql_time * 1e3:9.2f} ms")
+    database.close()
+
+
+def main() -> None:
+    counts = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+    with tempfile.TemporaryDirectory() as workdir:
+        for count in counts:
+            run(count, workdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Peak memory of exporting a table as NDJSON, streamed versus built as one JSON array.
+
+    python benchmarks/stream_export.py [rows]
+
+The incidents table is scaled to the given row count (default 100,000) and
+exported in full and filtered on status, from an indexed table and from a
+SQLite file. Streaming writes each row as the query plan reaches it, so its
+peak should stay flat as the row count grows (it is bounded by one
+write_ndjson chunk of 1,000 rows); the list export grows with it.
+"""
+import io
+import json
+import os
+import sys
+import tempfile
+import tracemalloc
+
+from common import synthetic_table
+
+from store import build_table, find_rows, open_sqlite, write_ndjson, write_sqlite
+
+
+class _Discard(io.TextIOBase):
+    """Text sink that only counts what is written"""
+
+    def __init__(self):
+        self.size = 0
+
+    def write(self, text: str) -> int:
+        self.size += len(text)
+        return len(text)
+
+
+def peak(fn):
+    """(peak traced bytes, result) of fn; tracing slows it down, so no time is reported"""
+    tracemalloc.start()
+    try:
+        result = fn()
+        return tracemalloc.get_traced_memory()[1], result
+    finally:
+        tracemalloc.stop()
+
+
+def run(label: str, table, filters) -> None:
+    stream_peak, count = peak(lambda: write_ndjson(_Discard(), table, **filters))
+    list_peak, _ = peak(lambda: json.dumps(find_rows(table, **filters)))
+    print(f"  {label:<18} {count:>9,} rows  peak: stream {stream_peak / 1e6:7.2f} MB"
+          f"  list + json.dumps {list_peak / 1e6:8.2f} MB")
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rows = synthetic_table("incidents", count)
+    print(f"incidents {count:,} rows")
+    table = build_table("incidents", rows)
+    run("indexed, all", table, {})
+    run("indexed, closed", table, {"status": "closed"})
+    del table
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "data.db")
+        write_sqlite({"incidents": rows}, path)
+        database = open_sqlite(path)
+        run("sqlite, all", database["incidents"], {})
+        run("sqlite, closed", database["incidents"], {"status": "closed"})
+        database.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+"""Shared fixtures for the store tests.
+
+The tests import the store package directly from tools/store, as the
+benchmarks do, so they run without the tau_bench tool runtime.
+"""
+import os
+import shutil
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(ROOT, "data")
+sys.path.insert(0, os.path.join(ROOT, "tools"))
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    """A private copy of the seed data directory"""
+    target = tmp_path / "data"
+    shutil.copytree(DATA_DIR, target)
+    return str(target)
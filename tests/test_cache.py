@@ -0,0 +1,101 @@
+import json
+
+from store import CowData, ResultCache, aggregate, bump_version, cached_read, find_rows, load_data
+
+
+def _counting_tool(cache, calls):
+    @cached_read("incidents", cache=cache)
+    def invoke(data, status=None, severity=None):
+        calls.append((status, severity))
+        return json.dumps(find_rows(data["incidents"], status=status, severity=severity))
+    return invoke
+
+
+def test_writes_invalidate_reads_of_their_table():
+    cache, calls = ResultCache(), []
+    invoke = _counting_tool(cache, calls)
+    data = load_data()
+    first = invoke(data, "open")
+    # Keyword order and spelled-out defaults hit the same entry
+    assert invoke(data, severity=None, status="open") == first
+    assert len(calls) == 1
+
+    # A table the tool does not read is not part of the key
+    data["clients"]["1"]["client_name"] = "Renamed"
+    invoke(data, "open")
+    assert len(calls) == 1
+
+    incidents = data["incidents"]
+    key = str(max(map(int, incidents)) + 1)
+    writes = [
+        lambda: incidents["3"].__setitem__("status", "open"),
+        lambda: incidents.__setitem__(key, dict(incidents["4"], incident_id=key, status="open")),
+        lambda: incidents.__delitem__(key),
+        lambda: bump_version(incidents),
+    ]
+    for write in writes:
+        write()
+        assert invoke(data, "open") == json.dumps(find_rows(incidents, status="open"))
+        invoke(data, "open")
+    assert len(calls) == 1 + len(writes)
+    assert cache.stats()["entries"] == 1
+
+
+def test_unobservable_tables_are_not_cached():
+    cache, calls = ResultCache(), []
+    invoke = _counting_tool(cache, calls)
+    base = load_data()
+    overlay, plain = CowData(base), {"incidents": json.loads(json.dumps(base["incidents"]))}
+    for data in (overlay, plain):
+        invoke(data, "open")
+        data["incidents"]["3"]["status"] = "open"
+        assert invoke(data, "open") == json.dumps(find_rows(data["incidents"], status="open"))
+    assert len(calls) == 4 and cache.stats()["entries"] == 0
+
+
+def test_byte_budget_evicts_least_recently_used():
+    cache = ResultCache(max_bytes=300)
+    for name in ("a", "b"):
+        cache.put(("tool", name), (1,), name * 100)
+    assert cache.get(("tool", "a"), (1,)) == "a" * 100
+    cache.put(("tool", "c"), (1,), "c" * 100)
+    # b was used least recently, so it goes to make room for c
+    assert cache.get(("tool", "b"), (1,)) is None
+    assert cache.get(("tool", "a"), (1,)) and cache.get(("tool", "c"), (1,))
+    assert cache.stats()["evictions"] == 1 and cache.size <= cache.max_bytes
+
+    # A stale entry is dropped when it is next looked up
+    assert cache.get(("tool", "a"), (2,)) is None and cache.stats()["entries"] == 1
+    # A response larger than the whole budget is not stored
+    cache.put(("tool", "d"), (1,), "d" * 400)
+    assert cache.get(("tool", "d"), (1,)) is None
+
+
+def test_table_named_by_an_argument_is_versioned():
+    cache = ResultCache()
+    calls = []
+
+    @cached_read(table_arguments=("table_name",), cache=cache)
+    def invoke(data, table_name, group_by=None):
+        calls.append(table_name)
+        return json.dumps(aggregate(data[table_name], group_by))
+
+    data = load_data()
+    first = invoke(data, "incidents", ["status"])
+    assert invoke(data, table_name="incidents", group_by=["status"]) == first
+    assert invoke(data, "clients") != first
+    assert calls == ["incidents", "clients"]
+
+    # A write to the named table invalidates only its own entries
+    data["incidents"]["3"]["status"] = "closed"
+    assert invoke(data, "incidents", ["status"]) != first
+    invoke(data, "clients")
+    assert calls == ["incidents", "clients", "incidents"]
+
+    # Unknown tables are left to the tool, uncached
+    for _ in range(2):
+        try:
+            invoke(data, "nope")
+        except KeyError:
+            pass
+    assert calls[-2:] == ["nope", "nope"]
@@ -0,0 +1,36 @@
+import copy
+import pickle
+
+from store import CompactTable, compact_tables, load_data, next_id, record_type
+
+
+def _compact_metrics():
+    return compact_tables(load_data())["performance_metrics"]
+
+
+def test_deepcopy_rebuilds_records_indexes_and_ids():
+    table = _compact_metrics()
+    clone = copy.deepcopy(table)
+    assert isinstance(clone, CompactTable)
+    assert list(clone.items()) == list(table.items())
+    assert next_id(clone) == next_id(table)
+
+    key = next(iter(clone))
+    incident_id = clone[key]["incident_id"]
+    clone[key]["incident_id"] = "999"
+    # The copy has its own records and indexes
+    assert table[key]["incident_id"] == incident_id
+    assert key in clone.lookup("incident_id", "999")
+    assert key not in table.lookup("incident_id", "999")
+
+
+def test_pickle_round_trip_of_tables_and_records():
+    table = _compact_metrics()
+    table["500"] = {"metric_id": "500", "incident_id": "1", "unexpected": [1, 2]}
+    loaded = pickle.loads(pickle.dumps(table))
+    assert list(loaded.items()) == list(table.items())
+    assert loaded.copy()["500"] == table["500"]
+
+    record = record_type("performance_metrics").from_dict(dict(table["1"]), 7)
+    restored = pickle.loads(pickle.dumps(record))
+    assert restored.to_dict() == record.to_dict() and restored._position == 7
@@ -0,0 +1,57 @@
+import copy
+import json
+
+from store import CowData, load_data
+
+
+def test_held_rows_write_to_the_overlay_that_served_them():
+    base = load_data()
+    snapshot = json.dumps(base)
+    episode_a, episode_b = CowData(base), CowData(base)
+
+    held = episode_a["incidents"]["3"]
+    severity = held["severity"]
+    # Episode B is read after A handed out the row
+    assert episode_b["incidents"]["3"]["severity"] == severity
+    held["severity"] = "P9"
+    episode_b["clients"]["1"]["client_name"] = "Only B"
+
+    assert episode_a["incidents"]["3"]["severity"] == "P9"
+    assert episode_b["incidents"]["3"]["severity"] == severity
+    assert episode_a["clients"]["1"]["client_name"] != "Only B"
+    assert episode_a.touched_rows() == {"incidents": ["3"]}
+    assert episode_b.touched_rows() == {"clients": ["1"]}
+    assert json.dumps(base) == snapshot
+
+
+def test_deepcopy_keeps_the_episode_writes_private():
+    base = load_data()
+    episode = CowData(base)
+    episode["incidents"]["3"]["status"] = "closed"
+    clone = copy.deepcopy(episode)
+    clone["incidents"]["3"]["status"] = "open"
+    clone["incidents"]["4"]["status"] = "closed"
+
+    assert episode["incidents"]["3"]["status"] == "closed"
+    assert episode.touched_rows() == {"incidents": ["3"]}
+    assert clone.touched_rows() == {"incidents": ["3", "4"]}
+
+
+def test_held_row_reads_its_own_writes():
+    base = load_data()
+    episode = CowData(base)
+    row = episode["incidents"]["3"]
+    severity = row["severity"]
+    row["severity"] = "P1x"
+    assert row["severity"] == "P1x"
+    assert episode["incidents"]["3"] is row
+    row.update(status="closed")
+    del row["urgency_level"]
+    assert episode["incidents"]["3"] == row and "urgency_level" not in row
+    assert base["incidents"]["3"]["severity"] == severity
+    assert "urgency_level" in base["incidents"]["3"]
+
+    # Writes through the table reach a row held from before them
+    held = episode["incidents"]["4"]
+    episode["incidents"]["4"]["status"] = "closed"
+    assert held["status"] == "closed"
@@ -0,0 +1,39 @@
+from store import DirtyTracker, apply_deltas, load_data
+
+
+def test_flush_then_replay_keeps_flushed_state(data_dir):
+    data = load_data(data_dir)
+    tracker = DirtyTracker(data, data_dir)
+    users = data["users"]
+    key = next(iter(users))
+
+    users[key]["status"] = "zzz"
+    assert tracker.append_deltas() == 1
+    users[key]["status"] = "final"
+    tracker.flush()
+
+    # A write after the flush goes to the sidecar again, and a second flush covers it
+    clients = data["clients"]
+    client = next(iter(clients))
+    clients[client]["status"] = "inactive"
+    tracker.append_deltas()
+    tracker.flush()
+
+    reloaded = load_data(data_dir)
+    assert apply_deltas(reloaded, f"{data_dir}/deltas.log") == 0
+    assert reloaded["users"][key]["status"] == "final"
+    assert reloaded["clients"][client]["status"] == "inactive"
+
+
+def test_flush_writes_tables_only_in_the_sidecar(data_dir):
+    data = load_data(data_dir)
+    tracker = DirtyTracker(data, data_dir)
+    key = next(iter(data["users"]))
+    data["users"][key]["status"] = "appended"
+    tracker.append_deltas()
+    # Nothing is dirty any more, but the sidecar still holds the users record
+    assert tracker.flush() == ["users"]
+
+    reloaded = load_data(data_dir)
+    apply_deltas(reloaded, f"{data_dir}/deltas.log")
+    assert reloaded["users"][key]["status"] == "appended"
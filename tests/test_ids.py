@@ -0,0 +1,36 @@
+import copy
+import pickle
+
+from store import CowData, Transaction, build_table, load_data, next_id
+
+
+def test_next_id_is_taken_by_the_insert_not_the_call():
+    table = build_table("performance_metrics", load_data()["performance_metrics"])
+    expected = str(max(int(key) for key in table) + 1)
+    # A tool that fails after asking for an id (e.g. a bad value) must not burn it
+    assert next_id(table) == expected
+    assert next_id(table) == expected
+    table[expected] = {"metric_id": expected}
+    assert next_id(table) == str(int(expected) + 1)
+
+
+def test_transaction_reserves_ids_until_it_ends():
+    data = load_data()
+    metrics = data["performance_metrics"]
+    first = next_id(metrics)
+    with Transaction(data):
+        assert next_id(data["performance_metrics"]) == first
+        assert next_id(data["performance_metrics"]) == str(int(first) + 1)
+    # Reserved ids that were never inserted are free again after the transaction
+    assert next_id(data["performance_metrics"]) == first
+
+
+def test_sequences_copy_with_their_table():
+    data = CowData(load_data())
+    incidents = data["incidents"]
+    incidents[next_id(incidents)] = {"incident_id": "new"}
+    clone = copy.deepcopy(data)
+    assert next_id(clone["incidents"]) == next_id(incidents)
+    clone["incidents"][next_id(clone["incidents"])] = {}
+    assert next_id(clone["incidents"]) == str(int(next_id(incidents)) + 1)
+    assert pickle.loads(pickle.dumps(incidents.ids)).peek() == incidents.ids.peek()
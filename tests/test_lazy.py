@@ -0,0 +1,40 @@
+import copy
+import os
+
+from store import LazyData, interface_tables
+from store.lazy import tool_paths, tool_reads
+
+
+def test_every_tool_read_is_covered():
+    for interface, paths in tool_paths().items():
+        for path in paths:
+            assert os.path.exists(path), path
+            reads = tool_reads(path)
+            assert not reads.unresolved, (path, reads.unresolved)
+            assert reads.tables or reads.dynamic, path
+
+    tables = interface_tables()
+    assert {"knowledge_base_articles", "service_level_agreements", "incident_updates"} <= set(tables["interface_1"])
+    assert {"incident_escalations", "subscriptions", "users"} <= set(tables["interface_2"])
+
+
+def test_reads_through_unknown_helpers_are_reported(tmp_path):
+    path = tmp_path / "tool.py"
+    path.write_text("def invoke(data, name):\n"
+                    "    rows = data.get('users', {})\n"
+                    "    return helper(data, rows), data[name]\n")
+    reads = tool_reads(str(path))
+    assert reads.tables == {"users"}
+    assert set(reads.unresolved) == {"data[name]", "helper(data, rows)"}
+
+
+def test_tables_named_at_run_time_load_on_first_access(data_dir):
+    data = LazyData(data_dir)
+    assert data.loaded() == []
+    assert len(data["vendors"]) > 0
+    assert data.loaded() == ["vendors"]
+
+    clone = copy.deepcopy(data)
+    clone["vendors"]["1"]["vendor_name"] = "Copy"
+    assert data["vendors"]["1"]["vendor_name"] != "Copy"
+    assert len(clone["clients"]) == len(data["clients"])
@@ -0,0 +1,63 @@
+import json
+
+from store import DatabaseHash, TableHash, load_data
+
+
+def _plain(table):
+    return json.loads(json.dumps(table))
+
+
+def test_root_follows_row_writes_incrementally():
+    incidents = load_data()["incidents"]
+    live = TableHash(incidents)
+    before = live.hexdigest()
+    status = incidents["3"]["status"]
+
+    incidents["3"]["status"] = "closed"
+    assert live.hexdigest() != before
+    assert live == TableHash(_plain(incidents))
+    incidents["3"]["status"] = status
+    assert live.hexdigest() == before
+
+    key = str(max(int(k) for k in incidents) + 1)
+    incidents[key] = dict(incidents["3"], incident_id=key)
+    assert live == TableHash(_plain(incidents))
+    del incidents[key]
+    assert live.hexdigest() == before
+    live.close()
+
+
+def test_diff_labels_added_removed_and_modified_rows():
+    expected = _plain(load_data()["incidents"])
+    incidents = load_data()["incidents"]
+    live = TableHash(incidents)
+    assert live.diff(TableHash(expected)) == []
+
+    incidents["3"]["status"] = "closed"
+    assert live.diff(TableHash(expected)) == [{"row_id": "3", "change": "modified", "fields": ["status"]}]
+
+    # Going from the live table to the expected one: a key only in expected is
+    # added, a key only in the live table is removed
+    del incidents["4"]
+    incidents["new"] = dict(expected["5"], incident_id="new")
+    changes = {change["row_id"]: change for change in live.diff(TableHash(expected))}
+    assert changes["4"]["change"] == "added"
+    assert changes["new"]["change"] == "removed"
+    assert changes["new"]["fields"] == sorted(expected["5"])
+    assert changes["3"]["change"] == "modified"
+    assert len(changes) == 3
+    live.close()
+
+
+def test_database_diff_omits_identical_tables():
+    data = load_data()
+    expected = {name: _plain(table) for name, table in data.items()}
+    live = DatabaseHash(data)
+    assert live == DatabaseHash(expected) and live.diff(DatabaseHash(expected)) == {}
+
+    data["clients"]["1"]["client_name"] = "Renamed"
+    assert live != DatabaseHash(expected)
+    assert live.diff(DatabaseHash(expected)) == {
+        "clients": [{"row_id": "1", "change": "modified", "fields": ["client_name"]}]
+    }
+    live.close()
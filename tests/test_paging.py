@@ -0,0 +1,64 @@
+import base64
+
+import pytest
+
+from store import find_page, load_data, next_id
+
+
+def _walk(table, limit, order_by=None, **filters):
+    keys, cursor = [], None
+    while True:
+        page = find_page(table, limit=limit, cursor=cursor, order_by=order_by, **filters)
+        assert len(page["results"]) <= limit
+        keys += [row["incident_id"] for row in page["results"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return keys
+
+
+@pytest.mark.parametrize("order_by", [None, "incident_id", "-incident_id", "severity", "-created_at", "assigned_to"])
+def test_walk_visits_every_row_once_in_order(order_by):
+    incidents = load_data()["incidents"]
+    expected = [row["incident_id"] for row in find_page(incidents, order_by=order_by or "incident_id")]
+    for limit in (1, 7, len(incidents), len(incidents) + 5):
+        assert _walk(incidents, limit, order_by) == expected
+    closed = [row["incident_id"] for row in find_page(incidents, order_by=order_by or "incident_id", status="closed")]
+    assert _walk(incidents, 4, order_by, status="closed") == closed
+
+
+def test_cursor_is_stable_across_inserts_and_deletes():
+    incidents = load_data()["incidents"]
+    expected = [row["incident_id"] for row in find_page(incidents, order_by="severity")]
+    first = find_page(incidents, limit=10, order_by="severity")
+    seen = [row["incident_id"] for row in first["results"]]
+    last = first["results"][-1]
+
+    # One row sorts before the cursor and one after it; a row not yet read is deleted
+    before = next_id(incidents)
+    incidents[before] = dict(last, incident_id=before, severity="P0")
+    after = next_id(incidents)
+    incidents[after] = dict(last, incident_id=after, severity="P9")
+    gone = expected[20]
+    del incidents[gone]
+
+    cursor = first["next_cursor"]
+    while cursor:
+        page = find_page(incidents, limit=10, cursor=cursor, order_by="severity")
+        seen += [row["incident_id"] for row in page["results"]]
+        cursor = page["next_cursor"]
+    assert seen == [key for key in expected if key != gone] + [after]
+
+
+def test_bad_limit_and_tampered_cursor_are_rejected():
+    incidents = load_data()["incidents"]
+    for limit in (0, -1, "5", 2.5, True):
+        with pytest.raises(ValueError, match="limit"):
+            find_page(incidents, limit=limit)
+
+    cursor = find_page(incidents, limit=5, order_by="severity")["next_cursor"]
+    text = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+    for bad in ("not a cursor", cursor[:-3], base64.urlsafe_b64encode(text[:-2].encode()).decode()):
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            find_page(incidents, limit=5, cursor=bad, order_by="severity")
+    with pytest.raises(ValueError, match="different order_by"):
+        find_page(incidents, limit=5, cursor=cursor, order_by="-severity")
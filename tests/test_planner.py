@@ -0,0 +1,53 @@
+import json
+
+from store import QueryPlan, build_table, find_rows, load_data, predicates
+
+
+def _incidents(count):
+    seed = list(json.loads(json.dumps(load_data()["incidents"])).values())
+    return {str(i + 1): dict(seed[i % len(seed)], incident_id=str(i + 1), client_id=str(i % 50 + 1))
+            for i in range(count)}
+
+
+def test_plan_starts_from_the_smallest_index():
+    table = build_table("incidents", _incidents(2000))
+    plan = QueryPlan(table, predicates(status="open", client_id="7", severity="P1"))
+    sizes = [step["rows"] for step in plan.explain()["access"]]
+    assert plan.explain()["access"][0]["column"] == "client_id"
+    assert sizes == sorted(sizes) and sizes[0] == len(table.lookup("client_id", "7"))
+    assert plan.explain()["candidates"] <= sizes[0]
+
+    # An unindexed column falls back to a scan of every row
+    assert QueryPlan(table, predicates(category="Security")).explain()["candidates"] is None
+
+
+def test_plan_skips_a_path_far_larger_than_the_candidates():
+    table = build_table("incidents", _incidents(2000))
+    everything = ("2000-01-01T00:00:00", "2100-01-01T00:00:00")
+    plan = QueryPlan(table, predicates(client_id="7", ranges={"detection_timestamp": everything}))
+    # Checking 40 rows beats intersecting a 2000-key slice of the time index
+    assert [step["column"] for step in plan.explain()["access"]] == ["client_id"]
+    assert plan.explain()["checks"][-1] == "client_id"
+    assert len(list(plan.rows())) == 40
+
+
+def test_plans_match_a_plain_scan():
+    rows = _incidents(600)
+    table, plain = build_table("incidents", rows), json.loads(json.dumps(rows))
+    cases = [
+        {},
+        {"status": "open"},
+        {"status": "open", "severity": "P1"},
+        {"client_id": "9", "status": "closed"},
+        {"ids": {"client_id": 9}, "category": "Security"},
+        {"status": "resolved", "ranges": {"detection_timestamp": ("2025-09-28T23:07:00", "2025-09-28T23:09:21")}},
+        {"ranges": {"created_at": (None, "2025-09-28T23:08:29")}},
+        {"status": "no such status", "severity": "P1"},
+        {"status": None, "severity": ""},
+    ]
+    for filters in cases[:-2]:
+        assert find_rows(plain, **filters), filters
+    for filters in cases:
+        # A plain dict has no indexes, so its plan is a scan of every row
+        assert QueryPlan(plain, predicates(**filters)).keys is None
+        assert find_rows(table, **filters) == find_rows(plain, **filters), filters
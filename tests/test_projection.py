@@ -0,0 +1,49 @@
+import json
+
+import pytest
+
+from store import dump_rows, find_page, find_rows, load_data, next_id, projection_cache
+from store.projection import HOT_AFTER
+
+
+def test_writes_invalidate_cached_projections():
+    incidents = load_data()["incidents"]
+    fields = ["incident_id", "status"]
+    for _ in range(HOT_AFTER):
+        dump_rows(incidents, find_rows(incidents), fields)
+    cache = projection_cache(incidents)
+    assert cache.texts[tuple(fields)]
+
+    incidents["3"]["status"] = "closed"
+    key = next_id(incidents)
+    incidents[key] = dict(incidents["4"], incident_id=key)
+    del incidents["5"]
+    # A write to a field outside the subset keeps the cached text
+    incidents["6"]["severity"] = "P9"
+
+    hits = cache.hits
+    text = dump_rows(incidents, find_rows(incidents), fields)
+    assert json.loads(text) == [{"incident_id": row["incident_id"], "status": row["status"]}
+                                for row in find_rows(incidents)]
+    assert {"incident_id": "3", "status": "closed"} in json.loads(text)
+    assert cache.hits == hits + len(incidents) - 2
+
+
+def test_unknown_fields_are_rejected():
+    data = load_data()
+    incidents = data["incidents"]
+    with pytest.raises(ValueError, match="Unknown fields: nope"):
+        dump_rows(incidents, find_rows(incidents), ["incident_id", "nope"])
+    with pytest.raises(ValueError, match="Unknown fields: nope"):
+        dump_rows(incidents, find_page(incidents, limit=2), ["nope"])
+    # A column is known even when no row being returned holds it
+    assert json.loads(dump_rows(incidents, find_rows(incidents, status="no such status"), ["status"])) == []
+
+    # Columns added after the table was first checked become known
+    incidents["3"]["postmortem_url"] = "https://example.com"
+    assert json.loads(dump_rows(incidents, find_rows(incidents, status="open"), ["postmortem_url"]))
+
+    plain = json.loads(json.dumps(data["clients"]))
+    with pytest.raises(ValueError, match="Unknown fields"):
+        dump_rows(plain, find_rows(plain), ["client_nmae"])
+    assert dump_rows(plain, [], ["client_name"]) == "[]"
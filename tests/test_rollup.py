@@ -0,0 +1,69 @@
+import random
+
+import pytest
+
+from store import MetricRollup, compact_tables, load_data, metric_rollup, next_id
+
+
+def _state(rollup):
+    return {incident_id: [(metric_type, group.summary()) for metric_type, group in rollup.groups(incident_id)]
+            for incident_id in rollup.incidents}
+
+
+def _assert_recomputed(table):
+    assert _state(metric_rollup(table)) == _state(MetricRollup(table))
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_rollup_equals_a_full_recompute(compact):
+    data = load_data()
+    if compact:
+        data = compact_tables(data)
+    metrics = data["performance_metrics"]
+    rollup = metric_rollup(metrics)
+    key = next(iter(metrics))
+    incident_id, metric_type = metrics[key]["incident_id"], metrics[key]["metric_type"]
+
+    new = next_id(metrics)
+    metrics[new] = dict(metrics[key], metric_id=new, calculated_value_minutes=-5)
+    _assert_recomputed(metrics)
+    assert rollup.summary(incident_id, metric_type)["min"] == -5
+
+    # Moving rows to another incident, then to another metric type of it
+    metrics[key]["incident_id"] = "999"
+    _assert_recomputed(metrics)
+    metrics[key]["metric_type"] = "brand_new_type"
+    _assert_recomputed(metrics)
+    assert rollup.values("999") == {"brand_new_type": [metrics[key]["calculated_value_minutes"]]}
+    metrics[key]["incident_id"] = incident_id
+    _assert_recomputed(metrics)
+
+    del metrics[new]
+    _assert_recomputed(metrics)
+    del metrics[key]
+    _assert_recomputed(metrics)
+    assert "999" not in rollup.incidents
+
+
+def test_rollup_follows_random_writes():
+    metrics = load_data()["performance_metrics"]
+    metric_rollup(metrics)
+    template = dict(next(iter(metrics.values())))
+    random.seed(5)
+    for _ in range(300):
+        choice = random.random()
+        if choice < 0.3:
+            key = next_id(metrics)
+            metrics[key] = dict(template, metric_id=key, incident_id=str(random.randint(1, 10)),
+                                calculated_value_minutes=random.randint(0, 500))
+        elif choice < 0.75:
+            field, value = random.choice([("incident_id", str(random.randint(1, 10))),
+                                          ("metric_type", random.choice(["response_time", "resolution_time"])),
+                                          ("calculated_value_minutes", random.choice([None, random.randint(0, 500)]))])
+            metrics[random.choice(list(metrics))][field] = value
+        elif choice < 0.9:
+            del metrics[random.choice(list(metrics))]
+        else:
+            key = random.choice(list(metrics))
+            metrics[key] = dict(metrics[key], incident_id=str(random.randint(1, 10)))
+        _assert_recomputed(metrics)
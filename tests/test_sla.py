@@ -0,0 +1,35 @@
+from store import DeadlineScheduler, load_data, sla_compliance, sla_rows, to_timestamp
+from store.sla import DEFAULT_AS_OF
+from store.timeindex import to_epoch
+
+
+def test_response_clock_stops_when_the_status_leaves_open():
+    data = load_data()
+    rows = {row["incident_id"]: row for row in sla_rows(sla_compliance(data))}
+    scheduler = DeadlineScheduler(data)
+    now = to_epoch(DEFAULT_AS_OF)
+
+    for incident_id, row in rows.items():
+        deadlines = scheduler.deadlines.get(incident_id, {})
+        # Both modules run the response clock exactly while the incident is open
+        assert ("response" in deadlines) == (row["status"] == "open" and row["response_target_minutes"] is not None)
+        if "response" in deadlines:
+            assert row["response_breached"] == (deadlines["response"] < now)
+
+    # In progress / investigating with no response metric or status change recorded
+    for incident_id in ("12", "34"):
+        assert rows[incident_id]["response_minutes"] is None
+        assert rows[incident_id]["response_breached"] is None
+        assert "response" not in scheduler.deadlines.get(incident_id, {})
+
+
+def test_status_update_off_open_measures_the_response():
+    data = load_data()
+    detected = to_epoch(data["incidents"]["12"]["detection_timestamp"])
+    data["incident_updates"]["900"] = {
+        "update_id": "900", "incident_id": "12", "update_type": "status_change", "field_changed": "status",
+        "old_value": "open", "new_value": "in_progress", "created_at": to_timestamp(detected + 30 * 60),
+    }
+    row = sla_rows(sla_compliance(data, [data["incidents"]["12"]]))[0]
+    assert row["response_minutes"] == 30.0
+    assert row["response_breached"] is False
@@ -0,0 +1,55 @@
+import copy
+import json
+
+import pytest
+
+from store import Snapshot, load_data, write_snapshot
+
+
+def _plain(data):
+    return json.loads(json.dumps(data))
+
+
+def test_round_trip_of_every_table_and_value_type(tmp_path):
+    data = _plain(load_data())
+    data["mixed"] = {
+        "1": {"id": "1", "count": 3, "ratio": 0.25, "flag": True, "off": False, "none": None,
+              "tags": ["a", "b"], "meta": {"k": 1}, "text": "héllo"},
+        "x7": {"id": "x7", "count": -2**40},
+    }
+    path = str(tmp_path / "data.snap")
+    write_snapshot(data, path)
+
+    with Snapshot(path) as snapshot:
+        assert sorted(snapshot.table_names()) == sorted(data)
+        for name, table in snapshot.tables().items():
+            assert list(table) == list(data[name])
+            assert table.materialize() == data[name]
+    assert snapshot.closed
+
+
+def test_close_releases_the_mapping(tmp_path):
+    path = str(tmp_path / "data.snap")
+    write_snapshot(_plain(load_data()), path)
+    snapshot = Snapshot(path)
+    incidents = snapshot.table("incidents")
+    assert incidents["1"]["incident_id"] == "1"
+    snapshot.close()
+    snapshot.close()
+    with pytest.raises(ValueError):
+        incidents["2"]
+
+
+def test_deepcopy_reopens_the_file(tmp_path):
+    path = str(tmp_path / "data.snap")
+    write_snapshot(_plain(load_data()), path)
+    with Snapshot(path) as snapshot:
+        tables = snapshot.tables()
+        tables["incidents"]["1"]["status"] = "reopened"
+        clone = copy.deepcopy(tables)
+    # The copy has its own mapping and keeps the rows decoded so far
+    assert clone["incidents"]["1"]["status"] == "reopened"
+    clone["incidents"]["2"]["status"] = "copied"
+    assert clone["incidents"]._snapshot is clone["clients"]._snapshot
+    assert len(clone["clients"]) == len(load_data()["clients"])
+    clone["incidents"]._snapshot.close()
@@ -0,0 +1,38 @@
+import copy
+import json
+import pickle
+
+from store import load_data, open_sqlite, write_sqlite
+
+
+def _database(tmp_path):
+    data = json.loads(json.dumps(load_data()))
+    path = str(tmp_path / "data.db")
+    write_sqlite(data, path)
+    return data, open_sqlite(path)
+
+
+def test_deepcopy_is_an_independent_database(tmp_path):
+    data, database = _database(tmp_path)
+    # Uncommitted writes are part of the copy
+    database["incidents"]["3"]["status"] = "closed"
+    clone = copy.deepcopy(database)
+    clone["incidents"]["3"]["severity"] = "P9"
+    del clone["clients"]["1"]
+
+    assert clone["incidents"]["3"]["status"] == "closed"
+    assert database["incidents"]["3"]["severity"] == data["incidents"]["3"]["severity"]
+    assert "1" in database["clients"]
+    assert clone["incidents"].lookup("severity", "P9") == {"3"}
+    assert list(clone["users"]) == list(data["users"])
+    database.close()
+
+
+def test_pickle_of_tables_shares_one_copied_database(tmp_path):
+    data, database = _database(tmp_path)
+    tables = pickle.loads(pickle.dumps({"incidents": database["incidents"], "clients": database["clients"]}))
+    assert tables["incidents"]._data is tables["clients"]._data
+    assert dict(tables["clients"]) == data["clients"]
+    assert list(tables["incidents"].select([("status", "open", False)])) == \
+        [row for row in data["incidents"].values() if row["status"] == "open"]
+    database.close()
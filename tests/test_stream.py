@@ -0,0 +1,65 @@
+import json
+import tracemalloc
+
+from store import build_table, find_rows, load_data, open_sqlite, stream_ndjson, stream_rows, write_sqlite
+
+
+def _synthetic_incidents(count):
+    seed = list(json.loads(json.dumps(load_data()["incidents"])).values())
+    table = {}
+    for i in range(count):
+        key = str(i + 1)
+        table[key] = dict(seed[i % len(seed)], incident_id=key)
+    return table
+
+
+def _peak_while(rows, steps):
+    # Peak traced memory while taking up to steps rows and dropping each one
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        start = tracemalloc.get_traced_memory()[0]
+        for _ in zip(range(steps), rows):
+            pass
+        return tracemalloc.get_traced_memory()[1] - start
+    finally:
+        tracemalloc.stop()
+
+
+def test_filtered_sqlite_stream_keeps_memory_flat(tmp_path):
+    incidents = _synthetic_incidents(20000)
+    closed = sum(1 for row in incidents.values() if row["status"] == "closed")
+    path = str(tmp_path / "data.db")
+    write_sqlite({"incidents": incidents}, path)
+    database = open_sqlite(path)
+    table = database["incidents"]
+
+    # Decoding every match up front would hold several MB before the first row
+    assert _peak_while(stream_rows(table, status="closed"), 1) < 256 * 1024
+    assert _peak_while(stream_rows(table, status="closed"), closed) < 256 * 1024
+    assert sum(1 for _ in stream_rows(table, status="closed")) == closed
+    database.close()
+
+
+def test_stream_matches_find_rows_for_each_filter_form():
+    data = load_data()
+    cases = [
+        ("incidents", {"ids": {"incident_id": 3}}),
+        ("incidents", {"status": "closed", "severity": "P1"}),
+        ("clients", {"casefold": {"contact_email": "CONTACT@JOHNSONLLC"}}),
+        ("clients", {"contains": {"client_name": "llc"}}),
+        ("incidents", {"ranges": {"created_at": ("2025-09-28T23:08:00", "2025-09-28T23:09:00")}}),
+        ("incidents", {"status": None}),
+    ]
+    for table_name, filters in cases:
+        expected = find_rows(data[table_name], **filters)
+        assert expected
+        assert list(stream_rows(data[table_name], **filters)) == expected
+        lines = "".join(stream_ndjson(data[table_name], ["status"], chunk_size=2, **filters)).splitlines()
+        assert [json.loads(line) for line in lines] == [{"status": row.get("status")} for row in expected]
+
+
+def test_indexed_stream_keeps_memory_flat():
+    table = build_table("incidents", _synthetic_incidents(20000))
+    assert _peak_while(stream_rows(table, status="closed"), 1) < 256 * 1024
+    assert _peak_while(stream_rows(table, fields=["incident_id", "status"]), len(table)) < 256 * 1024
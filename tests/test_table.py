@@ -0,0 +1,18 @@
+import copy
+import pickle
+
+from store import IndexedTable, load_data, next_id
+
+
+def test_copies_rebuild_indexes_and_ids():
+    incidents = load_data()["incidents"]
+    for clone in (copy.deepcopy(incidents), pickle.loads(pickle.dumps(incidents)), incidents.copy()):
+        assert isinstance(clone, IndexedTable)
+        assert list(clone.items()) == list(incidents.items())
+        assert next_id(clone) == next_id(incidents)
+
+        clone["3"]["status"] = "cancelled"
+        clone[next_id(clone)] = {"incident_id": "new", "status": "cancelled"}
+        assert len(clone.lookup("status", "cancelled")) == 2
+        assert not incidents.lookup("status", "cancelled")
+        assert next_id(clone) == str(int(next_id(incidents)) + 1)
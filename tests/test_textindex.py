@@ -0,0 +1,85 @@
+import json
+import math
+from collections import Counter
+
+from store import load_data, search_rows
+from store.textindex import B, K1, TextIndex, tokenize
+
+QUERIES = ["resolve hardware issues", "prevent data", "security", "best practices mitigate", "issues",
+           "guide connectivity", "no such words"]
+
+
+def _bm25(titles, query):
+    # Every row scored against every query term, straight from the formula
+    documents = {key: tokenize(title) for key, title in titles.items() if tokenize(title)}
+    average = sum(map(len, documents.values())) / len(documents)
+    scores = {}
+    for term in dict.fromkeys(tokenize(query)):
+        frequency = sum(term in terms for terms in documents.values())
+        if not frequency:
+            continue
+        idf = math.log(1 + (len(documents) - frequency + 0.5) / (frequency + 0.5))
+        for key, terms in documents.items():
+            count = Counter(terms)[term]
+            if count:
+                norm = K1 * (1 - B + B * len(terms) / average)
+                scores[key] = scores.get(key, 0.0) + idf * count * (K1 + 1) / (count + norm)
+    return scores
+
+
+def test_ranking_matches_bm25_best_first():
+    articles = load_data()["knowledge_base_articles"]
+    titles = {key: row["title"] for key, row in articles.items()}
+    order = {key: position for position, key in enumerate(articles)}
+    for query in QUERIES:
+        expected = _bm25(titles, query)
+        ranked = articles.text_search("title", query, None)
+        assert [key for key, _ in ranked] == sorted(expected, key=lambda key: (-expected[key], order[key]))
+        assert all(math.isclose(score, expected[key]) for key, score in ranked)
+        # A table without the index is ranked the same through a throwaway one
+        plain = json.loads(json.dumps(articles))
+        assert [row["article_id"] for row, _ in search_rows(plain, "title", query, 5)] == \
+            [key for key, _ in ranked[:5]]
+
+
+class _CountingPosting(dict):
+    walks = 0
+
+    def __iter__(self):
+        _CountingPosting.walks += 1
+        return dict.__iter__(self)
+
+
+def test_top_k_stops_walking_common_terms():
+    index = TextIndex("title")
+    for i in range(500):
+        index.add("common filler words" + (" rare" if i % 100 == 0 else ""), str(i))
+    for term in ("common", "filler"):
+        index.postings[term] = _CountingPosting(index.postings[term])
+
+    top = index.search("rare common filler", 3)
+    # Rows without "rare" cannot reach the top 3 once the rare term is scored
+    assert _CountingPosting.walks == 0
+    assert top == index.search("rare common filler", None)[:3]
+    assert [key for key, _ in top] == ["0", "100", "200"]
+    for query in QUERIES:
+        for limit in (1, 2, 5):
+            articles = load_data()["knowledge_base_articles"]
+            assert articles.text_search("title", query, limit) == articles.text_search("title", query, None)[:limit]
+
+
+def test_title_changes_update_the_index():
+    articles = load_data()["knowledge_base_articles"]
+    assert articles.text_search("title", "zebra") == []
+    articles["2"]["title"] = "Zebra crossing outage runbook"
+    assert [key for key, _ in articles.text_search("title", "zebra")] == ["2"]
+    assert "2" not in [key for key, _ in articles.text_search("title", "prevent data", None)]
+
+    key = str(max(map(int, articles)) + 1)
+    articles[key] = dict(articles["3"], article_id=key, title="Another zebra guide")
+    # The shorter title ranks first for the same term
+    assert [k for k, _ in articles.text_search("title", "zebra")] == [key, "2"]
+    del articles["2"]
+    assert [k for k, _ in articles.text_search("title", "zebra")] == [key]
+    titles = {k: row["title"] for k, row in articles.items()}
+    assert dict(articles.text_search("title", "guide zebra", None)).keys() == _bm25(titles, "guide zebra").keys()
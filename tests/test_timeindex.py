@@ -0,0 +1,62 @@
+import json
+import random
+
+from store import find_rows, load_data, next_id
+from store.timeindex import TimeIndex, in_time_range, to_epoch
+
+
+def _index(incidents):
+    return incidents._indexes["detection_timestamp:time"]
+
+
+def _assert_sorted(incidents):
+    index = _index(incidents)
+    assert index.epochs == sorted(index.epochs)
+    assert sorted(index.keys) == sorted(incidents)
+    assert all(to_epoch(incidents[key]["detection_timestamp"]) == epoch
+               for key, epoch in zip(index.keys, index.epochs))
+
+
+def test_range_bounds_are_inclusive():
+    incidents = load_data()["incidents"]
+    stamps = sorted(row["detection_timestamp"] for row in incidents.values())
+    low, high = stamps[5], stamps[-5]
+    keys = incidents.range_lookup("detection_timestamp", low, high)
+    assert {incidents[key]["detection_timestamp"] for key in keys} == {s for s in stamps if low <= s <= high}
+    assert len(incidents.range_lookup("detection_timestamp", low, low)) == stamps.count(low)
+    assert incidents.range_lookup("detection_timestamp", high, low) == []
+    assert len(incidents.range_lookup("detection_timestamp", None, low)) == sum(s <= low for s in stamps)
+    assert incidents.range_lookup("detection_timestamp", "not a time", None) == []
+
+    # The same bounds through the planner and as a plain row check
+    plain = json.loads(json.dumps(incidents))
+    ranges = {"detection_timestamp": (low, high)}
+    assert find_rows(incidents, ranges=ranges) == find_rows(plain, ranges=ranges)
+    assert in_time_range(low, low, high) and in_time_range(high, low, high)
+    assert in_time_range("2025-09-28T23:06:34Z", "2025-09-28T23:06:34", None)
+    # A date alone is midnight, so it excludes the rest of that day as an upper bound
+    assert not in_time_range("2025-09-28T00:00:01", None, "2025-09-28")
+
+
+def test_index_stays_sorted_through_writes():
+    incidents = load_data()["incidents"]
+    template = dict(incidents["3"])
+    random.seed(3)
+    for _ in range(200):
+        choice = random.random()
+        stamp = f"2025-09-{random.randint(1, 30):02d}T{random.randint(0, 23):02d}:00:00"
+        if choice < 0.4:
+            key = next_id(incidents)
+            incidents[key] = dict(template, incident_id=key, detection_timestamp=stamp)
+        elif choice < 0.8:
+            incidents[random.choice(list(incidents))]["detection_timestamp"] = stamp
+        else:
+            del incidents[random.choice(list(incidents))]
+        _assert_sorted(incidents)
+
+    # Equal timestamps keep their arrival order
+    index = TimeIndex("at")
+    for key in ("a", "b", "c"):
+        index.add("2025-01-01T00:00:00", key)
+    index.remove("2025-01-01T00:00:00", "b")
+    assert index.range("2025-01-01", "2025-01-01") == ["a", "c"]
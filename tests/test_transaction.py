@@ -0,0 +1,50 @@
+import json
+
+import pytest
+
+from store import CowData, Transaction, load_data, next_id
+
+
+def test_rollback_restores_rows_indexes_and_ids():
+    data = load_data()
+    snapshot = json.dumps(data)
+    incidents = data["incidents"]
+    first_id = next_id(incidents)
+
+    with pytest.raises(RuntimeError):
+        with Transaction(data):
+            incidents[first_id] = {"incident_id": first_id, "status": "open"}
+            incidents[next_id(incidents)] = {"incident_id": "x", "status": "open"}
+            incidents["3"]["status"] = "closed"
+            del data["clients"]["1"]
+            raise RuntimeError("a later step halted")
+
+    # Restored rows may move to the end of their table; the contents are as before
+    assert json.loads(json.dumps(data)) == json.loads(snapshot)
+    assert next_id(incidents) == first_id
+    assert "3" in incidents.lookup("status", "open")
+    assert first_id not in incidents.lookup("status", "open")
+
+
+def test_savepoint_rollback_keeps_earlier_writes():
+    data = load_data()
+    incidents = data["incidents"]
+    first_id = next_id(incidents)
+    with Transaction(data) as txn:
+        incidents[first_id] = {"incident_id": first_id}
+        with txn.savepoint() as savepoint:
+            incidents[next_id(incidents)] = {"incident_id": "later"}
+            savepoint.rollback()
+        assert next_id(incidents) == str(int(first_id) + 1)
+    assert first_id in incidents and str(int(first_id) + 1) not in incidents
+
+
+def test_copy_on_write_overlay_is_rejected_before_subscribing():
+    base = load_data()
+    with pytest.raises(TypeError, match="copy-on-write"):
+        Transaction(CowData(base))
+    # A table that cannot be observed leaves the ones before it unsubscribed
+    data = {"incidents": base["incidents"], "notes": ["not a table"]}
+    with pytest.raises(TypeError):
+        Transaction(data)
+    assert not base["incidents"]._observers
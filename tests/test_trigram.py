@@ -0,0 +1,13 @@
+from store import QueryPlan, find_rows, load_data, predicates
+
+
+def test_product_name_filter_uses_the_trigram_index():
+    products = load_data()["products"]
+    expected = [p for p in products.values() if "gateway" in p["product_name"].lower()]
+    assert expected
+
+    # The filter discover_product and fetch_product pass
+    assert find_rows(products, contains={"product_name": "GATEway"}) == expected
+    plan = QueryPlan(products, predicates(contains={"product_name": "gateway"}))
+    assert plan.explain()["access"][0]["kind"] == "contains"
+    assert plan.explain()["candidates"] == len(expected)
@@ -0,0 +1,47 @@
+import json
+
+from store import load_data, value_exists
+
+
+def test_update_to_another_rows_value_is_a_duplicate():
+    clients = load_data()["clients"]
+    taken = clients["2"]["registration_number"]
+    assert value_exists(clients, "registration_number", taken, exclude_key="1")
+
+    # Once the holder moves off the value it is free, and the index follows the write
+    clients["2"]["registration_number"] = "REG-MOVED"
+    assert not value_exists(clients, "registration_number", taken, exclude_key="1")
+    assert value_exists(clients, "registration_number", "REG-MOVED", exclude_key="1")
+    assert clients.lookup("registration_number", "REG-MOVED") == {"2"}
+
+
+def test_row_keeps_its_own_value():
+    clients = load_data()["clients"]
+    own = clients["1"]["registration_number"]
+    assert value_exists(clients, "registration_number", own)
+    assert not value_exists(clients, "registration_number", own, exclude_key="1")
+    assert not value_exists(clients, "registration_number", None, exclude_key="1")
+
+
+def test_case_folded_columns_stay_unique():
+    data = load_data()
+    clients = data["clients"]
+    email = clients["1"]["contact_email"]
+    # contact_email has an exact unique index and a case-folded one beside it
+    assert clients.has_index("contact_email") and clients.has_index("contact_email", casefold=True)
+    assert clients.lookup("contact_email", email.upper(), casefold=True) == {"1"}
+    assert value_exists(clients, "contact_email", email, exclude_key="2")
+    assert not value_exists(clients, "contact_email", email, exclude_key="1")
+
+    # A row changing only the case of its own value does not collide with itself
+    clients["1"]["contact_email"] = email.upper()
+    assert not value_exists(clients, "contact_email", email.upper(), exclude_key="1")
+    assert clients.lookup("contact_email", email, casefold=True) == {"1"}
+    assert clients.lookup("contact_email", email) == set()
+
+    # The indexed checks agree with a scan of plain rows
+    plain = json.loads(json.dumps(clients))
+    for value in (email, email.upper(), clients["2"]["contact_email"], "nobody@example.com"):
+        for exclude_key in (None, "1", "2"):
+            assert (value_exists(clients, "contact_email", value, exclude_key)
+                    == value_exists(plain, "contact_email", value, exclude_key))
@@ -0,0 +1,45 @@
+import os
+
+from store import WriteAheadLog, load_data, read_log
+
+
+def test_recovery_discards_a_torn_tail(data_dir):
+    wal = WriteAheadLog(data_dir)
+    data = wal.recover(load_data(data_dir))
+    data["incidents"]["3"]["status"] = "closed"
+    data["clients"]["1"]["client_name"] = "Logged"
+    wal.close()
+    # A crash in the middle of the next append
+    with open(wal.log_path, "ab") as f:
+        f.write(b'{"lsn": 3, "op": "set", "table": "incidents", "key": "4", "fie')
+
+    wal = WriteAheadLog(data_dir)
+    assert wal.lsn == 2
+    data = wal.recover(load_data(data_dir))
+    assert data["incidents"]["3"]["status"] == "closed"
+    assert data["clients"]["1"]["client_name"] == "Logged"
+    assert "fie" not in str(data["incidents"]["4"])
+
+    # Appends after recovery start on a clean line and replay in turn
+    data["incidents"]["4"]["status"] = "closed"
+    wal.close()
+    assert [record["lsn"] for record in read_log(wal.log_path)] == [1, 2, 3]
+
+    wal = WriteAheadLog(data_dir)
+    data = wal.recover(load_data(data_dir))
+    assert data["incidents"]["4"]["status"] == "closed"
+    wal.close()
+
+
+def test_checkpoint_truncates_the_log(data_dir):
+    wal = WriteAheadLog(data_dir)
+    data = wal.recover(load_data(data_dir))
+    data["incidents"]["3"]["status"] = "closed"
+    assert wal.checkpoint() == ["incidents"]
+    assert os.path.getsize(wal.log_path) == 0
+    wal.close()
+
+    wal = WriteAheadLog(data_dir)
+    assert wal.checkpoint_lsn == 1
+    assert load_data(data_dir)["incidents"]["3"]["status"] == "closed"
+    wal.close()
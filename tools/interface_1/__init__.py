@@ -13,6 +13,10 @@ from .register_user import RegisterUser
 from .report_incident import ReportIncident
 from .update_client import UpdateClient
 from .update_user import UpdateUser
+from .search_knowledge import SearchKnowledge
+from .evaluate_sla_compliance import EvaluateSlaCompliance
+from .find_due_incidents import FindDueIncidents
+from .aggregate_records import AggregateRecords
 
 ALL_TOOLS_INTERFACE_1 = [
     CreateClientSubscription,
@@ -29,5 +33,9 @@ ALL_TOOLS_INTERFACE_1 = [
     RegisterUser,
     ReportIncident,
     UpdateClient,
-    UpdateUser
+    UpdateUser,
+    SearchKnowledge,
+    EvaluateSlaCompliance,
+    FindDueIncidents,
+    AggregateRecords
 ]
@@ -0,0 +1,43 @@
+import json
+from typing import Any, Dict, List, Optional
+from ..store import aggregate, cached_read
+
+class AggregateRecords:
+    @staticmethod
+    @cached_read(table_arguments=("table_name",))
+    def invoke(data: Dict[str, Any], table_name: str, group_by: Optional[List[str]] = None,
+               aggregates: Optional[List[str]] = None, filters: Optional[Dict[str, Any]] = None) -> str:
+        if table_name not in data:
+            return json.dumps({"error": f"Table {table_name} not found"})
+        if group_by is not None and (isinstance(group_by, str) or not all(isinstance(c, str) for c in group_by)):
+            return json.dumps({"error": "group_by must be a list of column names"})
+        if filters is not None and not isinstance(filters, dict):
+            return json.dumps({"error": "filters must be an object of column values"})
+
+        try:
+            # Only the aggregate rows are built; grouped counts come straight from the indexes
+            results = aggregate(data[table_name], group_by, aggregates or ["count"], filters)
+        except ValueError as e:
+            return json.dumps({"error": str(e)})
+
+        return json.dumps(results)
+
+    @staticmethod
+    def get_info() -> Dict[str, Any]:
+        return {
+            "type": "function",
+            "function": {
+                "name": "aggregate_records",
+                "description": "Grouped counts and statistics over any table without returning its rows, e.g. open P1 incidents per client or average calculated_value_minutes per metric_type",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "table_name": {"type": "string", "description": "Table to aggregate (e.g. incidents, performance_metrics, subscriptions)"},
+                        "group_by": {"type": "array", "items": {"type": "string"}, "description": "Columns to group by; one result row over all matching rows when omitted"},
+                        "aggregates": {"type": "array", "items": {"type": "string"}, "description": "'count' or '<function>:<column>' with function count, sum, min, max, avg or a percentile p<N> (e.g. avg:rto_hours, p95:calculated_value_minutes); default ['count']"},
+                        "filters": {"type": "object", "description": "Column values the rows must equal, e.g. {\"status\": \"open\", \"severity\": \"P1\"}"}
+                    },
+                    "required": ["table_name"]
+                }
+            }
+        }
@@ -1,32 +1,28 @@
 import json
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
+from ..store import cached_read, dump_rows, find_page
 
 class DiscoverClient:
     @staticmethod
+    @cached_read("clients")
     def invoke(data: Dict[str, Any], client_id: Optional[str] = None,
                client_name: Optional[str] = None, registration_number: Optional[str] = None,
                contact_email: Optional[str] = None, client_type: Optional[str] = None,
-               status: Optional[str] = None) -> str:
+               status: Optional[str] = None,
+               created_from: Optional[str] = None, created_to: Optional[str] = None,
+               limit: Optional[int] = None, cursor: Optional[str] = None,
+               order_by: Optional[str] = None, fields: Optional[List[str]] = None) -> str:
         
         clients = data.get("clients", {})
-        results = []
-        
-        for client in clients.values():
-            if client_id and str(client.get("client_id")) != str(client_id):
-                continue
-            if client_name and client_name.lower() not in client.get("client_name", "").lower():
-                continue
-            if registration_number and client.get("registration_number") != registration_number:
-                continue
-            if contact_email and client.get("contact_email", "").lower() != contact_email.lower():
-                continue
-            if client_type and client.get("client_type") != client_type:
-                continue
-            if status and client.get("status") != status:
-                continue
-            results.append(client)
-        
-        return json.dumps(results)
+        try:
+            results = find_page(clients, limit, cursor, order_by, ids={"client_id": client_id},
+                                casefold={"contact_email": contact_email},
+                                contains={"client_name": client_name},
+                                registration_number=registration_number, client_type=client_type,
+                                status=status, ranges={"created_at": (created_from, created_to)})
+            return dump_rows(clients, results, fields)
+        except ValueError as e:
+            return json.dumps({"error": str(e)})
 
     @staticmethod
     def get_info() -> Dict[str, Any]:
@@ -43,7 +39,13 @@ class DiscoverClient:
                         "registration_number": {"type": "string", "description": "Filter by registration number"},
                         "contact_email": {"type": "string", "description": "Filter by contact email"},
                         "client_type": {"type": "string", "description": "Filter by client type (enterprise, mid_market, small_business, startup)"},
-                        "status": {"type": "string", "description": "Filter by status (active, inactive, suspended)"}
+                        "status": {"type": "string", "description": "Filter by status (active, inactive, suspended)"},
+                        "created_from": {"type": "string", "description": "Filter by creation time at or after (ISO-8601)"},
+                        "created_to": {"type": "string", "description": "Filter by creation time at or before (ISO-8601)"},
+                        "limit": {"type": "integer", "description": "Maximum number of rows per page; the response becomes {\"results\": [...], \"next_cursor\": ...}"},
+                        "cursor": {"type": "string", "description": "next_cursor of the previous page, to continue after it"},
+                        "order_by": {"type": "string", "description": "Column to sort by, prefixed with - for descending (default: the ID)"},
+                        "fields": {"type": "array", "items": {"type": "string"}, "description": "Fields to return for each row (default: all fields)"}
                     },
                     "required": []
                 }
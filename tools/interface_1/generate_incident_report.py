@@ -1,16 +1,12 @@
 import json
 from typing import Any, Dict, Optional
+from ..store import next_id
 
 class GenerateIncidentReport:
     @staticmethod
     def invoke(data: Dict[str, Any], incident_id: str, report_type: str,
                generated_by_user: str, status: Optional[str] = 'completed') -> str:
         
-        def generate_id(table: Dict[str, Any]) -> str:
-            if not table:
-                return "1"
-            return str(max(int(k) for k in table.keys()) + 1)
-        
         incident_reports = data.get("incident_reports", {})
         incidents = data.get("incidents", {})
         users = data.get("users", {})
@@ -33,7 +29,7 @@ class GenerateIncidentReport:
         if status not in valid_statuses:
             return json.dumps({"error": f"Invalid status. Must be one of {valid_statuses}", "halt": True})
         
-        report_id = generate_id(incident_reports)
+        report_id = next_id(incident_reports)
         timestamp = "2025-10-01T00:00:00"
         
         new_report = {
@@ -1,6 +1,7 @@
 import json
 from typing import Any, Dict, Optional
 from tau_bench.envs.tool import Tool
+from ..store import next_id
 
 
 class ManageSlaRecord(Tool):
@@ -9,11 +10,6 @@ class ManageSlaRecord(Tool):
                response_time_minutes: int, resolution_time_hours: int,
                availability_percentage: Optional[float] = None) -> str:
         
-        def generate_id(table: Dict[str, Any]) -> int:
-            if not table:
-                return 1
-            return max(int(k) for k in table.keys()) + 1
-        
         slas = data.get("service_level_agreements", {})
         subscriptions = data.get("subscriptions", {})
         
@@ -26,7 +22,7 @@ class ManageSlaRecord(Tool):
         if severity_level not in valid_severity_levels:
             return json.dumps({"error": f"Invalid severity_level. Must be one of {valid_severity_levels}", "halt": True})
         
-        sla_id = str(generate_id(slas))
+        sla_id = next_id(slas)
         timestamp = "2025-10-01T00:00:00"
         
         new_sla = {
@@ -14,6 +14,11 @@ from .record_workaround import RecordWorkaround
 from .file_incident import FileIncident
 from .submit_escalation import SubmitEscalation
 from .update_incident import UpdateIncident
+from .search_knowledge import SearchKnowledge
+from .evaluate_sla_compliance import EvaluateSlaCompliance
+from .find_due_incidents import FindDueIncidents
+from .aggregate_records import AggregateRecords
+from .escalate_due_incidents import EscalateDueIncidents
 
 ALL_TOOLS_INTERFACE_2 = [
     AddComponent,
@@ -31,5 +36,10 @@ ALL_TOOLS_INTERFACE_2 = [
     RecordWorkaround,
     FileIncident,
     SubmitEscalation,
-    UpdateIncident
+    UpdateIncident,
+    SearchKnowledge,
+    EvaluateSlaCompliance,
+    FindDueIncidents,
+    EscalateDueIncidents,
+    AggregateRecords
 ]
@@ -1,6 +1,7 @@
 import json
 from typing import Any, Dict, Optional
 from tau_bench.envs.tool import Tool
+from ..store import next_id
 
 
 class AddClientSubscription(Tool):
@@ -10,11 +11,6 @@ class AddClientSubscription(Tool):
                end_date: str, rto_hours: Optional[int] = None,
                status: Optional[str] = 'active') -> str:
         
-        def generate_id(table: Dict[str, Any]) -> int:
-            if not table:
-                return 1
-            return max(int(k) for k in table.keys()) + 1
-        
         subscriptions = data.get("subscriptions", {})
         clients = data.get("clients", {})
         products = data.get("products", {})
@@ -42,7 +38,7 @@ class AddClientSubscription(Tool):
         if status not in valid_statuses:
             return json.dumps({"error": f"Invalid status. Must be one of {valid_statuses}", "halt": True})
         
-        subscription_id = str(generate_id(subscriptions))
+        subscription_id = next_id(subscriptions)
         timestamp = "2025-10-01T00:00:00"
         
         new_subscription = {
@@ -0,0 +1,81 @@
+import json
+from typing import Any, Dict, Optional
+from tau_bench.envs.tool import Tool
+from ..store import deadline_scheduler, find_rows
+from .submit_escalation import SubmitEscalation
+
+
+class EscalateDueIncidents(Tool):
+    @staticmethod
+    def invoke(data: Dict[str, Any], escalated_by_user: str, escalated_to_user: str,
+               within_minutes: Optional[float] = 0, escalation_level: Optional[str] = 'management',
+               as_of: Optional[str] = None) -> str:
+        
+        escalations = data.get("incident_escalations", {})
+        users = data.get("users", {})
+        timestamp = "2025-10-01T00:00:00"
+        
+        if isinstance(within_minutes, bool) or not isinstance(within_minutes, (int, float)) or within_minutes < 0:
+            return json.dumps({"error": "within_minutes must be zero or positive", "halt": True})
+        
+        # Validate everything SubmitEscalation checks up front, so no escalation
+        # is inserted when a later one would be rejected
+        if escalated_by_user not in users:
+            return json.dumps({"error": f"User {escalated_by_user} not found", "halt": True})
+        if escalated_to_user not in users:
+            return json.dumps({"error": f"User {escalated_to_user} not found", "halt": True})
+        valid_levels = ["management", "technical", "executive", "vendor"]
+        if escalation_level not in valid_levels:
+            return json.dumps({"error": f"Invalid escalation_level. Must be one of {valid_levels}", "halt": True})
+        
+        try:
+            due = deadline_scheduler(data).due(within_minutes, as_of)
+        except ValueError as e:
+            return json.dumps({"error": str(e), "halt": True})
+        
+        escalated = []
+        skipped = []
+        handled = set()
+        for deadline in due:
+            incident_id = deadline["incident_id"]
+            # An incident with both deadlines due is escalated once
+            if incident_id in handled:
+                continue
+            handled.add(incident_id)
+            # Incidents already under an active escalation are left as they are
+            if find_rows(escalations, ids={"incident_id": incident_id}, status="active"):
+                skipped.append(incident_id)
+                continue
+            state = "breached" if deadline["overdue"] else "due"
+            result = json.loads(SubmitEscalation.invoke(
+                data, incident_id=incident_id, escalated_by_user=escalated_by_user,
+                escalated_to_user=escalated_to_user, escalation_level=escalation_level,
+                escalated_at=as_of or timestamp,
+                reason=f"SLA {deadline['deadline_type']} deadline {state} at {deadline['deadline']}"))
+            if "error" in result:
+                return json.dumps(result)
+            escalated.append({"incident_id": incident_id, "escalation_id": result["escalation_id"],
+                              "deadline_type": deadline["deadline_type"], "deadline": deadline["deadline"]})
+        
+        return json.dumps({"escalated": escalated, "skipped": skipped, "success": True})
+
+    @staticmethod
+    def get_info() -> Dict[str, Any]:
+        return {
+            "type": "function",
+            "function": {
+                "name": "escalate_due_incidents",
+                "description": "Escalate every open incident whose SLA response or resolution deadline is overdue or due within the given window, skipping incidents with an active escalation",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "escalated_by_user": {"type": "string", "description": "User initiating the escalations"},
+                        "escalated_to_user": {"type": "string", "description": "Target user for the escalations"},
+                        "within_minutes": {"type": "number", "description": "Also escalate deadlines due within this many minutes (default 0: breached only)"},
+                        "escalation_level": {"type": "string", "description": "Level of escalation (management/technical/executive/vendor, default management)"},
+                        "as_of": {"type": "string", "description": "Current time, also the escalation timestamp (YYYY-MM-DDTHH:MM:SS, default 2025-10-01T00:00:00)"}
+                    },
+                    "required": ["escalated_by_user", "escalated_to_user"]
+                }
+            }
+        }
@@ -1,6 +1,7 @@
 import json
 from typing import Any, Dict, Optional
 from tau_bench.envs.tool import Tool
+from ..store import next_id
 
 
 class FileIncident(Tool):
@@ -11,11 +12,6 @@ class FileIncident(Tool):
                status: Optional[str] = 'open', assigned_to_user_id: Optional[str] = None,
                resolution_timestamp: Optional[str] = None) -> str:
         
-        def generate_id(table: Dict[str, Any]) -> int:
-            if not table:
-                return 1
-            return max(int(k) for k in table.keys()) + 1
-        
         incidents = data.get("incidents", {})
         clients = data.get("clients", {})
         components = data.get("infrastructure_components", {})
@@ -48,7 +44,7 @@ class FileIncident(Tool):
         if assigned_to_user_id and assigned_to_user_id not in users:
             return json.dumps({"error": f"Assigned user {assigned_to_user_id} not found", "halt": True})
         
-        incident_id = str(generate_id(incidents))
+        incident_id = next_id(incidents)
         timestamp = "2025-10-01T00:00:00"
         
         new_incident = {
@@ -13,6 +13,10 @@ from .amend_incident import AmendIncident
 from .update_ticket import UpdateTicket
 from .amend_user import AmendUser
 from .update_workorder import UpdateWorkorder
+from .search_knowledge import SearchKnowledge
+from .evaluate_sla_compliance import EvaluateSlaCompliance
+from .find_due_incidents import FindDueIncidents
+from .aggregate_records import AggregateRecords
 
 ALL_TOOLS_INTERFACE_3 = [
     RecordRca,
@@ -29,5 +33,9 @@ ALL_TOOLS_INTERFACE_3 = [
     AmendUser,
     UpdateWorkorder,
     GetIncident,
-    GetUser
+    GetUser,
+    SearchKnowledge,
+    EvaluateSlaCompliance,
+    FindDueIncidents,
+    AggregateRecords
 ]
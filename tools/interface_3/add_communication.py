@@ -1,6 +1,7 @@
 import json
 from typing import Any, Dict, Optional
 from tau_bench.envs.tool import Tool
+from ..store import next_id
 
 
 class AddCommunication(Tool):
@@ -11,11 +12,6 @@ class AddCommunication(Tool):
                recipient_type: Optional[str] = None,
                sent_at: Optional[str] = None) -> str:
         
-        def generate_id(table: Dict[str, Any]) -> str:
-            if not table:
-                return "1"
-            return str(max(int(k) for k in table.keys()) + 1)
-        
         incidents = data.get("incidents", {})
         users = data.get("users", {})
         communications = data.get("communications", {})
@@ -48,7 +44,7 @@ class AddCommunication(Tool):
             if recipient_type not in valid_recipient_types:
                 return json.dumps({"error": f"Invalid recipient_type. Must be one of {valid_recipient_types}", "halt": True})
         
-        communication_id = generate_id(communications)
+        communication_id = next_id(communications)
         timestamp = "2025-10-01T00:00:00"
         
         new_communication = {
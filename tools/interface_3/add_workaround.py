@@ -1,6 +1,7 @@
 import json
 from typing import Any, Dict, Optional
 from tau_bench.envs.tool import Tool
+from ..store import next_id
 
 
 class AddWorkaround(Tool):
@@ -9,11 +10,6 @@ class AddWorkaround(Tool):
                effectiveness_level: str, implemented_at: str,
                status: Optional[str] = 'active') -> str:
         
-        def generate_id(table: Dict[str, Any]) -> str:
-            if not table:
-                return "1"
-            return str(max(int(k) for k in table.keys()) + 1)
-        
         incidents = data.get("incidents", {})
         users = data.get("users", {})
         workarounds = data.get("workarounds", {})
@@ -36,7 +32,7 @@ class AddWorkaround(Tool):
         if status not in valid_statuses:
             return json.dumps({"error": f"Invalid status. Must be one of {valid_statuses}", "halt": True})
         
-        workaround_id = generate_id(workarounds)
+        workaround_id = next_id(workarounds)
         timestamp = "2025-10-01T00:00:00"
         
         new_workaround = {
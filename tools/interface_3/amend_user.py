@@ -1,6 +1,7 @@
 import json
 from typing import Any, Dict, Optional
 from tau_bench.envs.tool import Tool
+from ..store import value_exists
 
 
 class AmendUser(Tool):
@@ -35,9 +36,8 @@ class AmendUser(Tool):
         
         # Check unique email if being updated
         if "email" in change_set:
-            for uid, user in users.items():
-                if uid != user_id and user.get("email") == change_set["email"]:
-                    return json.dumps({"error": f"Email {change_set['email']} already exists", "halt": True})
+            if value_exists(users, "email", change_set["email"], exclude_key=user_id):
+                return json.dumps({"error": f"Email {change_set['email']} already exists", "halt": True})
         
         # Apply changes
         for key, value in change_set.items():
@@ -1,6 +1,7 @@
 import json
 from typing import Any, Dict, Optional
 from tau_bench.envs.tool import Tool
+from ..store import next_id
 
 
 class ConductRca(Tool):
@@ -9,11 +10,6 @@ class ConductRca(Tool):
                analysis_method: str, status: Optional[str] = 'in_progress',
                completed_at: Optional[str] = None) -> str:
         
-        def generate_id(table: Dict[str, Any]) -> str:
-            if not table:
-                return "1"
-            return str(max(int(k) for k in table.keys()) + 1)
-        
         incidents = data.get("incidents", {})
         users = data.get("users", {})
         root_cause_analysis = data.get("root_cause_analysis", {})
@@ -36,7 +32,7 @@ class ConductRca(Tool):
         if status not in valid_statuses:
             return json.dumps({"error": f"Invalid status. Must be one of {valid_statuses}", "halt": True})
         
-        analysis_id = generate_id(root_cause_analysis)
+        analysis_id = next_id(root_cause_analysis)
         timestamp = "2025-10-01T00:00:00"
         
         new_analysis = {
@@ -1,6 +1,7 @@
 import json
 from typing import Any, Dict, Optional
 from tau_bench.envs.tool import Tool
+from ..store import next_id
 
 
 class CreateEscalation(Tool):
@@ -10,11 +11,6 @@ class CreateEscalation(Tool):
                reason: Optional[str] = None, status: Optional[str] = 'active',
                resolved_at: Optional[str] = None) -> str:
         
-        def generate_id(table: Dict[str, Any]) -> int:
-            if not table:
-                return 1
-            return max(int(k) for k in table.keys()) + 1
-        
         escalations = data.get("incident_escalations", {})
         incidents = data.get("incidents", {})
         users = data.get("users", {})
@@ -39,7 +35,7 @@ class CreateEscalation(Tool):
         if status not in valid_statuses:
             return json.dumps({"error": f"Invalid status. Must be one of {valid_statuses}", "halt": True})
         
-        escalation_id = str(generate_id(escalations))
+        escalation_id = next_id(escalations)
         timestamp = "2025-10-01T00:00:00"
         
         new_escalation = {
@@ -1,32 +1,31 @@
 import json
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
+from ..store import cached_read, dump_rows, find_page
 
 class GetIncident:
     @staticmethod
+    @cached_read("incidents")
     def invoke(data: Dict[str, Any], incident_id: Optional[str] = None,
                client_id: Optional[str] = None, severity: Optional[str] = None,
                status: Optional[str] = None, assigned_to_user_id: Optional[str] = None,
-               reporter_user_id: Optional[str] = None) -> str:
+               reporter_user_id: Optional[str] = None,
+               detection_from: Optional[str] = None, detection_to: Optional[str] = None,
+               created_from: Optional[str] = None, created_to: Optional[str] = None,
+               limit: Optional[int] = None, cursor: Optional[str] = None,
+               order_by: Optional[str] = None, fields: Optional[List[str]] = None) -> str:
         
         incidents = data.get("incidents", {})
-        results = []
-        
-        for incident in incidents.values():
-            if incident_id and str(incident.get("incident_id")) != str(incident_id):
-                continue
-            if client_id and incident.get("client_id") != client_id:
-                continue
-            if severity and incident.get("severity") != severity:
-                continue
-            if status and incident.get("status") != status:
-                continue
-            if assigned_to_user_id and incident.get("assigned_to_user_id") != assigned_to_user_id:
-                continue
-            if reporter_user_id and incident.get("reporter_user_id") != reporter_user_id:
-                continue
-            results.append(incident)
-        
-        return json.dumps(results)
+        try:
+            results = find_page(incidents, limit, cursor, order_by,
+                                ids={"incident_id": incident_id}, client_id=client_id,
+                                severity=severity, status=status,
+                                assigned_to_user_id=assigned_to_user_id,
+                                reporter_user_id=reporter_user_id,
+                                ranges={"detection_timestamp": (detection_from, detection_to),
+                                        "created_at": (created_from, created_to)})
+            return dump_rows(incidents, results, fields)
+        except ValueError as e:
+            return json.dumps({"error": str(e)})
 
     @staticmethod
     def get_info() -> Dict[str, Any]:
@@ -43,7 +42,15 @@ class GetIncident:
                         "severity": {"type": "string", "description": "Filter by severity (P1, P2, P3, P4)"},
                         "status": {"type": "string", "description": "Filter by status (open, investigating, in_progress, resolved, closed)"},
                         "assigned_to_user_id": {"type": "string", "description": "Filter by assignee"},
-                        "reporter_user_id": {"type": "string", "description": "Filter by reporter"}
+                        "reporter_user_id": {"type": "string", "description": "Filter by reporter"},
+                        "detection_from": {"type": "string", "description": "Filter by detection time at or after (ISO-8601)"},
+                        "detection_to": {"type": "string", "description": "Filter by detection time at or before (ISO-8601)"},
+                        "created_from": {"type": "string", "description": "Filter by creation time at or after (ISO-8601)"},
+                        "created_to": {"type": "string", "description": "Filter by creation time at or before (ISO-8601)"},
+                        "limit": {"type": "integer", "description": "Maximum number of rows per page; the response becomes {\"results\": [...], \"next_cursor\": ...}"},
+                        "cursor": {"type": "string", "description": "next_cursor of the previous page, to continue after it"},
+                        "order_by": {"type": "string", "description": "Column to sort by, prefixed with - for descending (default: the ID)"},
+                        "fields": {"type": "array", "items": {"type": "string"}, "description": "Fields to return for each row (default: all fields)"}
                     },
                     "required": []
                 }
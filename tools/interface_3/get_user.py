@@ -1,32 +1,27 @@
 import json
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
+from ..store import cached_read, dump_rows, find_page
 
 class GetUser:
     @staticmethod
+    @cached_read("users")
     def invoke(data: Dict[str, Any], user_id: Optional[str] = None,
                email: Optional[str] = None, role: Optional[str] = None,
                client_id: Optional[str] = None, vendor_id: Optional[str] = None,
-               status: Optional[str] = None) -> str:
+               status: Optional[str] = None,
+               created_from: Optional[str] = None, created_to: Optional[str] = None,
+               limit: Optional[int] = None, cursor: Optional[str] = None,
+               order_by: Optional[str] = None, fields: Optional[List[str]] = None) -> str:
         
         users = data.get("users", {})
-        results = []
-        
-        for user in users.values():
-            if user_id and str(user.get("user_id")) != str(user_id):
-                continue
-            if email and user.get("email", "").lower() != email.lower():
-                continue
-            if role and user.get("role") != role:
-                continue
-            if client_id and user.get("client_id") != client_id:
-                continue
-            if vendor_id and user.get("vendor_id") != vendor_id:
-                continue
-            if status and user.get("status") != status:
-                continue
-            results.append(user)
-        
-        return json.dumps(results)
+        try:
+            results = find_page(users, limit, cursor, order_by, ids={"user_id": user_id},
+                                casefold={"email": email}, role=role, client_id=client_id,
+                                vendor_id=vendor_id, status=status,
+                                ranges={"created_at": (created_from, created_to)})
+            return dump_rows(users, results, fields)
+        except ValueError as e:
+            return json.dumps({"error": str(e)})
 
     @staticmethod
     def get_info() -> Dict[str, Any]:
@@ -43,7 +38,13 @@ class GetUser:
                         "role": {"type": "string", "description": "Filter by role (system_administrator, incident_manager, technical_support, account_manager, executive, client_contact, vendor_contact)"},
                         "client_id": {"type": "string", "description": "Filter by associated client"},
                         "vendor_id": {"type": "string", "description": "Filter by associated vendor"},
-                        "status": {"type": "string", "description": "Filter by status (active, inactive, on_leave)"}
+                        "status": {"type": "string", "description": "Filter by status (active, inactive, on_leave)"},
+                        "created_from": {"type": "string", "description": "Filter by creation time at or after (ISO-8601)"},
+                        "created_to": {"type": "string", "description": "Filter by creation time at or before (ISO-8601)"},
+                        "limit": {"type": "integer", "description": "Maximum number of rows per page; the response becomes {\"results\": [...], \"next_cursor\": ...}"},
+                        "cursor": {"type": "string", "description": "next_cursor of the previous page, to continue after it"},
+                        "order_by": {"type": "string", "description": "Column to sort by, prefixed with - for descending (default: the ID)"},
+                        "fields": {"type": "array", "items": {"type": "string"}, "description": "Fields to return for each row (default: all fields)"}
                     },
                     "required": []
                 }
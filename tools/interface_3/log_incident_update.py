@@ -1,6 +1,7 @@
 import json
 from typing import Any, Dict
 from tau_bench.envs.tool import Tool
+from ..store import next_id
 
 
 class LogIncidentUpdate(Tool):
@@ -9,11 +10,6 @@ class LogIncidentUpdate(Tool):
                update_details: Dict[str, Any], updated_by_user: str,
                update_timestamp: str) -> str:
         
-        def generate_id(table: Dict[str, Any]) -> int:
-            if not table:
-                return 1
-            return max(int(k) for k in table.keys()) + 1
-        
         incident_updates = data.get("incident_updates", {})
         incidents = data.get("incidents", {})
         users = data.get("users", {})
@@ -26,7 +22,7 @@ class LogIncidentUpdate(Tool):
         if updated_by_user not in users:
             return json.dumps({"error": f"User {updated_by_user} not found", "halt": True})
         
-        update_id = str(generate_id(incident_updates))
+        update_id = next_id(incident_updates)
         
         # Extract field changes from update_details
         field_changed = update_details.get("field_changed", "multiple_fields")
@@ -0,0 +1,59 @@
+import json
+from typing import Any, Dict, List, Optional
+from ..store import cached_read, search_rows
+
+# Entity types searched by title, mapped to their table and id column
+SEARCHABLE = {
+    "incident": ("incidents", "incident_id"),
+    "kb_article": ("knowledge_base_articles", "article_id"),
+    "problem_ticket": ("problem_tickets", "problem_id"),
+}
+
+class SearchKnowledge:
+    @staticmethod
+    @cached_read("incidents", "knowledge_base_articles", "problem_tickets")
+    def invoke(data: Dict[str, Any], query: str, entity_types: Optional[List[str]] = None,
+               limit: Optional[int] = 10) -> str:
+        if not query or not query.strip():
+            return json.dumps({"error": "query is required"})
+        if entity_types:
+            invalid = [t for t in entity_types if t not in SEARCHABLE]
+            if invalid:
+                return json.dumps({"error": f"Invalid entity_types: {invalid}. Must be one of {list(SEARCHABLE)}"})
+        if limit is not None and limit < 1:
+            return json.dumps({"error": "limit must be a positive integer"})
+
+        results = []
+        for entity_type in entity_types or SEARCHABLE:
+            table_name, key_column = SEARCHABLE[entity_type]
+            # Each table's top results are enough to fill the merged top results
+            for row, score in search_rows(data.get(table_name, {}), "title", query, limit):
+                results.append({
+                    "entity_type": entity_type,
+                    "id": row.get(key_column),
+                    "title": row.get("title"),
+                    "status": row.get("status"),
+                    "score": round(score, 4)
+                })
+
+        results.sort(key=lambda r: -r["score"])
+        return json.dumps(results[:limit] if limit else results)
+
+    @staticmethod
+    def get_info() -> Dict[str, Any]:
+        return {
+            "type": "function",
+            "function": {
+                "name": "search_knowledge",
+                "description": "Full-text search of incident, knowledge base article and problem ticket titles, ranked by relevance (BM25)",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "query": {"type": "string", "description": "Search terms"},
+                        "entity_types": {"type": "array", "items": {"type": "string"}, "description": "Limit the search to these entity types (incident, kb_article, problem_ticket); all when omitted"},
+                        "limit": {"type": "integer", "description": "Maximum number of results (default 10)"}
+                    },
+                    "required": ["query"]
+                }
+            }
+        }
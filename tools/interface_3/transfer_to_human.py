@@ -1,16 +1,12 @@
 import json
 from typing import Any, Dict
+from ..store import next_id
 
 class TransferToHuman:
     @staticmethod
     def invoke(data: Dict[str, Any], reason: str, context: Dict[str, Any],
                escalation_level: str) -> str:
         
-        def generate_id(table: Dict[str, Any]) -> str:
-            if not table:
-                return "1"
-            return str(max(int(k) for k in table.keys()) + 1)
-        
         transfers = data.get("human_transfers", {})
         
         # Validate escalation_level
@@ -18,7 +14,7 @@ class TransferToHuman:
         if escalation_level not in valid_levels:
             return json.dumps({"error": f"Invalid escalation_level. Must be one of {valid_levels}", "halt": True})
         
-        transfer_id = generate_id(transfers)
+        transfer_id = next_id(transfers)
         timestamp = "2025-10-01T00:00:00"
         
         new_transfer = {
@@ -16,6 +16,10 @@ from .submit_post_incident_review import SubmitPostIncidentReview
 from .list_client import ListClient
 from .list_component import ListComponent
 from .list_subscription import ListSubscription
+from .search_knowledge import SearchKnowledge
+from .evaluate_sla_compliance import EvaluateSlaCompliance
+from .find_due_incidents import FindDueIncidents
+from .aggregate_records import AggregateRecords
 
 
 ALL_TOOLS_INTERFACE_6 = [
@@ -36,5 +40,9 @@ ALL_TOOLS_INTERFACE_6 = [
     SubmitPostIncidentReview,
     ListClient,
     ListComponent,
-    ListSubscription
+    ListSubscription,
+    SearchKnowledge,
+    EvaluateSlaCompliance,
+    FindDueIncidents,
+    AggregateRecords
 ]
@@ -1,5 +1,6 @@
 import json
 from typing import Any, Dict, Optional
+from ..store import incident_metric_values, next_id
 
 class AddMetric:
     @staticmethod
@@ -7,11 +8,6 @@ class AddMetric:
                calculated_value_minutes: float, recorded_by_user: str,
                target_minutes: Optional[float] = None) -> str:
         
-        def generate_id(table: Dict[str, Any]) -> str:
-            if not table:
-                return "1"
-            return str(max(int(k) for k in table.keys()) + 1)
-        
         performance_metrics = data.get("performance_metrics", {})
         incidents = data.get("incidents", {})
         users = data.get("users", {})
@@ -29,7 +25,7 @@ class AddMetric:
         if metric_type not in valid_metric_types:
             return json.dumps({"error": f"Invalid metric_type. Must be one of {valid_metric_types}", "halt": True})
         
-        metric_id = generate_id(performance_metrics)
+        metric_id = next_id(performance_metrics)
         timestamp = "2025-10-01T00:00:00"
         
         new_metric = {
@@ -45,14 +41,8 @@ class AddMetric:
         
         performance_metrics[metric_id] = new_metric
         
-        # Calculate summary values for this incident
-        calculated_values = {}
-        for metric in performance_metrics.values():
-            if metric.get("incident_id") == incident_id:
-                m_type = metric.get("metric_type")
-                if m_type not in calculated_values:
-                    calculated_values[m_type] = []
-                calculated_values[m_type].append(metric.get("calculated_value_minutes"))
+        # Calculate summary values for this incident from the metric rollup
+        calculated_values = incident_metric_values(performance_metrics, incident_id)
         
         return json.dumps({"metric_id": metric_id, "calculated_values": calculated_values, "success": True})
 
@@ -1,6 +1,7 @@
 import json
 from typing import Any, Dict, Optional
 from tau_bench.envs.tool import Tool
+from ..store import next_id
 
 
 class AddWorkorder(Tool):
@@ -10,11 +11,6 @@ class AddWorkorder(Tool):
                problem_id: Optional[str] = None, assigned_to_user: Optional[str] = None,
                status: Optional[str] = 'created') -> str:
         
-        def generate_id(table: Dict[str, Any]) -> int:
-            if not table:
-                return 1
-            return max(int(k) for k in table.keys()) + 1
-        
         work_orders = data.get("work_orders", {})
         users = data.get("users", {})
         incidents = data.get("incidents", {})
@@ -42,7 +38,7 @@ class AddWorkorder(Tool):
         if status not in valid_statuses:
             return json.dumps({"error": f"Invalid status. Must be one of {valid_statuses}", "halt": True})
         
-        workorder_id = str(generate_id(work_orders))
+        workorder_id = next_id(work_orders)
         timestamp = "2025-10-01T00:00:00"
         
         new_workorder = {
@@ -1,6 +1,7 @@
 import json
 from typing import Any, Dict, Optional
 from tau_bench.envs.tool import Tool
+from ..store import next_id
 
 
 class CreateTicket(Tool):
@@ -8,11 +9,6 @@ class CreateTicket(Tool):
     def invoke(data: Dict[str, Any], incident_id: str, title: str,
                issued_by_user: str, status: Optional[str] = 'open') -> str:
         
-        def generate_id(table: Dict[str, Any]) -> int:
-            if not table:
-                return 1
-            return max(int(k) for k in table.keys()) + 1
-        
         problem_tickets = data.get("problem_tickets", {})
         incidents = data.get("incidents", {})
         users = data.get("users", {})
@@ -30,7 +26,7 @@ class CreateTicket(Tool):
         if status not in valid_statuses:
             return json.dumps({"error": f"Invalid status. Must be one of {valid_statuses}", "halt": True})
         
-        problem_id = str(generate_id(problem_tickets))
+        problem_id = next_id(problem_tickets)
         timestamp = "2025-10-01T00:00:00"
         
         new_ticket = {
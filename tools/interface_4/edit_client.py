@@ -1,6 +1,7 @@
 import json
 from typing import Any, Dict, Optional
 from tau_bench.envs.tool import Tool
+from ..store import value_exists
 
 
 class EditClient(Tool):
@@ -31,14 +32,12 @@ class EditClient(Tool):
         
         # Check unique constraints
         if "registration_number" in change_set:
-            for cid, client in clients.items():
-                if cid != client_id and client.get("registration_number") == change_set["registration_number"]:
-                    return json.dumps({"error": f"Registration number {change_set['registration_number']} already exists", "halt": True})
+            if value_exists(clients, "registration_number", change_set["registration_number"], exclude_key=client_id):
+                return json.dumps({"error": f"Registration number {change_set['registration_number']} already exists", "halt": True})
         
         if "contact_email" in change_set:
-            for cid, client in clients.items():
-                if cid != client_id and client.get("contact_email") == change_set["contact_email"]:
-                    return json.dumps({"error": f"Contact email {change_set['contact_email']} already exists", "halt": True})
+            if value_exists(clients, "contact_email", change_set["contact_email"], exclude_key=client_id):
+                return json.dumps({"error": f"Contact email {change_set['contact_email']} already exists", "halt": True})
         
         # Apply changes
         for key, value in change_set.items():
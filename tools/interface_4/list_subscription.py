@@ -1,29 +1,26 @@
 import json
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
+from ..store import cached_read, dump_rows, find_page
 
 class ListSubscription:
     @staticmethod
+    @cached_read("subscriptions")
     def invoke(data: Dict[str, Any], subscription_id: Optional[str] = None,
                client_id: Optional[str] = None, product_id: Optional[str] = None,
-               sla_tier: Optional[str] = None, status: Optional[str] = None) -> str:
+               sla_tier: Optional[str] = None, status: Optional[str] = None,
+               created_from: Optional[str] = None, created_to: Optional[str] = None,
+               limit: Optional[int] = None, cursor: Optional[str] = None,
+               order_by: Optional[str] = None, fields: Optional[List[str]] = None) -> str:
         
         subscriptions = data.get("subscriptions", {})
-        results = []
-        
-        for subscription in subscriptions.values():
-            if subscription_id and str(subscription.get("subscription_id")) != str(subscription_id):
-                continue
-            if client_id and subscription.get("client_id") != client_id:
-                continue
-            if product_id and subscription.get("product_id") != product_id:
-                continue
-            if sla_tier and subscription.get("sla_tier") != sla_tier:
-                continue
-            if status and subscription.get("status") != status:
-                continue
-            results.append(subscription)
-        
-        return json.dumps(results)
+        try:
+            results = find_page(subscriptions, limit, cursor, order_by,
+                                ids={"subscription_id": subscription_id}, client_id=client_id,
+                                product_id=product_id, sla_tier=sla_tier, status=status,
+                                ranges={"created_at": (created_from, created_to)})
+            return dump_rows(subscriptions, results, fields)
+        except ValueError as e:
+            return json.dumps({"error": str(e)})
 
     @staticmethod
     def get_info() -> Dict[str, Any]:
@@ -39,7 +36,13 @@ class ListSubscription:
                         "client_id": {"type": "string", "description": "Filter by client"},
                         "product_id": {"type": "string", "description": "Filter by product"},
                         "sla_tier": {"type": "string", "description": "Filter by SLA tier (basic, standard, premium)"},
-                        "status": {"type": "string", "description": "Filter by status (active, inactive, cancelled, expired)"}
+                        "status": {"type": "string", "description": "Filter by status (active, inactive, cancelled, expired)"},
+                        "created_from": {"type": "string", "description": "Filter by creation time at or after (ISO-8601)"},
+                        "created_to": {"type": "string", "description": "Filter by creation time at or before (ISO-8601)"},
+                        "limit": {"type": "integer", "description": "Maximum number of rows per page; the response becomes {\"results\": [...], \"next_cursor\": ...}"},
+                        "cursor": {"type": "string", "description": "next_cursor of the previous page, to continue after it"},
+                        "order_by": {"type": "string", "description": "Column to sort by, prefixed with - for descending (default: the ID)"},
+                        "fields": {"type": "array", "items": {"type": "string"}, "description": "Fields to return for each row (default: all fields)"}
                     },
                     "required": []
                 }
@@ -1,6 +1,7 @@
 import json
 from typing import Any, Dict, Optional
 from tau_bench.envs.tool import Tool
+from ..store import next_id
 
 
 class LogSlaRecord(Tool):
@@ -8,11 +9,6 @@ class LogSlaRecord(Tool):
     def invoke(data: Dict[str, Any], subscription_id: str, response_time_minutes: int,
                resolution_time_hours: int, availability_percentage: Optional[float] = None) -> str:
         
-        def generate_id(table: Dict[str, Any]) -> int:
-            if not table:
-                return 1
-            return max(int(k) for k in table.keys()) + 1
-        
         slas = data.get("service_level_agreements", {})
         subscriptions = data.get("subscriptions", {})
         
@@ -20,7 +16,7 @@ class LogSlaRecord(Tool):
         if subscription_id not in subscriptions:
             return json.dumps({"error": f"Subscription {subscription_id} not found", "halt": True})
         
-        sla_id = str(generate_id(slas))
+        sla_id = next_id(slas)
         timestamp = "2025-10-01T00:00:00"
         
         new_sla = {
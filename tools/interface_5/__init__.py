@@ -20,6 +20,10 @@ from .register_change_request import RegisterChangeRequest
 from .register_escalation import RegisterEscalation
 from .register_post_incident_review import RegisterPostIncidentReview
 from .submit_rollback_request import SubmitRollbackRequest
+from .search_knowledge import SearchKnowledge
+from .evaluate_sla_compliance import EvaluateSlaCompliance
+from .find_due_incidents import FindDueIncidents
+from .aggregate_records import AggregateRecords
 
 
 ALL_TOOLS_INTERFACE_5 = [
@@ -44,5 +48,9 @@ ALL_TOOLS_INTERFACE_5 = [
     RegisterChangeRequest,
     RegisterEscalation,
     RegisterPostIncidentReview,
-    SubmitRollbackRequest
+    SubmitRollbackRequest,
+    SearchKnowledge,
+    EvaluateSlaCompliance,
+    FindDueIncidents,
+    AggregateRecords
 ]
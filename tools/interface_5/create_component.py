@@ -1,6 +1,7 @@
 import json
 from typing import Any, Dict, Optional
 from tau_bench.envs.tool import Tool
+from ..store import next_id, value_exists
 
 
 class CreateComponent(Tool):
@@ -10,11 +11,6 @@ class CreateComponent(Tool):
                location: Optional[str] = None, port_number: Optional[int] = None,
                operational_status: Optional[str] = 'operational') -> str:
         
-        def generate_id(table: Dict[str, Any]) -> int:
-            if not table:
-                return 1
-            return max(int(k) for k in table.keys()) + 1
-        
         components = data.get("infrastructure_components", {})
         products = data.get("products", {})
         
@@ -29,15 +25,14 @@ class CreateComponent(Tool):
             return json.dumps({"error": f"Invalid operational_status. Must be one of {valid_statuses}", "halt": True})
         
         # Check for unique component_name
-        for component in components.values():
-            if component.get("component_name") == component_name:
-                return json.dumps({"error": f"Component name {component_name} already exists", "halt": True})
+        if value_exists(components, "component_name", component_name):
+            return json.dumps({"error": f"Component name {component_name} already exists", "halt": True})
         
         # Validate product if provided
         if product_id and product_id not in products:
             return json.dumps({"error": f"Product {product_id} not found", "halt": True})
         
-        component_id = str(generate_id(components))
+        component_id = next_id(components)
         timestamp = "2025-10-01T00:00:00"
         
         new_component = {
@@ -1,6 +1,7 @@
 import json
 from typing import Any, Dict, Optional
 from tau_bench.envs.tool import Tool
+from ..store import next_id, value_exists
 
 
 class CreateProduct(Tool):
@@ -8,24 +9,18 @@ class CreateProduct(Tool):
     def invoke(data: Dict[str, Any], product_name: str, product_type: str,
                version: Optional[str] = None, support_vendor_id: Optional[str] = None) -> str:
         
-        def generate_id(table: Dict[str, Any]) -> int:
-            if not table:
-                return 1
-            return max(int(k) for k in table.keys()) + 1
-        
         products = data.get("products", {})
         vendors = data.get("vendors", {})
         
         # Check for unique product_name
-        for product in products.values():
-            if product.get("product_name") == product_name:
-                return json.dumps({"error": f"Product name {product_name} already exists", "halt": True})
+        if value_exists(products, "product_name", product_name):
+            return json.dumps({"error": f"Product name {product_name} already exists", "halt": True})
         
         # Validate vendor if provided
         if support_vendor_id and support_vendor_id not in vendors:
             return json.dumps({"error": f"Vendor {support_vendor_id} not found", "halt": True})
         
-        product_id = str(generate_id(products))
+        product_id = next_id(products)
         timestamp = "2025-10-01T00:00:00"
         
         new_product = {
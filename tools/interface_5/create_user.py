@@ -1,6 +1,7 @@
 import json
 from typing import Any, Dict, Optional
 from tau_bench.envs.tool import Tool
+from ..store import next_id, value_exists
 
 
 class CreateUser(Tool):
@@ -10,11 +11,6 @@ class CreateUser(Tool):
                vendor_id: Optional[str] = None, timezone: Optional[str] = 'UTC',
                status: Optional[str] = 'active') -> str:
         
-        def generate_id(table: Dict[str, Any]) -> int:
-            if not table:
-                return 1
-            return max(int(k) for k in table.keys()) + 1
-        
         users = data.get("users", {})
         clients = data.get("clients", {})
         vendors = data.get("vendors", {})
@@ -31,9 +27,8 @@ class CreateUser(Tool):
             return json.dumps({"error": f"Invalid status. Must be one of {valid_statuses}", "halt": True})
         
         # Check for unique email
-        for user in users.values():
-            if user.get("email") == email:
-                return json.dumps({"error": f"Email {email} already exists", "halt": True})
+        if value_exists(users, "email", email):
+            return json.dumps({"error": f"Email {email} already exists", "halt": True})
         
         # Validate client_id if provided
         if client_id and client_id not in clients:
@@ -43,7 +38,7 @@ class CreateUser(Tool):
         if vendor_id and vendor_id not in vendors:
             return json.dumps({"error": f"Vendor {vendor_id} not found", "halt": True})
         
-        user_id = str(generate_id(users))
+        user_id = next_id(users)
         timestamp = "2025-10-01T00:00:00"
         
         new_user = {
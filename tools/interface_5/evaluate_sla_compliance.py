@@ -0,0 +1,55 @@
+import json
+from typing import Any, Dict, Optional
+from ..store import cached_read, find_rows, sla_compliance, sla_rows
+
+class EvaluateSlaCompliance:
+    @staticmethod
+    @cached_read("incidents", "subscriptions", "service_level_agreements", "infrastructure_components",
+                 "performance_metrics", "incident_updates")
+    def invoke(data: Dict[str, Any], incident_id: Optional[str] = None, client_id: Optional[str] = None,
+               severity: Optional[str] = None, status: Optional[str] = None,
+               breached_only: Optional[bool] = False, as_of: Optional[str] = None) -> str:
+        incidents = data.get("incidents", {})
+
+        if severity and severity not in ["P1", "P2", "P3", "P4"]:
+            return json.dumps({"error": "Invalid severity. Must be one of ['P1', 'P2', 'P3', 'P4']"})
+
+        try:
+            rows = find_rows(incidents, ids={"incident_id": incident_id}, client_id=client_id,
+                             severity=severity, status=status)
+            # One pass over the matching incidents computes every breach flag and margin
+            results = sla_rows(sla_compliance(data, rows, as_of))
+        except ValueError as e:
+            return json.dumps({"error": str(e)})
+
+        if breached_only:
+            results = [r for r in results if r["response_breached"] or r["resolution_breached"]]
+
+        return json.dumps({
+            "evaluated": len(rows),
+            "response_breaches": sum(1 for r in results if r["response_breached"]),
+            "resolution_breaches": sum(1 for r in results if r["resolution_breached"]),
+            "incidents": results
+        })
+
+    @staticmethod
+    def get_info() -> Dict[str, Any]:
+        return {
+            "type": "function",
+            "function": {
+                "name": "evaluate_sla_compliance",
+                "description": "Evaluate incidents against their client's SLA (client subscription and severity level): response and resolution times, margins in minutes (negative when breached) and breach flags",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "incident_id": {"type": "string", "description": "Evaluate only this incident"},
+                        "client_id": {"type": "string", "description": "Evaluate only this client's incidents"},
+                        "severity": {"type": "string", "description": "Filter by severity (P1, P2, P3, P4)"},
+                        "status": {"type": "string", "description": "Filter by incident status"},
+                        "breached_only": {"type": "boolean", "description": "Return only incidents breaching their response or resolution target"},
+                        "as_of": {"type": "string", "description": "Time open incidents are measured up to (YYYY-MM-DDTHH:MM:SS, default 2025-10-01T00:00:00)"}
+                    },
+                    "required": []
+                }
+            }
+        }
@@ -1,32 +1,29 @@
 import json
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
+from ..store import cached_read, dump_rows, find_page
 
 class FetchComponent:
     @staticmethod
+    @cached_read("infrastructure_components")
     def invoke(data: Dict[str, Any], component_id: Optional[str] = None,
                component_name: Optional[str] = None, component_type: Optional[str] = None,
                product_id: Optional[str] = None, environment: Optional[str] = None,
-               operational_status: Optional[str] = None) -> str:
+               operational_status: Optional[str] = None,
+               created_from: Optional[str] = None, created_to: Optional[str] = None,
+               limit: Optional[int] = None, cursor: Optional[str] = None,
+               order_by: Optional[str] = None, fields: Optional[List[str]] = None) -> str:
         
         components = data.get("infrastructure_components", {})
-        results = []
-        
-        for component in components.values():
-            if component_id and str(component.get("component_id")) != str(component_id):
-                continue
-            if component_name and component_name.lower() not in component.get("component_name", "").lower():
-                continue
-            if component_type and component.get("component_type") != component_type:
-                continue
-            if product_id and component.get("product_id") != product_id:
-                continue
-            if environment and component.get("environment") != environment:
-                continue
-            if operational_status and component.get("operational_status") != operational_status:
-                continue
-            results.append(component)
-        
-        return json.dumps(results)
+        try:
+            results = find_page(components, limit, cursor, order_by,
+                                ids={"component_id": component_id},
+                                contains={"component_name": component_name},
+                                component_type=component_type, product_id=product_id,
+                                environment=environment, operational_status=operational_status,
+                                ranges={"created_at": (created_from, created_to)})
+            return dump_rows(components, results, fields)
+        except ValueError as e:
+            return json.dumps({"error": str(e)})
 
     @staticmethod
     def get_info() -> Dict[str, Any]:
@@ -43,7 +40,13 @@ class FetchComponent:
                         "component_type": {"type": "string", "description": "Filter by component type"},
                         "product_id": {"type": "string", "description": "Filter by associated product"},
                         "environment": {"type": "string", "description": "Filter by environment (production, staging, development, testing)"},
-                        "operational_status": {"type": "string", "description": "Filter by operational status (operational, degraded, offline, maintenance)"}
+                        "operational_status": {"type": "string", "description": "Filter by operational status (operational, degraded, offline, maintenance)"},
+                        "created_from": {"type": "string", "description": "Filter by creation time at or after (ISO-8601)"},
+                        "created_to": {"type": "string", "description": "Filter by creation time at or before (ISO-8601)"},
+                        "limit": {"type": "integer", "description": "Maximum number of rows per page; the response becomes {\"results\": [...], \"next_cursor\": ...}"},
+                        "cursor": {"type": "string", "description": "next_cursor of the previous page, to continue after it"},
+                        "order_by": {"type": "string", "description": "Column to sort by, prefixed with - for descending (default: the ID)"},
+                        "fields": {"type": "array", "items": {"type": "string"}, "description": "Fields to return for each row (default: all fields)"}
                     },
                     "required": []
                 }
@@ -1,27 +1,26 @@
 import json
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
+from ..store import cached_read, dump_rows, find_page
 
 class FetchProduct:
     @staticmethod
+    @cached_read("products")
     def invoke(data: Dict[str, Any], product_id: Optional[str] = None,
                product_name: Optional[str] = None, product_type: Optional[str] = None,
-               support_vendor_id: Optional[str] = None) -> str:
+               support_vendor_id: Optional[str] = None,
+               created_from: Optional[str] = None, created_to: Optional[str] = None,
+               limit: Optional[int] = None, cursor: Optional[str] = None,
+               order_by: Optional[str] = None, fields: Optional[List[str]] = None) -> str:
         
         products = data.get("products", {})
-        results = []
-        
-        for product in products.values():
-            if product_id and str(product.get("product_id")) != str(product_id):
-                continue
-            if product_name and product_name.lower() not in product.get("poduct_name", "").lower():
-                continue
-            if product_type and product.get("product_type") != product_type:
-                continue
-            if support_vendor_id and product.get("support_vendor_id") != support_vendor_id:
-                continue
-            results.append(product)
-        
-        return json.dumps(results)
+        try:
+            results = find_page(products, limit, cursor, order_by, ids={"product_id": product_id},
+                                contains={"product_name": product_name}, product_type=product_type,
+                                support_vendor_id=support_vendor_id,
+                                ranges={"created_at": (created_from, created_to)})
+            return dump_rows(products, results, fields)
+        except ValueError as e:
+            return json.dumps({"error": str(e)})
 
     @staticmethod
     def get_info() -> Dict[str, Any]:
@@ -36,7 +35,13 @@ class FetchProduct:
                         "product_id": {"type": "string", "description": "Filter by product ID"},
                         "product_name": {"type": "string", "description": "Filter by product name (partial match)"},
                         "product_type": {"type": "string", "description": "Filter by product type"},
-                        "support_vendor_id": {"type": "string", "description": "Filter by supporting vendor"}
+                        "support_vendor_id": {"type": "string", "description": "Filter by supporting vendor"},
+                        "created_from": {"type": "string", "description": "Filter by creation time at or after (ISO-8601)"},
+                        "created_to": {"type": "string", "description": "Filter by creation time at or before (ISO-8601)"},
+                        "limit": {"type": "integer", "description": "Maximum number of rows per page; the response becomes {\"results\": [...], \"next_cursor\": ...}"},
+                        "cursor": {"type": "string", "description": "next_cursor of the previous page, to continue after it"},
+                        "order_by": {"type": "string", "description": "Column to sort by, prefixed with - for descending (default: the ID)"},
+                        "fields": {"type": "array", "items": {"type": "string"}, "description": "Fields to return for each row (default: all fields)"}
                     },
                     "required": []
                 }
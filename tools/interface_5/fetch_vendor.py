@@ -1,32 +1,28 @@
 import json
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
+from ..store import cached_read, dump_rows, find_page
 
 class FetchVendor:
     @staticmethod
+    @cached_read("vendors")
     def invoke(data: Dict[str, Any], vendor_id: Optional[str] = None,
                vendor_name: Optional[str] = None, vendor_email: Optional[str] = None,
                vendor_phone: Optional[str] = None, vendor_type: Optional[str] = None,
-               status: Optional[str] = None) -> str:
+               status: Optional[str] = None,
+               created_from: Optional[str] = None, created_to: Optional[str] = None,
+               limit: Optional[int] = None, cursor: Optional[str] = None,
+               order_by: Optional[str] = None, fields: Optional[List[str]] = None) -> str:
         
         vendors = data.get("vendors", {})
-        results = []
-        
-        for vendor in vendors.values():
-            if vendor_id and str(vendor.get("vendor_id")) != str(vendor_id):
-                continue
-            if vendor_name and vendor_name.lower() not in vendor.get("vendor_name", "").lower():
-                continue
-            if vendor_email and vendor.get("contact_email", "").lower() != vendor_email.lower():
-                continue
-            if vendor_phone and vendor.get("contact_phone") != vendor_phone:
-                continue
-            if vendor_type and vendor.get("vendor_type") != vendor_type:
-                continue
-            if status and vendor.get("status") != status:
-                continue
-            results.append(vendor)
-        
-        return json.dumps(results)
+        try:
+            results = find_page(vendors, limit, cursor, order_by, ids={"vendor_id": vendor_id},
+                                casefold={"contact_email": vendor_email},
+                                contains={"vendor_name": vendor_name}, contact_phone=vendor_phone,
+                                vendor_type=vendor_type, status=status,
+                                ranges={"created_at": (created_from, created_to)})
+            return dump_rows(vendors, results, fields)
+        except ValueError as e:
+            return json.dumps({"error": str(e)})
 
     @staticmethod
     def get_info() -> Dict[str, Any]:
@@ -43,7 +39,13 @@ class FetchVendor:
                         "vendor_email": {"type": "string", "description": "Filter by email"},
                         "vendor_phone": {"type": "string", "description": "Filter by phone"},
                         "vendor_type": {"type": "string", "description": "Filter by vendor type (technology_provider, infrastructure_provider, security_provider, consulting_services, maintenance_services, cloud_provider, payment_processor)"},
-                        "status": {"type": "string", "description": "Filter by status (active, inactive, suspended)"}
+                        "status": {"type": "string", "description": "Filter by status (active, inactive, suspended)"},
+                        "created_from": {"type": "string", "description": "Filter by creation time at or after (ISO-8601)"},
+                        "created_to": {"type": "string", "description": "Filter by creation time at or before (ISO-8601)"},
+                        "limit": {"type": "integer", "description": "Maximum number of rows per page; the response becomes {\"results\": [...], \"next_cursor\": ...}"},
+                        "cursor": {"type": "string", "description": "next_cursor of the previous page, to continue after it"},
+                        "order_by": {"type": "string", "description": "Column to sort by, prefixed with - for descending (default: the ID)"},
+                        "fields": {"type": "array", "items": {"type": "string"}, "description": "Fields to return for each row (default: all fields)"}
                     },
                     "required": []
                 }
@@ -0,0 +1,40 @@
+import json
+from typing import Any, Dict, Optional
+from ..store import cached_read, deadline_scheduler
+
+class FindDueIncidents:
+    @staticmethod
+    @cached_read("incidents", "subscriptions", "service_level_agreements", "infrastructure_components")
+    def invoke(data: Dict[str, Any], within_minutes: Optional[float] = 60, as_of: Optional[str] = None,
+               limit: Optional[int] = None) -> str:
+        if isinstance(within_minutes, bool) or not isinstance(within_minutes, (int, float)) or within_minutes < 0:
+            return json.dumps({"error": "within_minutes must be zero or positive"})
+        if limit is not None and (isinstance(limit, bool) or not isinstance(limit, int) or limit < 1):
+            return json.dumps({"error": "limit must be a positive integer"})
+
+        try:
+            # Deadlines come off the scheduler's heap in order; nothing past the horizon is read
+            results = deadline_scheduler(data).due(within_minutes, as_of, limit)
+        except ValueError as e:
+            return json.dumps({"error": str(e)})
+
+        return json.dumps(results)
+
+    @staticmethod
+    def get_info() -> Dict[str, Any]:
+        return {
+            "type": "function",
+            "function": {
+                "name": "find_due_incidents",
+                "description": "List SLA response and resolution deadlines of open incidents that are overdue or due within the next N minutes, earliest first",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "within_minutes": {"type": "number", "description": "Look-ahead window in minutes (default 60); 0 lists only overdue deadlines"},
+                        "as_of": {"type": "string", "description": "Current time (YYYY-MM-DDTHH:MM:SS, default 2025-10-01T00:00:00)"},
+                        "limit": {"type": "integer", "description": "Maximum number of deadlines to return"}
+                    },
+                    "required": []
+                }
+            }
+        }
@@ -1,5 +1,6 @@
 import json
 from typing import Any, Dict
+from ..store import next_id
 
 class RecordAudit:
     @staticmethod
@@ -7,11 +8,6 @@ class RecordAudit:
                entity_id: str, performed_by_user: str, action_details: Dict[str, Any],
                timestamp: str) -> str:
         
-        def generate_id(table: Dict[str, Any]) -> str:
-            if not table:
-                return "1"
-            return str(max(int(k) for k in table.keys()) + 1)
-        
         audit_logs = data.get("audit_logs", {})
         users = data.get("users", {})
         
@@ -19,7 +15,7 @@ class RecordAudit:
         if str(performed_by_user) not in users:
             return json.dumps({"error": f"User {performed_by_user} not found", "halt": True})
         
-        audit_id = generate_id(audit_logs)
+        audit_id = next_id(audit_logs)
         
         new_audit = {
             "audit_id": audit_id,
@@ -1,5 +1,6 @@
 import json
 from typing import Any, Dict, Optional
+from ..store import next_id
 
 class RegisterChangeRequest:
     @staticmethod
@@ -7,11 +8,6 @@ class RegisterChangeRequest:
                requesting_user: str, incident_id: Optional[str] = None, 
                status: Optional[str] = 'requested', approved_by_user: Optional[str] = None) -> str:
         
-        def generate_id(table: Dict[str, Any]) -> str:
-            if not table:
-                return "1"
-            return str(max(int(k) for k in table.keys()) + 1)
-        
         change_requests = data.get("change_requests", {})
         users = data.get("users", {})
         incidents = data.get("incidents", {})
@@ -43,7 +39,7 @@ class RegisterChangeRequest:
         if status not in valid_statuses:
             return json.dumps({"error": f"Invalid status. Must be one of {valid_statuses}", "halt": True})
         
-        change_id = generate_id(change_requests)
+        change_id = next_id(change_requests)
         timestamp = "2025-10-01T00:00:00"
         
         new_change_request = {
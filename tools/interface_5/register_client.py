@@ -1,6 +1,7 @@
 import json
 from typing import Any, Dict, Optional
 from tau_bench.envs.tool import Tool
+from ..store import next_id, value_exists
 
 
 class RegisterClient(Tool):
@@ -9,11 +10,6 @@ class RegisterClient(Tool):
                contact_email: str, client_type: str, country: Optional[str] = None,
                industry: Optional[str] = None, status: Optional[str] = 'active') -> str:
         
-        def generate_id(table: Dict[str, Any]) -> int:
-            if not table:
-                return 1
-            return max(int(k) for k in table.keys()) + 1
-        
         clients = data.get("clients", {})
         
         # Validate client_type
@@ -27,16 +23,14 @@ class RegisterClient(Tool):
             return json.dumps({"error": f"Invalid status. Must be one of {valid_statuses}", "halt": True})
         
         # Check for unique registration_number
-        for client in clients.values():
-            if client.get("registration_number") == registration_number:
-                return json.dumps({"error": f"Registration number {registration_number} already exists", "halt": True})
+        if value_exists(clients, "registration_number", registration_number):
+            return json.dumps({"error": f"Registration number {registration_number} already exists", "halt": True})
         
         # Check for unique contact_email
-        for client in clients.values():
-            if client.get("contact_email") == contact_email:
-                return json.dumps({"error": f"Contact email {contact_email} already exists", "halt": True})
+        if value_exists(clients, "contact_email", contact_email):
+            return json.dumps({"error": f"Contact email {contact_email} already exists", "halt": True})
         
-        client_id = str(generate_id(clients))
+        client_id = next_id(clients)
         timestamp = "2025-10-01T00:00:00"
         
         new_client = {
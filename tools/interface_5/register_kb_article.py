@@ -1,5 +1,6 @@
 import json
 from typing import Any, Dict, Optional
+from ..store import next_id
 
 class RegisterKbArticle:
     @staticmethod
@@ -7,11 +8,6 @@ class RegisterKbArticle:
                created_by_user: str, incident_id: Optional[str] = None,
                reviewer_user: Optional[str] = None, status: Optional[str] = 'draft') -> str:
         
-        def generate_id(table: Dict[str, Any]) -> str:
-            if not table:
-                return "1"
-            return str(max(int(k) for k in table.keys()) + 1)
-        
         kb_articles = data.get("knowledge_base_articles", {})
         users = data.get("users", {})
         incidents = data.get("incidents", {})
@@ -43,7 +39,7 @@ class RegisterKbArticle:
         if status not in valid_statuses:
             return json.dumps({"error": f"Invalid status. Must be one of {valid_statuses}", "halt": True})
         
-        article_id = generate_id(kb_articles)
+        article_id = next_id(kb_articles)
         timestamp = "2025-10-01T00:00:00"
         
         new_article = {
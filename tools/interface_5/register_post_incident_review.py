@@ -1,16 +1,12 @@
 import json
 from typing import Any, Dict, Optional
+from ..store import next_id
 
 class RegisterPostIncidentReview:
     @staticmethod
     def invoke(data: Dict[str, Any], incident_id: str, facilitator_user: str,
                scheduled_date: str, overall_rating: str, status: Optional[str] = 'scheduled') -> str:
         
-        def generate_id(table: Dict[str, Any]) -> str:
-            if not table:
-                return "1"
-            return str(max(int(k) for k in table.keys()) + 1)
-        
         post_incident_reviews = data.get("post_incident_reviews", {})
         incidents = data.get("incidents", {})
         users = data.get("users", {})
@@ -33,7 +29,7 @@ class RegisterPostIncidentReview:
         if status not in valid_statuses:
             return json.dumps({"error": f"Invalid status. Must be one of {valid_statuses}", "halt": True})
         
-        review_id = generate_id(post_incident_reviews)
+        review_id = next_id(post_incident_reviews)
         timestamp = "2025-10-01T00:00:00"
         
         new_review = {
@@ -1,6 +1,7 @@
 import json
 from typing import Any, Dict, Optional
 from tau_bench.envs.tool import Tool
+from ..store import next_id, value_exists
 
 
 class RegisterVendor(Tool):
@@ -8,11 +9,6 @@ class RegisterVendor(Tool):
     def invoke(data: Dict[str, Any], vendor_name: str, vendor_email: str,
                vendor_phone: str, vendor_type: str, status: Optional[str] = 'active') -> str:
         
-        def generate_id(table: Dict[str, Any]) -> int:
-            if not table:
-                return 1
-            return max(int(k) for k in table.keys()) + 1
-        
         vendors = data.get("vendors", {})
         
         # Validate vendor_type
@@ -27,21 +23,18 @@ class RegisterVendor(Tool):
             return json.dumps({"error": f"Invalid status. Must be one of {valid_statuses}", "halt": True})
         
         # Check for unique vendor_name
-        for vendor in vendors.values():
-            if vendor.get("vendor_name") == vendor_name:
-                return json.dumps({"error": f"Vendor name {vendor_name} already exists", "halt": True})
+        if value_exists(vendors, "vendor_name", vendor_name):
+            return json.dumps({"error": f"Vendor name {vendor_name} already exists", "halt": True})
         
         # Check for unique contact_email
-        for vendor in vendors.values():
-            if vendor.get("contact_email") == vendor_email:
-                return json.dumps({"error": f"Contact email {vendor_email} already exists", "halt": True})
+        if value_exists(vendors, "contact_email", vendor_email):
+            return json.dumps({"error": f"Contact email {vendor_email} already exists", "halt": True})
         
         # Check for unique contact_phone
-        for vendor in vendors.values():
-            if vendor.get("contact_phone") == vendor_phone:
-                return json.dumps({"error": f"Contact phone {vendor_phone} already exists", "halt": True})
+        if value_exists(vendors, "contact_phone", vendor_phone):
+            return json.dumps({"error": f"Contact phone {vendor_phone} already exists", "halt": True})
         
-        vendor_id = str(generate_id(vendors))
+        vendor_id = next_id(vendors)
         timestamp = "2025-10-01T00:00:00"
         
         new_vendor = {
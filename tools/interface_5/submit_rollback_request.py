@@ -1,5 +1,6 @@
 import json
 from typing import Any, Dict, Optional
+from ..store import next_id
 
 class SubmitRollbackRequest:
     @staticmethod
@@ -7,11 +8,6 @@ class SubmitRollbackRequest:
                incident_id: Optional[str] = None, status: Optional[str] = 'requested',
                approved_by_user: Optional[str] = None, completed_at: Optional[str] = None) -> str:
         
-        def generate_id(table: Dict[str, Any]) -> str:
-            if not table:
-                return "1"
-            return str(max(int(k) for k in table.keys()) + 1)
-        
         rollback_requests = data.get("rollback_requests", {})
         change_requests = data.get("change_requests", {})
         users = data.get("users", {})
@@ -38,7 +34,7 @@ class SubmitRollbackRequest:
         if status not in valid_statuses:
             return json.dumps({"error": f"Invalid status. Must be one of {valid_statuses}", "halt": True})
         
-        rollback_id = generate_id(rollback_requests)
+        rollback_id = next_id(rollback_requests)
         timestamp = "2025-10-01T00:00:00"
         
         new_rollback = {
@@ -0,0 +1,27 @@
+from .aggregate import Aggregate, aggregate, parse_aggregate, percentile
+from .cache import RESULT_CACHE, ResultCache, bump_version, cached_read, table_version
+from .compact import CompactRecord, CompactTable, compact_tables, record_type, seeder_columns
+from .cow import CowData, CowTable, freeze
+from .deadlines import DeadlineScheduler, deadline_scheduler, to_timestamp
+from .dirty import DirtyTracker, apply_deltas
+from .ids import IdSequence, next_id
+from .interning import intern_data, intern_keys, intern_rows, interned_columns
+from .lazy import LazyData, interface_tables, load_interface_data
+from .loader import build_table, index_tables, load_data, load_table, save_table, subscribe_tables
+from .merkle import DatabaseHash, TableHash, row_hash
+from .paging import decode_cursor, encode_cursor, paginate
+from .planner import Predicate, QueryPlan, find_page, find_rows, predicates
+from .projection import ProjectionCache, check_fields, dump_rows, project, projection_cache
+from .query import candidate_rows, search_rows, value_exists
+from .rollup import (MetricGroup, MetricRollup, first_metric_values, incident_metric_summary,
+                     incident_metric_values, metric_rollup)
+from .sla import SlaMap, sla_compliance, sla_rows
+from .snapshot import Snapshot, SnapshotTable, convert_json_dir, open_snapshot, write_snapshot
+from .sqlite import SqliteData, SqliteTable, convert_json_dir_to_sqlite, open_sqlite, write_sqlite
+from .stream import stream_ndjson, stream_rows, write_ndjson
+from .table import MISSING, IndexedTable, Row, ViewRow
+from .textindex import TextIndex, tokenize
+from .timeindex import TimeIndex, in_time_range, to_epoch
+from .transaction import Savepoint, Transaction
+from .trigram import TrigramIndex, trigrams
+from .wal import WriteAheadLog, apply_record, read_log
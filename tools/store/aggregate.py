@@ -0,0 +1,185 @@
+"""Grouped aggregates over a table, returning only the aggregate rows.
+
+An aggregate is "count" or "<function>:<column>" with function one of
+count, sum, min, max, avg or a percentile "p<N>" (p50, p95, p99.9, ...).
+count:<column> counts rows where the column is set; sum, avg and the
+percentiles take the numeric values of the column, and min and max any
+values, ordered as paging orders them.
+
+Row counts grouped by one hash-indexed column are read off the index
+buckets, intersected with the keys of any equality filters on indexed
+columns, without visiting a row. Everything else is one pass over the rows
+the query plan selects, accumulating per group and column.
+"""
+import math
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from .paging import sort_value
+from .planner import QueryPlan, predicates
+
+# Aggregate functions besides the p<N> percentiles
+FUNCTIONS = ("count", "sum", "min", "max", "avg")
+
+
+class Aggregate(NamedTuple):
+    """One parsed aggregate: its output name, function, column (None for row count) and percentile"""
+    name: str
+    function: str
+    column: Optional[str]
+    percentile: Optional[float]
+
+
+def parse_aggregate(spec: Any) -> Aggregate:
+    """Aggregate for a spec such as "count", "avg:rto_hours" or "p95:calculated_value_minutes"; ValueError if invalid"""
+    if spec == "count":
+        return Aggregate("count", "count", None, None)
+    function, _, column = spec.partition(":") if isinstance(spec, str) else ("", "", "")
+    percentile = None
+    if function.startswith("p") and function not in FUNCTIONS:
+        try:
+            percentile = float(function[1:])
+        except ValueError:
+            percentile = -1.0
+        if not 0 <= percentile <= 100:
+            raise ValueError(f"Invalid percentile in aggregate {spec!r}; use p0 to p100")
+    elif function not in FUNCTIONS:
+        raise ValueError(f"Invalid aggregate {spec!r}. Use 'count' or '<function>:<column>' "
+                         f"with function one of {list(FUNCTIONS)} or p<N>")
+    if not column:
+        raise ValueError(f"Aggregate {spec!r} needs a column: '{function}:<column>'")
+    return Aggregate(f"{function}_{column}", function, column, percentile)
+
+
+def _numeric(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def percentile(values: Sequence[float], p: float) -> Optional[float]:
+    """p-th percentile of sorted values, interpolating linearly between the closest ranks"""
+    if not values:
+        return None
+    rank = (len(values) - 1) * p / 100
+    low = math.floor(rank)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (rank - low)
+
+
+class _Column:
+    """Running statistics of one column within one group"""
+    __slots__ = ("count", "numbers", "sum", "min", "max", "low", "high", "values")
+
+    def __init__(self, keep_values: bool):
+        self.count = 0
+        self.numbers = 0
+        self.sum = 0
+        self.min = None
+        self.max = None
+        # sort_value() of min and max
+        self.low = self.high = None
+        self.values: Optional[List[float]] = [] if keep_values else None
+
+    def add(self, value: Any) -> None:
+        if value is None:
+            return
+        self.count += 1
+        order = sort_value(value)
+        if self.low is None or order < self.low:
+            self.min, self.low = value, order
+        if self.high is None or order > self.high:
+            self.max, self.high = value, order
+        if _numeric(value):
+            self.numbers += 1
+            self.sum += value
+            if self.values is not None:
+                self.values.append(value)
+
+    def result(self, aggregate: Aggregate) -> Any:
+        function = aggregate.function
+        if function == "count":
+            return self.count
+        if function in ("min", "max"):
+            return getattr(self, function)
+        if function == "sum":
+            return self.sum if self.numbers else None
+        if function == "avg":
+            return round(self.sum / self.numbers, 4) if self.numbers else None
+        value = percentile(sorted(self.values), aggregate.percentile)
+        return round(value, 4) if value is not None else None
+
+
+def _group_value(value: Any) -> Any:
+    # Group keys must be hashable; nested values group by their JSON-like repr
+    return repr(value) if isinstance(value, (dict, list)) else value
+
+
+def _index_counts(table: Any, column: str, filters: Dict[str, Any]) -> Optional[List[Tuple[Any, int]]]:
+    # (group value, row count) from the column's hash index; None if the index cannot answer
+    if not hasattr(table, "index_buckets"):
+        return None
+    buckets = table.index_buckets(column)
+    if buckets is None:
+        return None
+    keys: Optional[Set[str]] = None
+    for filter_column, value in filters.items():
+        if not table.has_index(filter_column) or isinstance(value, (dict, list)):
+            return None
+        found = table.lookup(filter_column, value)
+        # The index matches values by their text; the filter must match exactly
+        sample = next(iter(found), None)
+        if sample is not None and table[sample].get(filter_column) != value:
+            return None
+        keys = set(found) if keys is None else keys & found
+    total = len(table) if keys is None else len(keys)
+    counts = []
+    for bucket in buckets.values():
+        count = len(bucket) if keys is None else len(bucket & keys)
+        if count:
+            # Every row of a bucket holds a value with the same text; any one stands for the group
+            counts.append((table[next(iter(bucket))].get(column), count))
+            total -= count
+    if total:
+        # Key, foreign key and enum columns are never nested, so the rows left over are nulls
+        counts.append((None, total))
+    return counts
+
+
+def aggregate(table: Dict[str, Any], group_by: Optional[Sequence[str]] = None,
+              aggregates: Iterable[Any] = ("count",), filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """One row per distinct group_by value combination with the requested aggregates, groups in sorted order.
+
+    filters are plain equality on columns, skipped when their value is
+    falsy as in find_rows(). Without group_by the result is a single row over
+    every matching row (none if no row matches).
+    """
+    group_by = list(group_by or [])
+    parsed = [parse_aggregate(spec) for spec in aggregates or ("count",)]
+    filters = {column: value for column, value in (filters or {}).items() if value}
+
+    if len(group_by) == 1 and all(a.column is None for a in parsed):
+        counts = _index_counts(table, group_by[0], filters)
+        if counts is not None:
+            results = [{group_by[0]: value, **{a.name: count for a in parsed}} for value, count in counts]
+            results.sort(key=lambda row: tuple(sort_value(row[c]) for c in group_by))
+            return results
+
+    columns = list(dict.fromkeys(a.column for a in parsed if a.column is not None))
+    keep_values = {a.column for a in parsed if a.percentile is not None}
+    stats: Dict[Tuple, List[Any]] = {}
+    rows = QueryPlan(table, predicates(None, None, None, None, **filters)).rows()
+    for row in rows:
+        key = tuple(_group_value(row.get(column)) for column in group_by)
+        group = stats.get(key)
+        if group is None:
+            group = stats[key] = [0, {column: _Column(column in keep_values) for column in columns}]
+        group[0] += 1
+        for column, accumulator in group[1].items():
+            accumulator.add(row.get(column))
+
+    results = []
+    for key in sorted(stats, key=lambda key: tuple(sort_value(value) for value in key)):
+        count, accumulators = stats[key]
+        result = dict(zip(group_by, key))
+        for a in parsed:
+            result[a.name] = count if a.column is None else accumulators[a.column].result(a)
+        results.append(result)
+    return results
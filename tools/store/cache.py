@@ -0,0 +1,160 @@
+"""Result cache for the read-only get tools.
+
+cached_read() wraps a tool's invoke. A call is keyed on the tool plus its
+arguments bound to the signature with defaults applied, so keyword order
+and spelled-out defaults do not matter. The serialized response is kept in
+a process-wide LRU bounded by a byte budget.
+
+Entries are validated by table versions rather than expired. Each table
+the tool reads carries a version token that changes on every row insert,
+replace, delete or field write, so a set tool writing to a table
+invalidates every cached read of it. Tables that do not publish change
+notifications (plain dicts, copy-on-write overlays) are never cached.
+"""
+import functools
+import inspect
+import itertools
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# Default byte budget of the shared cache
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Version tokens come from one sequence, so a table created later can never
+# reuse a token a cached entry was stored under
+_tokens = itertools.count(1)
+
+
+class TableVersion:
+    """Change observer holding a table's current version token"""
+    __slots__ = ("token",)
+
+    def __init__(self):
+        self.token = next(_tokens)
+
+    def __call__(self, table: Any, key: str, field: Optional[str], old: Any, new: Any) -> None:
+        self.token = next(_tokens)
+
+
+def table_version(table: Any) -> Optional[int]:
+    """Current version token of a table; None if its writes cannot be observed"""
+    version = getattr(table, "_version", None)
+    if version is None:
+        if not hasattr(table, "subscribe"):
+            return None
+        version = TableVersion()
+        try:
+            table._version = version
+        except AttributeError:
+            return None
+        table.subscribe(version)
+    return version.token
+
+
+def bump_version(table: Any) -> None:
+    """Invalidate cached reads of a table after a write that bypassed its change notification"""
+    version = getattr(table, "_version", None)
+    if version is not None:
+        version.token = next(_tokens)
+
+
+class ResultCache:
+    """LRU of serialized tool responses within a byte budget, with hit/miss counters"""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Tuple, Tuple[Tuple, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple, versions: Tuple) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == versions:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                # Stale: one of the tables changed since it was stored
+                self._drop(key)
+            self.misses += 1
+            return None
+
+    def put(self, key: Tuple, versions: Tuple, response: str) -> None:
+        size = _entry_size(key, response)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (versions, response)
+            self.size += size
+            while self.size > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _drop(self, key: Tuple) -> None:
+        _, response = self._entries.pop(key)
+        self.size -= _entry_size(key, response)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._entries), "bytes": self.size, "max_bytes": self.max_bytes,
+                "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+def _entry_size(key: Tuple, response: str) -> int:
+    # Responses are ASCII JSON (json.dumps escapes the rest), so length is bytes
+    return len(response) + len(key[1])
+
+
+RESULT_CACHE = ResultCache()
+
+
+def cached_read(*table_names: str, table_arguments: Tuple[str, ...] = (),
+                cache: Optional[ResultCache] = None) -> Callable:
+    """Decorator caching a get tool's invoke(data, ...) against the versions of the tables it reads.
+
+    table_arguments names the tool's arguments whose value is the name of a
+    table it reads, for tools that take the table from the caller.
+    """
+    def decorate(invoke: Callable[..., str]) -> Callable[..., str]:
+        signature = inspect.signature(invoke)
+        tool = f"{invoke.__module__}.{invoke.__qualname__}"
+
+        @functools.wraps(invoke)
+        def wrapper(data: Dict[str, Any], *args: Any, **kwargs: Any) -> str:
+            target = cache if cache is not None else RESULT_CACHE
+            try:
+                bound = signature.bind(data, *args, **kwargs)
+                bound.apply_defaults()
+                arguments = dict(bound.arguments)
+                del arguments[next(iter(arguments))]
+                key = (tool, json.dumps(arguments, sort_keys=True))
+            except TypeError:
+                # Bad arguments or unserializable values: let the tool answer
+                return invoke(data, *args, **kwargs)
+            versions = []
+            for table_name in table_names + tuple(arguments.get(name) for name in table_arguments):
+                table = data.get(table_name) if isinstance(table_name, str) else None
+                version = table_version(table) if table is not None else None
+                if version is None:
+                    return invoke(data, *args, **kwargs)
+                versions.append(version)
+            versions = tuple(versions)
+            response = target.get(key, versions)
+            if response is None:
+                response = invoke(data, *args, **kwargs)
+                target.put(key, versions, response)
+            return response
+        return wrapper
+    return decorate
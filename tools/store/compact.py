@@ -0,0 +1,300 @@
+"""Compact row storage for high-cardinality tables.
+
+Each compact table gets a record class with one __slots__ entry per column the
+seeder in faker_db_helper.py writes for it, so a stored row costs a fixed set
+of pointers instead of a dict. Fields outside that column set go to a per-row
+overflow dict, and a field order other than the column order is kept as a
+shared tuple, so a row reads back exactly as it was written.
+
+Tools still receive dicts: CompactTable materializes a Row when a record is
+read, keeps it while the caller holds it, and folds field writes on it back
+into the record.
+"""
+import ast
+import os
+import weakref
+from collections.abc import MutableMapping
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Type
+
+from .ids import IdSequence
+from .schema import (COMPACT_TABLES, REPO_ROOT, casefold_columns, indexed_columns, primary_key,
+                     time_columns, unique_columns)
+from .table import MISSING, HashIndex, Observer, ViewRow
+from .timeindex import TimeIndex
+
+SEEDER_PATH = os.path.join(REPO_ROOT, "faker_db_helper.py")
+
+# Field orders of rows stored out of column order, shared between rows
+_ORDERS: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+
+@lru_cache(maxsize=None)
+def seeder_columns(table_name: str, seeder_path: str = SEEDER_PATH) -> Tuple[str, ...]:
+    """Columns of the row dict literal built by the seeder's generate_<table_name> method"""
+    if not os.path.exists(seeder_path):
+        return ()
+    with open(seeder_path) as f:
+        tree = ast.parse(f.read(), seeder_path)
+    for node in ast.walk(tree):
+        if not (isinstance(node, ast.FunctionDef) and node.name == f"generate_{table_name}"):
+            continue
+        for statement in ast.walk(node):
+            if (isinstance(statement, ast.Assign) and isinstance(statement.targets[0], ast.Subscript)
+                    and isinstance(statement.value, ast.Dict)):
+                keys = statement.value.keys
+                if keys and all(isinstance(k, ast.Constant) and isinstance(k.value, str) for k in keys):
+                    return tuple(k.value for k in keys)
+    return ()
+
+
+class CompactRecord:
+    """Base of the generated record classes; unset column slots are absent fields"""
+    __slots__ = ("_extra", "_order", "_position")
+    table_name: str = ""
+    columns: Tuple[str, ...] = ()
+    column_set: frozenset = frozenset()
+
+    def __reduce__(self):
+        # Generated classes are not importable, so records pickle as their values
+        return (_restore_record, (self.table_name, self.columns, self.to_dict(), self._position))
+
+    @classmethod
+    def from_dict(cls, row: Dict[str, Any], position: int = 0) -> "CompactRecord":
+        record = cls.__new__(cls)
+        extra = None
+        column_set = cls.column_set
+        for field, value in row.items():
+            if field in column_set:
+                object.__setattr__(record, field, value)
+            else:
+                if extra is None:
+                    extra = {}
+                extra[field] = value
+        record._extra = extra
+        record._position = position
+        fields = tuple(row)
+        canonical = tuple(column for column in cls.columns if column in row) + tuple(extra or ())
+        record._order = None if fields == canonical else _ORDERS.setdefault(fields, fields)
+        return record
+
+    def get(self, field: str, default: Any = None) -> Any:
+        if field in self.column_set:
+            return getattr(self, field, default)
+        if self._extra is None:
+            return default
+        return self._extra.get(field, default)
+
+    def set(self, field: str, value: Any) -> None:
+        """Change the value of a field the record already has"""
+        if field in self.column_set:
+            object.__setattr__(self, field, value)
+        else:
+            self._extra[field] = value
+
+    def to_dict(self) -> Dict[str, Any]:
+        if self._order is not None:
+            return {field: self.get(field) for field in self._order}
+        row = {}
+        for column in self.columns:
+            value = getattr(self, column, MISSING)
+            if value is not MISSING:
+                row[column] = value
+        if self._extra:
+            row.update(self._extra)
+        return row
+
+
+@lru_cache(maxsize=None)
+def record_type(table_name: str, columns: Optional[Tuple[str, ...]] = None) -> Type[CompactRecord]:
+    """Record class for a table, with slots for columns (default: the seeder's columns)"""
+    if columns is None:
+        columns = seeder_columns(table_name)
+    class_name = "".join(part.title() for part in table_name.split("_")) + "Record"
+    return type(class_name, (CompactRecord,), {
+        "__slots__": columns,
+        "table_name": table_name,
+        "columns": columns,
+        "column_set": frozenset(columns),
+    })
+
+
+def _restore_record(table_name: str, columns: Tuple[str, ...], row: Dict[str, Any],
+                    position: int) -> CompactRecord:
+    return record_type(table_name, columns).from_dict(row, position)
+
+
+class CompactTable(MutableMapping):
+    """{id: row} table storing compact records, with the same hash indexes and
+    change notifications as IndexedTable"""
+
+    frozen = False
+
+    def __init__(self, name: str, rows: Optional[Dict[str, Any]] = None,
+                 record: Optional[Type[CompactRecord]] = None):
+        self.name = name
+        self.primary_key = primary_key(name)
+        self.record = record or record_type(name)
+        self._records: Dict[str, CompactRecord] = {}
+        self._cache: "weakref.WeakValueDictionary[str, ViewRow]" = weakref.WeakValueDictionary()
+        self._indexes: Dict[str, Any] = {}
+        self._column_indexes: Dict[str, List[HashIndex]] = {}
+        self._observers: List[Observer] = []
+        self._next_position = 0
+        self.ids = IdSequence()
+        self.ids.bind(self)
+        unique = set(unique_columns(name))
+        for column in indexed_columns(name) + unique_columns(name):
+            self._add_index(column, False, column in unique)
+        for column in casefold_columns(name):
+            self._add_index(column, True, column in unique)
+        for column in time_columns(name):
+            self._indexes[f"{column}:time"] = index = TimeIndex(column)
+            self._column_indexes.setdefault(column, []).append(index)
+        if rows:
+            for key, row in rows.items():
+                self[key] = row
+
+    def _add_index(self, column: str, casefold: bool, unique: bool) -> None:
+        name = f"{column}:casefold" if casefold else column
+        if name not in self._indexes:
+            index = self._indexes[name] = HashIndex(column, casefold, unique)
+            self._column_indexes.setdefault(column, []).append(index)
+
+    def _current(self, key: str) -> Dict[str, Any]:
+        row = self._cache.get(key)
+        return row if row is not None else self._records[key].to_dict()
+
+    def _release(self, key: str) -> None:
+        row = self._cache.pop(key, None)
+        if row is not None:
+            row._table = None
+
+    def _notify(self, key: str, field: Optional[str], old: Any, new: Any) -> None:
+        for observer in self._observers:
+            observer(self, key, field, old, new)
+
+    def _row_changed(self, key: str, field: str, old: Any, new: Any) -> None:
+        record = self._records[key]
+        if old is not MISSING and new is not MISSING:
+            record.set(field, new)
+        else:
+            # A field was added or removed: re-encode from the row being written
+            self._records[key] = self.record.from_dict(self._cache[key], record._position)
+        for index in self._column_indexes.get(field, ()):
+            if old is not MISSING and new is not MISSING and index.key(old) == index.key(new):
+                continue
+            if old is not MISSING:
+                index.remove(old, key)
+            if new is not MISSING:
+                index.add(new, key)
+        self._notify(key, field, old, new)
+
+    # Mapping protocol
+
+    def __getitem__(self, key: str) -> ViewRow:
+        row = self._cache.get(key)
+        if row is None:
+            row = ViewRow(self._records[key].to_dict(), self, key)
+            self._cache[key] = row
+        return row
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._records
+
+    def __setitem__(self, key: str, row: Dict[str, Any]) -> None:
+        record = self._records.get(key)
+        cached = self._cache.get(key)
+        if record is not None:
+            old = self._current(key)
+            for index in self._indexes.values():
+                index.remove(old.get(index.column), key)
+            if cached is not row:
+                self._release(key)
+            position = record._position
+        else:
+            old = MISSING
+            position = self._next_position
+            self._next_position += 1
+            self.ids.observe(key)
+        self._records[key] = self.record.from_dict(row, position)
+        if isinstance(row, ViewRow) and (row._table is None or row is cached):
+            row._table, row._key = self, key
+            self._cache[key] = row
+        for index in self._indexes.values():
+            index.add(row.get(index.column), key)
+        self._notify(key, None, old, row)
+
+    def __delitem__(self, key: str) -> None:
+        old = self._current(key)
+        del self._records[key]
+        for index in self._indexes.values():
+            index.remove(old.get(index.column), key)
+        self._release(key)
+        self.ids.forget(key)
+        self._notify(key, None, old, MISSING)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._records)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def copy(self) -> "CompactTable":
+        return CompactTable(self.name, self, self.record)
+
+    def __reduce__(self):
+        # Rebuilt from plain rows: the id sequence holds a lock and the record
+        # class is generated, so neither pickles; indexes are rebuilt on load
+        rows = {key: record.to_dict() for key, record in self._records.items()}
+        return (_restore_table, (self.name, rows, self.record.columns))
+
+    # Change notification
+
+    def subscribe(self, observer: Observer) -> None:
+        self._observers.append(observer)
+
+    def unsubscribe(self, observer: Observer) -> None:
+        self._observers.remove(observer)
+
+    # Index protocol used by candidate_rows/value_exists
+
+    def has_index(self, column: str, casefold: bool = False) -> bool:
+        return (f"{column}:casefold" if casefold else column) in self._indexes
+
+    def lookup(self, column: str, value: Any, casefold: bool = False) -> Set[str]:
+        return self._indexes[f"{column}:casefold" if casefold else column].get(value)
+
+    def index_buckets(self, column: str) -> Optional[Dict[str, Set[str]]]:
+        index = self._indexes.get(column)
+        return index.buckets if index is not None else None
+
+    def has_time_index(self, column: str) -> bool:
+        return f"{column}:time" in self._indexes
+
+    def range_lookup(self, column: str, start: Optional[str] = None, end: Optional[str] = None) -> List[str]:
+        return self._indexes[f"{column}:time"].range(start, end)
+
+    @property
+    def keys_ascending(self) -> bool:
+        """Whether table order is ascending integer key order: each key was inserted above the last"""
+        return self.ids.ascending
+
+    def order_keys(self, keys: Iterable[str]) -> List[str]:
+        records = self._records
+        return sorted(keys, key=lambda key: records[key]._position)
+
+    def rows_for_keys(self, keys: Iterable[str]) -> List[ViewRow]:
+        return [self[key] for key in self.order_keys(keys)]
+
+
+def _restore_table(name: str, rows: Dict[str, Any], columns: Tuple[str, ...]) -> CompactTable:
+    return CompactTable(name, rows, record_type(name, columns))
+
+
+def compact_tables(data: Dict[str, Any], table_names: Iterable[str] = COMPACT_TABLES) -> Dict[str, Any]:
+    """Convert the listed tables of a loaded data dict to compact storage in place"""
+    for table_name in table_names:
+        if table_name in data and not isinstance(data[table_name], CompactTable):
+            data[table_name] = CompactTable(table_name, data[table_name])
+    return data
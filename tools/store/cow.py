@@ -0,0 +1,236 @@
+import copy
+import weakref
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .ids import IdSequence
+from .loader import build_table
+from .table import IndexedTable, ViewRow
+
+
+def freeze(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Turn a loaded data dict into a read-only base shared by copy-on-write overlays"""
+    for table_name, table in list(data.items()):
+        if not isinstance(table, IndexedTable):
+            table = data[table_name] = build_table(table_name, table)
+        table.frozen = True
+    return data
+
+
+class CowTable(MutableMapping):
+    """Per-episode view of a frozen table; rows are cloned the first time they are written.
+
+    Base rows are handed out as views bound to this table, so a write through
+    a row a tool already holds lands in this episode's clone whichever other
+    overlay has been read since. The first write turns the view into the
+    clone itself, so the holder reads back what it wrote.
+    """
+
+    # Views of base rows redirect every write to writable_row()
+    frozen = True
+
+    def __init__(self, name: str, base: IndexedTable):
+        self.name = name
+        self._base = base
+        self._rows: Dict[str, Dict[str, Any]] = {}
+        self._removed: Set[str] = set()
+        self._added: Dict[str, None] = {}
+        self._ids: Optional[IdSequence] = None
+        self._views: "weakref.WeakValueDictionary[str, ViewRow]" = weakref.WeakValueDictionary()
+
+    def _in_base(self, key: Any) -> bool:
+        return key not in self._removed and dict.__contains__(self._base, key)
+
+    def writable_row(self, key: str) -> Dict[str, Any]:
+        """This episode's private copy of a row, cloned from the base on first use"""
+        row = self._rows.get(key)
+        if row is None:
+            if not self._in_base(key):
+                raise KeyError(key)
+            values = copy.deepcopy(dict(self._base[key]))
+            row = self._views.pop(key, None)
+            if row is None:
+                row = values
+            else:
+                # The view a caller holds becomes the clone, so it reads its own writes
+                dict.clear(row)
+                dict.update(row, values)
+                row._table = None
+            self._rows[key] = row
+        return row
+
+    def touched(self) -> List[str]:
+        """Keys of the rows this episode inserted, modified or deleted, in table order"""
+        return self._order(self._rows.keys() | self._removed)
+
+    # Mapping protocol
+
+    def __getitem__(self, key: str) -> Dict[str, Any]:
+        row = self._rows.get(key)
+        if row is not None:
+            return row
+        view = self._views.get(key)
+        if view is None:
+            if not self._in_base(key):
+                raise KeyError(key)
+            view = self._views[key] = ViewRow(dict.__getitem__(self._base, key), self, key)
+        return view
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._rows or self._in_base(key)
+
+    def __setitem__(self, key: str, row: Dict[str, Any]) -> None:
+        if key not in self:
+            self._added[key] = None
+            if self._ids is not None:
+                self._ids.observe(key)
+        self._views.pop(key, None)
+        self._rows[key] = row
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self:
+            raise KeyError(key)
+        self._rows.pop(key, None)
+        self._views.pop(key, None)
+        if key in self._added:
+            del self._added[key]
+        else:
+            self._removed.add(key)
+        if self._ids is not None:
+            self._ids.forget(key)
+
+    def __iter__(self) -> Iterator[str]:
+        removed = self._removed
+        for key in dict.__iter__(self._base):
+            if key not in removed:
+                yield key
+        yield from list(self._added)
+
+    def __len__(self) -> int:
+        return len(self._base) - len(self._removed) + len(self._added)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Views are rebuilt on demand; copies and pickles leave them behind
+        state = dict(self.__dict__)
+        del state["_views"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._views = weakref.WeakValueDictionary()
+
+    @property
+    def ids(self) -> IdSequence:
+        if self._ids is None:
+            if self._removed:
+                self._ids = IdSequence(self)
+            else:
+                self._ids = IdSequence([self._base.ids.peek()] + list(self._added))
+            self._ids.bind(self)
+        return self._ids
+
+    # Index protocol used by candidate_rows/value_exists: base index hits that
+    # this episode has not shadowed, plus every private row for the caller to verify
+
+    def has_index(self, column: str, casefold: bool = False) -> bool:
+        return self._base.has_index(column, casefold)
+
+    def lookup(self, column: str, value: Any, casefold: bool = False) -> Set[str]:
+        keys = self._base.lookup(column, value, casefold)
+        if not self._rows and not self._removed:
+            return keys
+        return (keys - self._removed - self._rows.keys()) | self._rows.keys()
+
+    def index_buckets(self, column: str) -> Optional[Dict[str, Set[str]]]:
+        # Buckets cover the base rows only, so callers scan once this episode has written
+        if self._rows or self._removed:
+            return None
+        return self._base.index_buckets(column)
+
+    def has_time_index(self, column: str) -> bool:
+        return self._base.has_time_index(column)
+
+    def range_lookup(self, column: str, start: Optional[str] = None, end: Optional[str] = None) -> List[str]:
+        keys = self._base.range_lookup(column, start, end)
+        if not self._rows and not self._removed:
+            return keys
+        return [key for key in keys if key not in self._removed and key not in self._rows] + list(self._rows)
+
+    def has_trigram_index(self, column: str) -> bool:
+        return self._base.has_trigram_index(column)
+
+    def substring_lookup(self, column: str, needle: str) -> Optional[Set[str]]:
+        keys = self._base.substring_lookup(column, needle)
+        if keys is None or (not self._rows and not self._removed):
+            return keys
+        return (keys - self._removed - self._rows.keys()) | self._rows.keys()
+
+    def has_text_index(self, column: str) -> bool:
+        # Term statistics cover the base rows only, so ranking falls back to a
+        # scan once this episode has written to the table
+        return not self._rows and not self._removed and self._base.has_text_index(column)
+
+    def text_search(self, column: str, query: str, limit: Optional[int] = 10) -> List[Tuple[str, float]]:
+        return self._base.text_search(column, query, limit)
+
+    def rows_for_keys(self, keys: Iterable[str]) -> List[Dict[str, Any]]:
+        return [self[key] for key in self._order(keys)]
+
+    def _order(self, keys: Iterable[str]) -> List[str]:
+        keys = set(keys)
+        base_keys = [key for key in keys if key not in self._added and dict.__contains__(self._base, key)]
+        return self._base.order_keys(base_keys) + [key for key in self._added if key in keys]
+
+
+class CowData(MutableMapping):
+    """Copy-on-write data dict over a frozen base dataset.
+
+    Reads fall through to the shared base. Writes to a base row, whether made
+    through this mapping or through a row object a tool already holds, land in
+    a private clone owned by the overlay that handed out the row.
+    """
+
+    def __init__(self, base: Dict[str, Any]):
+        self._base = freeze(base)
+        self._tables: Dict[str, Any] = {}
+        self._removed: Set[str] = set()
+
+    def __getitem__(self, table_name: str) -> Any:
+        table = self._tables.get(table_name)
+        if table is not None:
+            return table
+        if table_name in self._removed or table_name not in self._base:
+            raise KeyError(table_name)
+        table = self._tables[table_name] = CowTable(table_name, self._base[table_name])
+        return table
+
+    def __setitem__(self, table_name: str, table: Any) -> None:
+        self._removed.discard(table_name)
+        self._tables[table_name] = table
+
+    def __delitem__(self, table_name: str) -> None:
+        if table_name not in self:
+            raise KeyError(table_name)
+        self._tables.pop(table_name, None)
+        self._removed.add(table_name)
+
+    def __contains__(self, table_name: Any) -> bool:
+        return table_name in self._tables or (table_name not in self._removed and table_name in self._base)
+
+    def __iter__(self) -> Iterator[str]:
+        for table_name in self._base:
+            if table_name not in self._removed:
+                yield table_name
+        yield from (name for name in list(self._tables) if name not in self._base)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def touched_rows(self) -> Dict[str, List[str]]:
+        """Keys of the rows written in each table, in table order"""
+        touched = {}
+        for table_name, table in self._tables.items():
+            keys = table.touched() if isinstance(table, CowTable) else list(table)
+            if keys:
+                touched[table_name] = keys
+        return touched
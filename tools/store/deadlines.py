@@ -0,0 +1,200 @@
+"""SLA deadlines of open incidents, kept in a min-heap.
+
+Each incident has up to two deadlines counted from its detection timestamp
+with the targets of its SLA (resolved as in sla.py): a response deadline
+while its response clock runs, that is while its status is "open", and a
+resolution deadline until it is resolved or closed. A DeadlineScheduler follows the incidents table's change
+notifications, so an insert or a status or severity write by ReportIncident,
+UpdateIncident or any other tool reschedules just that incident: superseded
+heap entries are left in place and skipped, and the heap is rebuilt once
+they outnumber the live ones. A write to the subscription, SLA or component
+tables reschedules everything on the next read.
+
+due() walks the heap in deadline order without popping it, so listing the k
+deadlines that fall within a horizon costs O(k log k) whatever the number of
+open incidents.
+"""
+import heapq
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .sla import CLOSED_STATUSES, DEFAULT_AS_OF, RESPONSE_STATUS, SlaMap
+from .table import MISSING
+from .timeindex import to_epoch
+
+# Incident fields a deadline is computed from
+DEADLINE_FIELDS = ("status", "severity", "client_id", "component_id", "detection_timestamp")
+
+# Tables whose writes change which SLA an incident falls under
+SLA_TABLES = ("subscriptions", "service_level_agreements", "infrastructure_components")
+
+# Tables deadline_scheduler() reads from its data argument
+DEADLINE_TABLES = ("incidents",) + SLA_TABLES
+
+Entry = Tuple[int, str, str]
+
+
+def to_timestamp(epoch: int) -> str:
+    """ISO-8601 UTC timestamp of seconds since the epoch, in the data's format"""
+    return datetime.fromtimestamp(epoch, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+
+
+class DeadlineScheduler:
+    """Min-heap of (deadline, incident_id, kind) for the open incidents of a data dict"""
+
+    def __init__(self, data: Dict[str, Any]):
+        self.incidents = data.get("incidents", {})
+        self.tables = tuple(data.get(name, {}) for name in SLA_TABLES)
+        # incident_id -> {"response" / "resolution": deadline} of its live heap entries
+        self.deadlines: Dict[str, Dict[str, int]] = {}
+        self._heap: List[Entry] = []
+        self._stale = 0
+        self._rebuild()
+        self._subscribed = []
+        if hasattr(self.incidents, "subscribe") and all(hasattr(t, "subscribe") for t in self.tables):
+            self.incidents.subscribe(self._incident_changed)
+            for table in self.tables:
+                table.subscribe(self._sla_changed)
+            self._subscribed = [self.incidents, *self.tables]
+
+    @property
+    def observing(self) -> bool:
+        """Whether the scheduler follows writes, rather than being a snapshot of the tables"""
+        return bool(self._subscribed)
+
+    def close(self) -> None:
+        """Stop following the tables' writes"""
+        if self._subscribed:
+            self.incidents.unsubscribe(self._incident_changed)
+            for table in self.tables:
+                table.unsubscribe(self._sla_changed)
+            self._subscribed = []
+
+    # Scheduling
+
+    def _compute(self, row: Dict[str, Any]) -> Dict[str, int]:
+        status = row.get("status")
+        detected = to_epoch(row.get("detection_timestamp"))
+        if status in CLOSED_STATUSES or detected is None:
+            return {}
+        component_id = row.get("component_id")
+        component = self._components.get(str(component_id)) if component_id else None
+        _, sla = self._sla_map.resolve(row.get("client_id"), component.get("product_id") if component else None,
+                                       row.get("severity"))
+        if sla is None:
+            return {}
+        deadlines = {}
+        if status == RESPONSE_STATUS and sla.get("response_time_minutes") is not None:
+            deadlines["response"] = detected + int(sla["response_time_minutes"] * 60)
+        if sla.get("resolution_time_hours") is not None:
+            deadlines["resolution"] = detected + int(sla["resolution_time_hours"] * 3600)
+        return deadlines
+
+    def _rebuild(self) -> None:
+        subscriptions, slas, self._components = self.tables
+        self._sla_map = SlaMap(subscriptions, slas)
+        self.deadlines = {}
+        for key, row in self.incidents.items():
+            deadlines = self._compute(row)
+            if deadlines:
+                self.deadlines[key] = deadlines
+        self._heap = [(deadline, key, kind) for key, deadlines in self.deadlines.items()
+                      for kind, deadline in deadlines.items()]
+        heapq.heapify(self._heap)
+        self._stale = 0
+        self._outdated = False
+
+    def _schedule(self, key: str, row: Optional[Dict[str, Any]]) -> None:
+        old = self.deadlines.pop(key, {})
+        new = self._compute(row) if row is not None else {}
+        if new:
+            self.deadlines[key] = new
+        for kind, deadline in new.items():
+            if old.get(kind) != deadline:
+                heapq.heappush(self._heap, (deadline, key, kind))
+        self._stale += sum(1 for kind, deadline in old.items() if new.get(kind) != deadline)
+        if self._stale > len(self._heap) // 2 + 64:
+            self._rebuild()
+
+    def _incident_changed(self, table: Any, key: str, field: Optional[str], old: Any, new: Any) -> None:
+        if self._outdated:
+            return
+        if field is None:
+            self._schedule(key, new if new is not MISSING else None)
+        elif field in DEADLINE_FIELDS:
+            self._schedule(key, table[key])
+
+    def _sla_changed(self, table: Any, key: str, field: Optional[str], old: Any, new: Any) -> None:
+        self._outdated = True
+
+    # Reads
+
+    def _live(self, entry: Entry) -> bool:
+        deadline, key, kind = entry
+        return self.deadlines.get(key, {}).get(kind) == deadline
+
+    def _in_order(self) -> Iterator[Entry]:
+        # Best-first walk of the heap array: a node is visited only after its parent
+        if self._outdated:
+            self._rebuild()
+        heap = self._heap
+        frontier = [(heap[0], 0)] if heap else []
+        while frontier:
+            entry, i = heapq.heappop(frontier)
+            yield entry
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (heap[child], child))
+
+    def due(self, within_minutes: float, as_of: Optional[str] = None,
+            limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Deadlines falling before as_of + within_minutes, overdue ones included, earliest first"""
+        now = to_epoch(as_of or DEFAULT_AS_OF)
+        if now is None:
+            raise ValueError(f"Invalid as_of timestamp: {as_of}")
+        horizon = now + within_minutes * 60
+        results = []
+        seen = set()
+        for entry in self._in_order():
+            deadline, key, kind = entry
+            if deadline > horizon or (limit is not None and len(results) >= limit):
+                break
+            # A deadline moved away and back has two entries; both are live
+            if self._live(entry) and (key, kind) not in seen:
+                seen.add((key, kind))
+                results.append({"incident_id": key, "deadline_type": kind, "deadline": to_timestamp(deadline),
+                                "minutes_remaining": round((deadline - now) / 60, 1),
+                                "overdue": deadline < now})
+        return results
+
+    def next_deadline(self, incident_id: str) -> Optional[Tuple[str, str]]:
+        """(deadline_type, deadline) of an incident's earliest deadline; None if it has none"""
+        if self._outdated:
+            self._rebuild()
+        deadlines = self.deadlines.get(incident_id)
+        if not deadlines:
+            return None
+        kind = min(deadlines, key=deadlines.get)
+        return kind, to_timestamp(deadlines[kind])
+
+
+def deadline_scheduler(data: Dict[str, Any]) -> DeadlineScheduler:
+    """The scheduler kept on data's incidents table, built on first use.
+
+    Tables that cannot report their writes get a scheduler built for this
+    call only.
+    """
+    incidents = data.get("incidents", {})
+    tables = tuple(data.get(name, {}) for name in SLA_TABLES)
+    scheduler = getattr(incidents, "_deadlines", None)
+    if scheduler is not None and all(a is b for a, b in zip(scheduler.tables, tables)):
+        return scheduler
+    if scheduler is not None:
+        scheduler.close()
+    scheduler = DeadlineScheduler(data)
+    if scheduler.observing:
+        try:
+            incidents._deadlines = scheduler
+        except AttributeError:
+            scheduler.close()
+    return scheduler
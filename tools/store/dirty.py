@@ -0,0 +1,105 @@
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+from .loader import save_table, subscribe_tables
+from .schema import DATA_DIR
+from .table import IndexedTable
+from .wal import apply_record, read_log
+
+DELTA_FILE = "deltas.log"
+
+
+def apply_deltas(data: Dict[str, Any], path: str) -> int:
+    """Replay a sidecar delta file over data and return the number of records applied"""
+    count = 0
+    for record in read_log(path):
+        apply_record(data, record)
+        count += 1
+    return count
+
+
+class DirtyTracker:
+    """Tables and rows written since the last flush, recorded as tools mutate the store.
+
+    flush() rewrites only the dirty tables' JSON files; append_deltas() instead
+    appends the current state of each dirty row to a sidecar file, in the
+    write-ahead log record format, so the I/O follows the number of changed
+    rows. apply_deltas() replays the sidecar over the table files.
+    """
+
+    def __init__(self, data: Dict[str, Any], data_dir: str = DATA_DIR):
+        self._data = data
+        self.data_dir = data_dir
+        self._rows: Dict[str, Dict[str, None]] = {}
+        self._subscribed = subscribe_tables(data, self._changed)
+
+    def close(self) -> None:
+        for subscribed in self._subscribed:
+            subscribed.unsubscribe(self._changed)
+        self._subscribed = []
+
+    def _changed(self, table: IndexedTable, key: str, field: Optional[str], old: Any, new: Any) -> None:
+        rows = self._rows.get(table.name)
+        if rows is None:
+            rows = self._rows[table.name] = {}
+        rows[key] = None
+
+    def dirty_tables(self) -> List[str]:
+        return list(self._rows)
+
+    def dirty_rows(self, table_name: str) -> List[str]:
+        return list(self._rows.get(table_name, ()))
+
+    def clear(self) -> None:
+        self._rows = {}
+
+    def flush(self, delta_path: Optional[str] = None) -> List[str]:
+        """Rewrite the JSON files of the dirty tables only and return their names.
+
+        Tables with records in the sidecar delta file are rewritten too, and
+        the file is then cut down to the records of tables this data dict does
+        not hold, so a later apply_deltas() cannot replay them over the newer
+        table files.
+        """
+        delta_path = delta_path or os.path.join(self.data_dir, DELTA_FILE)
+        table_names = self.dirty_tables()
+        kept = []
+        for record in read_log(delta_path):
+            if record["table"] not in self._data:
+                kept.append(json.dumps(record, default=str) + "\n")
+            elif record["table"] not in table_names:
+                table_names.append(record["table"])
+        for table_name in table_names:
+            save_table(table_name, self._data[table_name], self.data_dir)
+        if os.path.exists(delta_path):
+            # Only once every table the records cover is on disk
+            tmp_path = f"{delta_path}.tmp"
+            with open(tmp_path, "w") as f:
+                f.write("".join(kept))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, delta_path)
+        self.clear()
+        return table_names
+
+    def append_deltas(self, path: Optional[str] = None) -> int:
+        """Append one put/del record per dirty row to a sidecar file and return the count"""
+        path = path or os.path.join(self.data_dir, DELTA_FILE)
+        lines = []
+        for table_name, keys in self._rows.items():
+            table = self._data[table_name]
+            for key in keys:
+                row = table.get(key)
+                if row is None:
+                    record = {"op": "del", "table": table_name, "key": key}
+                else:
+                    record = {"op": "put", "table": table_name, "key": key, "row": row}
+                lines.append(json.dumps(record, default=str) + "\n")
+        if lines:
+            with open(path, "a") as f:
+                f.write("".join(lines))
+                f.flush()
+                os.fsync(f.fileno())
+        self.clear()
+        return len(lines)
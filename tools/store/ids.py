@@ -0,0 +1,106 @@
+import threading
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+
+def _int_key(key: Any) -> Optional[int]:
+    try:
+        return int(key)
+    except (TypeError, ValueError):
+        return None
+
+
+class IdSequence:
+    """Per-table primary key sequence yielding max(int(key)) + 1 without scanning the keys.
+
+    The sequence is seeded once from the loaded keys and follows every insert and
+    delete made through the owning table. An id is allocated by the insert that
+    uses it: next() only reports the id the next insert should take, so a tool
+    that fails after asking for one leaves the sequence where it was. Inside a
+    Transaction, next() also reserves the id it returns until the transaction
+    ends, so steps that ask for several ids before inserting get distinct ones.
+    """
+
+    def __init__(self, keys: Iterable[Any] = ()):
+        self._lock = threading.Lock()
+        self._keys = None
+        self._max = 0
+        self._reserved = 0
+        self._stale = False
+        self._reservations = 0
+        # Whether every key observed was an integer above all the keys before it
+        self.ascending = True
+        for key in keys:
+            self.observe(key)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Copies and pickles get a lock of their own
+        state = dict(self.__dict__)
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def bind(self, keys: Iterable[Any]) -> None:
+        """Key collection to rescan if the current maximum is ever deleted"""
+        self._keys = keys
+
+    def observe(self, key: Any) -> None:
+        value = _int_key(key)
+        if value is None or value <= self._max:
+            self.ascending = False
+        else:
+            self._max = value
+
+    def forget(self, key: Any) -> None:
+        if _int_key(key) == self._max:
+            self._stale = True
+
+    def begin_reservations(self) -> None:
+        """Make next() reserve the ids it returns, until the matching end_reservations()"""
+        with self._lock:
+            self._reservations += 1
+
+    def end_reservations(self) -> None:
+        """Release the reservations of ids that were never inserted"""
+        with self._lock:
+            self._reservations -= 1
+            if not self._reservations:
+                self._reserved = 0
+
+    def state(self) -> Tuple[int, int, bool]:
+        return self._max, self._reserved, self._stale
+
+    def restore(self, state: Tuple[int, int, bool]) -> None:
+        """Return to a state captured with state(), e.g. when inserts are rolled back"""
+        with self._lock:
+            self._max, self._reserved, self._stale = state
+
+    def peek(self) -> int:
+        """Highest id observed or reserved so far"""
+        return max(self._max, self._reserved)
+
+    def next(self) -> str:
+        """Id the next insert should take: max(int(key)) + 1, past any reservations"""
+        with self._lock:
+            if self._stale:
+                # The highest id was removed: fall back to the keys still present,
+                # so an id freed by a rollback is handed out again as it was before
+                self._max = max((v for v in map(_int_key, self._keys or ()) if v is not None), default=0)
+                self._reserved = 0
+                self._stale = False
+            value = max(self._max, self._reserved) + 1
+            if self._reservations:
+                self._reserved = value
+            return str(value)
+
+
+def next_id(table: Dict[str, Any]) -> str:
+    """Next primary key for a table, O(1) for indexed tables; the id is taken when a row is inserted under it"""
+    sequence = getattr(table, "ids", None)
+    if sequence is not None:
+        return sequence.next()
+    if not table:
+        return "1"
+    return str(max(int(k) for k in table.keys()) + 1)
@@ -0,0 +1,47 @@
+import sys
+from typing import Any, Dict, List
+
+from .schema import enum_columns, foreign_key_columns, primary_key
+
+
+def interned_columns(table_name: str) -> List[str]:
+    """Repetitive string columns of a table: primary key, foreign keys and enums"""
+    columns = [primary_key(table_name)]
+    for column in foreign_key_columns(table_name) + enum_columns(table_name):
+        if column not in columns:
+            columns.append(column)
+    return columns
+
+
+def intern_rows(table_name: str, rows: Dict[str, Dict[str, Any]]) -> int:
+    """Replace repeated id and enum strings in rows with one shared object each.
+
+    The columns from interned_columns() go through sys.intern, so a value like
+    client_id "3" is a single object across every table; this is dictionary
+    encoding with the object pointer as the code. Rows are updated in place
+    without change notifications, since no value changes. Returns an estimate
+    of the bytes freed: the size of every duplicate string dropped.
+    """
+    columns = interned_columns(table_name)
+    saved = 0
+    for row in dict.values(rows):
+        for column in columns:
+            value = dict.get(row, column)
+            if type(value) is not str:
+                continue
+            canonical = sys.intern(value)
+            if canonical is not value:
+                dict.__setitem__(row, column, canonical)
+                saved += sys.getsizeof(value)
+    return saved
+
+
+def intern_keys(rows: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of a freshly decoded table with interned row keys, shared with the id columns"""
+    return {sys.intern(key) if type(key) is str else key: row for key, row in rows.items()}
+
+
+def intern_data(data: Dict[str, Dict[str, Dict[str, Any]]]) -> Dict[str, int]:
+    """Intern every dict-backed table of a loaded data dict; bytes freed per table"""
+    return {table_name: intern_rows(table_name, table)
+            for table_name, table in data.items() if isinstance(table, dict)}
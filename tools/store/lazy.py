@@ -0,0 +1,212 @@
+import ast
+import os
+import threading
+from collections.abc import MutableMapping
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from .deadlines import DEADLINE_TABLES
+from .loader import load_table
+from .schema import DATA_DIR
+from .sla import SLA_COMPLIANCE_TABLES
+
+TOOLS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GET_SET_APIS_PATH = os.path.join(TOOLS_DIR, "get_set_APIs.yaml")
+
+
+class ToolReads(NamedTuple):
+    """Tables a tool module reads, as far as its source names them"""
+    tables: FrozenSet[str]
+    # Whether it reads a table named by one of its arguments; such tables load on first access
+    dynamic: bool
+    # Source of the reads of data whose table could not be named
+    unresolved: Tuple[str, ...]
+
+
+# Store helpers that read tables from the data dict passed to them
+DATA_HELPERS: Dict[str, Tuple[str, ...]] = {
+    "deadline_scheduler": DEADLINE_TABLES,
+    "sla_compliance": SLA_COMPLIANCE_TABLES,
+}
+
+
+def _is_data(node: ast.AST) -> bool:
+    return isinstance(node, ast.Name) and node.id == "data"
+
+
+@lru_cache(maxsize=None)
+def tool_reads(path: str) -> ToolReads:
+    """Tables a tool module reads: data.get("...") and data["..."], the tables its
+    cached_read() declares, those of the store helpers and sibling tools it
+    hands data to. Reads by a table name only known at run time are covered
+    by a cached_read() declaration and otherwise reported as unresolved."""
+    with open(path) as f:
+        tree = ast.parse(f.read(), path)
+    siblings = {alias.asname or alias.name: os.path.join(os.path.dirname(path), f"{node.module}.py")
+                for node in ast.walk(tree) if isinstance(node, ast.ImportFrom) and node.level == 1
+                for alias in node.names}
+    tables: Set[str] = set()
+    declared = dynamic = False
+    reads: List[str] = []
+    calls: List[str] = []
+    for node in ast.walk(tree):
+        target = None
+        if (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+                and node.func.attr == "get" and node.args and _is_data(node.func.value)):
+            target = node.args[0]
+        elif isinstance(node, ast.Subscript) and _is_data(node.value):
+            target = node.slice
+        elif isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == "cached_read":
+            declared = True
+            tables |= {arg.value for arg in node.args if isinstance(arg, ast.Constant)}
+            dynamic = dynamic or any(keyword.arg == "table_arguments" for keyword in node.keywords)
+            continue
+        elif isinstance(node, ast.Call) and any(_is_data(arg) for arg in node.args):
+            func = node.func
+            if isinstance(func, ast.Name) and func.id in DATA_HELPERS:
+                tables |= set(DATA_HELPERS[func.id])
+            elif (isinstance(func, ast.Attribute) and func.attr == "invoke" and isinstance(func.value, ast.Name)
+                    and func.value.id in siblings):
+                sibling = tool_reads(siblings[func.value.id])
+                tables |= sibling.tables
+                dynamic = dynamic or sibling.dynamic
+                calls.extend(sibling.unresolved)
+            else:
+                calls.append(ast.unparse(node))
+            continue
+        else:
+            continue
+        if isinstance(target, ast.Constant) and isinstance(target.value, str):
+            tables.add(target.value)
+        else:
+            reads.append(ast.unparse(node))
+    unresolved = tuple(calls) if declared else tuple(reads + calls)
+    return ToolReads(frozenset(tables), dynamic, unresolved)
+
+
+def tool_paths(tools_dir: str = TOOLS_DIR) -> Dict[str, List[str]]:
+    """Source paths of each interface's tools listed in get_set_APIs.yaml"""
+    import yaml
+    with open(os.path.join(tools_dir, "get_set_APIs.yaml")) as f:
+        apis = yaml.safe_load(f)
+    return {interface: [os.path.join(tools_dir, interface, f"{tool_name}.py")
+                        for tool_name in groups.get("set", []) + groups.get("get", [])]
+            for interface, groups in apis.items()}
+
+
+@lru_cache(maxsize=None)
+def interface_tables(tools_dir: str = TOOLS_DIR) -> Dict[str, List[str]]:
+    """Tables each interface's tools read, from get_set_APIs.yaml and the tool sources.
+
+    Tables a tool takes by name from its arguments (aggregate_records) are
+    not listed; LazyData loads them on first access.
+    """
+    requirements = {}
+    for interface, paths in tool_paths(tools_dir).items():
+        tables: Set[str] = set()
+        for path in paths:
+            if os.path.exists(path):
+                tables |= tool_reads(path).tables
+        requirements[interface] = sorted(tables)
+    return requirements
+
+
+class LazyData(MutableMapping):
+    """data dict whose tables are read from data_dir/<table>.json on first access.
+
+    Unknown tables behave as missing keys, so data.get("name", {}) keeps
+    returning the default exactly as with a fully loaded dict.
+    """
+
+    def __init__(self, data_dir: str = DATA_DIR,
+                 loader: Callable[[str, str], Any] = load_table,
+                 table_names: Optional[Iterable[str]] = None):
+        self._data_dir = data_dir
+        self._loader = loader
+        if table_names is None:
+            table_names = [f[:-len(".json")] for f in sorted(os.listdir(data_dir)) if f.endswith(".json")]
+        self._available: Dict[str, None] = dict.fromkeys(table_names)
+        self._tables: Dict[str, Any] = {}
+        self._locks = {name: threading.Lock() for name in self._available}
+        self._observers: List[Callable] = []
+
+    def _load(self, table_name: str) -> Any:
+        with self._locks[table_name]:
+            if table_name not in self._tables:
+                table = self._loader(table_name, self._data_dir)
+                for observer in self._observers:
+                    table.subscribe(observer)
+                self._tables[table_name] = table
+        return self._tables[table_name]
+
+    def __getitem__(self, table_name: str) -> Any:
+        table = self._tables.get(table_name)
+        if table is not None:
+            return table
+        if table_name not in self._available:
+            raise KeyError(table_name)
+        return self._load(table_name)
+
+    def __setitem__(self, table_name: str, table: Any) -> None:
+        for observer in self._observers:
+            table.subscribe(observer)
+        self._tables[table_name] = table
+
+    def __delitem__(self, table_name: str) -> None:
+        if table_name not in self:
+            raise KeyError(table_name)
+        self._tables.pop(table_name, None)
+        self._available.pop(table_name, None)
+
+    def __contains__(self, table_name: Any) -> bool:
+        return table_name in self._tables or table_name in self._available
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._available
+        yield from (name for name in list(self._tables) if name not in self._available)
+
+    def __len__(self) -> int:
+        return len(self._available) + sum(1 for name in self._tables if name not in self._available)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Copies and pickles take the loaded tables but not the locks or observers
+        state = dict(self.__dict__)
+        del state["_locks"]
+        state["_observers"] = []
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._locks = {name: threading.Lock() for name in self._available}
+
+    def loaded(self) -> List[str]:
+        """Names of the tables read so far"""
+        return list(self._tables)
+
+    def subscribe(self, observer: Callable) -> None:
+        """Observe writes to every table, including those not loaded yet"""
+        self._observers.append(observer)
+        for table in self._tables.values():
+            table.subscribe(observer)
+
+    def unsubscribe(self, observer: Callable) -> None:
+        self._observers.remove(observer)
+        for table in self._tables.values():
+            table.unsubscribe(observer)
+
+    def prefetch(self, table_names: Iterable[str], max_workers: int = 8) -> None:
+        """Load several tables concurrently ahead of their first access"""
+        pending = [name for name in table_names if name in self._available and name not in self._tables]
+        if not pending:
+            return
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(pending))) as pool:
+            list(pool.map(self._load, pending))
+
+
+def load_interface_data(interface: str, data_dir: str = DATA_DIR, prefetch: bool = True) -> LazyData:
+    """Lazy data dict for one interface, with the tables its tools use prefetched"""
+    data = LazyData(data_dir)
+    if prefetch:
+        data.prefetch(interface_tables().get(interface, []))
+    return data
@@ -0,0 +1,76 @@
+import json
+import os
+from typing import Any, Callable, Dict, List, Optional
+
+from .interning import intern_keys, intern_rows
+from .schema import (DATA_DIR, casefold_columns, indexed_columns, primary_key, text_columns, time_columns,
+                     trigram_columns, unique_columns)
+from .table import IndexedTable
+
+
+def build_table(table_name: str, rows: Optional[Dict[str, Any]] = None) -> IndexedTable:
+    """Wrap a plain {id: row} dict in an IndexedTable using the schema's index columns"""
+    return IndexedTable(table_name, rows, primary_key(table_name), indexed_columns(table_name),
+                        unique_columns(table_name), casefold_columns(table_name), time_columns(table_name),
+                        text_columns(table_name), trigram_columns(table_name))
+
+
+def index_tables(data: Dict[str, Dict[str, Any]]) -> Dict[str, IndexedTable]:
+    """Convert an already loaded data dict into indexed tables"""
+    return {table_name: build_table(table_name, rows) for table_name, rows in data.items()}
+
+
+def load_table(table_name: str, data_dir: str = DATA_DIR) -> IndexedTable:
+    """Load data/<table_name>.json into an IndexedTable, with id and enum strings interned"""
+    with open(os.path.join(data_dir, f"{table_name}.json")) as f:
+        rows = intern_keys(json.load(f))
+    intern_rows(table_name, rows)
+    return build_table(table_name, rows)
+
+
+def load_data(data_dir: str = DATA_DIR) -> Dict[str, IndexedTable]:
+    """Load every table under data_dir into indexed tables"""
+    data = {}
+    for file_name in sorted(os.listdir(data_dir)):
+        if file_name.endswith(".json"):
+            table_name = file_name[:-len(".json")]
+            data[table_name] = load_table(table_name, data_dir)
+    return data
+
+
+def write_json_atomic(path: str, value: Any, indent: Optional[int] = None) -> None:
+    """Write value as JSON to path through a temporary file, so readers never see a partial file"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(value, f, indent=indent)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def save_table(table_name: str, rows: Dict[str, Any], data_dir: str = DATA_DIR) -> None:
+    """Write one table back to data_dir/<table_name>.json in the seed file format"""
+    if not isinstance(rows, dict):
+        rows = dict(rows.items())
+    write_json_atomic(os.path.join(data_dir, f"{table_name}.json"), rows, indent=2)
+
+
+def subscribe_tables(data: Dict[str, Any], observer: Callable) -> List[Any]:
+    """Attach a change observer to every table of data and return what to unsubscribe from.
+
+    A data dict that accepts observers itself, like LazyData, is subscribed
+    whole; plain dict tables are converted to indexed tables in place, and
+    other tables must support subscribe() themselves.
+    """
+    if hasattr(data, "subscribe"):
+        data.subscribe(observer)
+        return [data]
+    subscribed = []
+    for table_name, table in list(data.items()):
+        if not hasattr(table, "subscribe"):
+            if type(table) is not dict:
+                raise TypeError(f"table {table_name} of type {type(table).__name__} cannot be observed")
+            table = data[table_name] = build_table(table_name, table)
+        table.subscribe(observer)
+        subscribed.append(table)
+    return subscribed
@@ -0,0 +1,195 @@
+import hashlib
+import json
+from typing import Any, Dict, List, Mapping, Optional, Set
+
+# Hash tree shape: LEVELS levels of 16-way fan-out below the root, so rows land in
+# one of 16 ** LEVELS leaf buckets chosen by a digest of their key. The shape
+# depends only on the keys, which lets two trees be compared node by node.
+LEVELS = 4
+FANOUT_BITS = 4
+MODULUS = 1 << 128
+
+
+def _digest(*parts: str) -> int:
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        h.update(part.encode())
+        h.update(b"\0")
+    return int.from_bytes(h.digest(), "big")
+
+
+def row_hash(key: str, row: Mapping[str, Any]) -> int:
+    """Hash of one row, covering its key and every field value"""
+    return _digest(str(key), json.dumps(row, sort_keys=True, default=str))
+
+
+def _bucket(key: str) -> int:
+    return _digest(str(key)) >> (128 - LEVELS * FANOUT_BITS)
+
+
+def _changed_fields(old: Optional[Mapping[str, Any]], new: Optional[Mapping[str, Any]]) -> List[str]:
+    old, new = old or {}, new or {}
+    return sorted(field for field in old.keys() | new.keys()
+                  if field not in old or field not in new or old[field] != new[field])
+
+
+class TableHash:
+    """Hash tree over one table's rows, kept current as the table is written.
+
+    Each node holds the sum, modulo 2**128, of the row hashes beneath it, so a
+    changed row updates one node per level. Changes reported by an
+    IndexedTable are applied lazily the next time the tree is read; other
+    mappings are hashed once as a fixed expected state.
+    """
+
+    def __init__(self, table: Mapping[str, Any], name: Optional[str] = None):
+        self.name = name if name is not None else getattr(table, "name", None)
+        self._table = table
+        self._rows: Dict[str, int] = {}
+        self._leaves: Dict[int, Set[str]] = {}
+        self._levels: List[Dict[int, int]] = [{} for _ in range(LEVELS)]
+        self._root = 0
+        self._dirty: Dict[str, None] = {}
+        for key, row in table.items():
+            self._set(key, row_hash(key, row))
+        if hasattr(table, "subscribe"):
+            table.subscribe(self._changed)
+
+    def close(self) -> None:
+        """Stop following the table's writes"""
+        if hasattr(self._table, "unsubscribe"):
+            self._table.unsubscribe(self._changed)
+
+    def _changed(self, table: Any, key: str, field: Optional[str], old: Any, new: Any) -> None:
+        self._dirty[key] = None
+
+    def _flush(self) -> None:
+        if not self._dirty:
+            return
+        dirty, self._dirty = self._dirty, {}
+        for key in dirty:
+            row = self._table.get(key)
+            if row is None:
+                self._remove(key)
+            else:
+                self._set(key, row_hash(key, row))
+
+    def _adjust(self, key: str, delta: int) -> None:
+        bucket = _bucket(key)
+        for level, nodes in enumerate(self._levels):
+            prefix = bucket >> ((LEVELS - 1 - level) * FANOUT_BITS)
+            value = (nodes.get(prefix, 0) + delta) % MODULUS
+            if value:
+                nodes[prefix] = value
+            else:
+                nodes.pop(prefix, None)
+        self._root = (self._root + delta) % MODULUS
+
+    def _set(self, key: str, value: int) -> None:
+        old = self._rows.get(key)
+        if old == value:
+            return
+        if old is None:
+            self._leaves.setdefault(_bucket(key), set()).add(key)
+            old = 0
+        self._rows[key] = value
+        self._adjust(key, value - old)
+
+    def _remove(self, key: str) -> None:
+        old = self._rows.pop(key, None)
+        if old is None:
+            return
+        bucket = _bucket(key)
+        self._leaves[bucket].discard(key)
+        if not self._leaves[bucket]:
+            del self._leaves[bucket]
+        self._adjust(key, -old)
+
+    # Reads
+
+    def root(self) -> int:
+        self._flush()
+        return self._root
+
+    def hexdigest(self) -> str:
+        return f"{self.root():032x}"
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, TableHash):
+            return NotImplemented
+        return self.root() == other.root()
+
+    __hash__ = None
+
+    def _node(self, level: int, prefix: int) -> int:
+        return self._levels[level].get(prefix, 0)
+
+    def diff(self, other: "TableHash") -> List[Dict[str, Any]]:
+        """Rows that differ from other, descending only into subtrees whose hashes differ.
+
+        Each entry names the row_id, whether the row was "added", "removed" or
+        "modified" going from self to other, and the fields that differ.
+        """
+        self._flush()
+        other._flush()
+        if self._root == other._root:
+            return []
+        frontier = [0]
+        for level in range(LEVELS):
+            children = []
+            for prefix in frontier:
+                for child in range(prefix << FANOUT_BITS, (prefix + 1) << FANOUT_BITS):
+                    if self._node(level, child) != other._node(level, child):
+                        children.append(child)
+            frontier = children
+
+        changes = []
+        for bucket in frontier:
+            keys = self._leaves.get(bucket, set()) | other._leaves.get(bucket, set())
+            for key in sorted(keys):
+                mine, theirs = self._rows.get(key), other._rows.get(key)
+                if mine == theirs:
+                    continue
+                old = self._table.get(key) if mine is not None else None
+                new = other._table.get(key) if theirs is not None else None
+                change = "added" if old is None else "removed" if new is None else "modified"
+                changes.append({"row_id": key, "change": change, "fields": _changed_fields(old, new)})
+        return changes
+
+
+class DatabaseHash:
+    """Hash trees for every table of a data dict, combined into one database root"""
+
+    def __init__(self, data: Mapping[str, Mapping[str, Any]]):
+        self.tables: Dict[str, TableHash] = {
+            table_name: TableHash(table, table_name) for table_name, table in data.items()
+        }
+
+    def close(self) -> None:
+        for table_hash in self.tables.values():
+            table_hash.close()
+
+    def root(self) -> int:
+        return sum(_digest(table_name, str(table_hash.root()))
+                   for table_name, table_hash in self.tables.items()) % MODULUS
+
+    def hexdigest(self) -> str:
+        return f"{self.root():032x}"
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, DatabaseHash):
+            return NotImplemented
+        return self.root() == other.root()
+
+    __hash__ = None
+
+    def diff(self, other: "DatabaseHash") -> Dict[str, List[Dict[str, Any]]]:
+        """Per-table row differences from self to other; tables that match are omitted"""
+        changes = {}
+        for table_name in sorted(self.tables.keys() | other.tables.keys()):
+            mine = self.tables.get(table_name) or TableHash({}, table_name)
+            theirs = other.tables.get(table_name) or TableHash({}, table_name)
+            table_changes = mine.diff(theirs)
+            if table_changes:
+                changes[table_name] = table_changes
+        return changes
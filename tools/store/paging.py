@@ -0,0 +1,97 @@
+"""Keyset pagination for the get tools.
+
+Rows are ordered by (order_by value, primary key), and a cursor carries the
+sort key of the last row of its page, so the next page starts strictly after
+it. Rows inserted or deleted between calls never shift or repeat the rows of
+later pages, unlike an offset.
+"""
+import base64
+import heapq
+import json
+from itertools import islice
+from operator import itemgetter
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from .schema import primary_key
+
+
+def sort_value(value: Any) -> Tuple[int, Any]:
+    """Comparable form of a column value: numbers and numeric strings by value, then text, then the rest"""
+    if value is None:
+        return (3, "")
+    if isinstance(value, (bool, int, float)):
+        return (0, value)
+    if isinstance(value, str):
+        return (0, int(value)) if value.isdecimal() else (1, value)
+    return (2, json.dumps(value, sort_keys=True))
+
+
+def _tuples(value: Any) -> Any:
+    return tuple(_tuples(v) for v in value) if isinstance(value, list) else value
+
+
+def encode_cursor(order_by: Optional[str], key: Tuple) -> str:
+    text = json.dumps([order_by, key], separators=(",", ":"))
+    return base64.urlsafe_b64encode(text.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, order_by: Optional[str]) -> Tuple:
+    """Sort key a cursor resumes after; ValueError if it is malformed or for another order"""
+    try:
+        text = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        cursor_order, key = json.loads(text)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    if cursor_order != order_by:
+        raise ValueError("Cursor was issued for a different order_by")
+    return _tuples(key)
+
+
+def _key_column(table: Any) -> Optional[str]:
+    column = getattr(table, "primary_key", None)
+    if column is None and getattr(table, "name", None):
+        column = primary_key(table.name)
+    return column
+
+
+def paginate(table: Any, rows: Iterable[Dict[str, Any]], limit: Optional[int] = None,
+             cursor: Optional[str] = None, order_by: Optional[str] = None) -> Dict[str, Any]:
+    """One page of rows: {"results": [...], "next_cursor": str or None}.
+
+    order_by names a column, prefixed with "-" for descending; the default is
+    the primary key. Without limit the page holds every remaining row. Pages
+    are picked with a bounded heap, so only limit + 1 rows are held at once;
+    tables whose keys were inserted in ascending order are read in key order
+    already, and there the scan stops as soon as the page is full.
+    """
+    if limit is not None and (not isinstance(limit, int) or isinstance(limit, bool) or limit < 1):
+        raise ValueError("limit must be a positive integer")
+    descending = bool(order_by) and order_by.startswith("-")
+    column = order_by[1:] if descending else order_by
+    key_column = _key_column(table)
+
+    def sort_key(row: Dict[str, Any]) -> Tuple:
+        key = row.get(key_column) if key_column else next(iter(row.values()), None)
+        if not column or column == key_column:
+            return (sort_value(key),)
+        return (sort_value(row.get(column)), sort_value(key))
+
+    keyed = ((sort_key(row), row) for row in rows)
+    if cursor:
+        after = decode_cursor(cursor, order_by)
+        keyed = ((key, row) for key, row in keyed if (key < after if descending else key > after))
+
+    first = itemgetter(0)
+    if limit is None:
+        page = sorted(keyed, key=first, reverse=descending)
+    elif not descending and column in (None, "", key_column) and getattr(table, "keys_ascending", False):
+        # Rows arrive in table order, which is key order here
+        page = list(islice(keyed, limit + 1))
+    else:
+        page = (heapq.nlargest if descending else heapq.nsmallest)(limit + 1, keyed, key=first)
+
+    next_cursor = None
+    if limit is not None and len(page) > limit:
+        page = page[:limit]
+        next_cursor = encode_cursor(order_by, page[-1][0])
+    return {"results": [row for _, row in page], "next_cursor": next_cursor}
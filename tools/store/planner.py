@@ -0,0 +1,190 @@
+"""Cost-based planning for the filtered reads of the get tools.
+
+A read is a conjunction of predicates over one table. Each predicate an
+index can serve becomes an access path whose size is read off the index
+itself: the bucket of a hash index, the slice of a time index, or the
+smallest trigram posting set. Paths are taken smallest first and their key
+sets intersected while that stays cheaper than checking rows one by one;
+the rows left are then checked against every predicate, cheapest kind first.
+"""
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from .paging import paginate
+from .timeindex import in_time_range
+
+# Relative cost of checking one row against a predicate of each kind
+PREDICATE_COST = {"eq": 1, "id": 2, "casefold": 3, "contains": 4, "range": 10}
+
+# A key list is intersected with the current candidates only while it is at
+# most this many times longer; past that, checking the candidates is cheaper
+INTERSECT_RATIO = 32
+
+
+class Predicate(NamedTuple):
+    """One filter of a read, applied only when value is set.
+
+    kind is "eq" (row value == value), "id" (compared as strings),
+    "casefold" (lowercased equality), "contains" (lowercased substring of
+    the row value) or "range" (value is an inclusive (from, to) pair of
+    ISO-8601 bounds).
+    """
+    kind: str
+    column: str
+    value: Any
+
+    @property
+    def active(self) -> bool:
+        if self.kind == "range":
+            return bool(self.value[0] or self.value[1])
+        return bool(self.value)
+
+    def matcher(self) -> Callable[[Dict[str, Any]], bool]:
+        column, value = self.column, self.value
+        if self.kind == "eq":
+            return lambda row: row.get(column) == value
+        if self.kind == "id":
+            value = str(value)
+            return lambda row: str(row.get(column)) == value
+        if self.kind == "casefold":
+            value = value.lower()
+            return lambda row: row.get(column, "").lower() == value
+        if self.kind == "contains":
+            value = value.lower()
+            return lambda row: value in row.get(column, "").lower()
+        if self.kind == "range":
+            start, end = value
+            return lambda row: in_time_range(row.get(column), start, end)
+        raise ValueError(f"Unknown predicate kind: {self.kind}")
+
+
+def predicates(ids: Optional[Dict[str, Any]] = None, casefold: Optional[Dict[str, Any]] = None,
+               contains: Optional[Dict[str, Any]] = None,
+               ranges: Optional[Dict[str, Tuple[Optional[str], Optional[str]]]] = None,
+               **criteria: Any) -> List[Predicate]:
+    """Predicates for filter mappings in the keyword form the get tools use"""
+    result = [Predicate("id", column, value) for column, value in (ids or {}).items()]
+    result += [Predicate("eq", column, value) for column, value in criteria.items()]
+    result += [Predicate("casefold", column, value) for column, value in (casefold or {}).items()]
+    result += [Predicate("contains", column, value) for column, value in (contains or {}).items()]
+    result += [Predicate("range", column, value) for column, value in (ranges or {}).items()]
+    return result
+
+
+def _access_keys(table: Any, predicate: Predicate) -> Optional[Iterable[str]]:
+    """Keys of a superset of the rows matching predicate, from an index; None if no index serves it"""
+    kind, column, value = predicate
+    if kind in ("eq", "id", "casefold"):
+        folded = kind == "casefold"
+        if table.has_index(column, folded):
+            return table.lookup(column, value, folded)
+    elif kind == "contains":
+        if hasattr(table, "has_trigram_index") and table.has_trigram_index(column):
+            return table.substring_lookup(column, value)
+    elif kind == "range":
+        if hasattr(table, "has_time_index") and table.has_time_index(column):
+            return table.range_lookup(column, *value)
+    return None
+
+
+def _as_set(keys: Iterable[str]) -> Any:
+    return keys if isinstance(keys, (set, frozenset)) else set(keys)
+
+
+class QueryPlan:
+    """How a read runs: index paths to intersect, then predicates to check per row"""
+
+    def __init__(self, table: Any, filters: Sequence[Predicate]):
+        self.table = table
+        self.filters = [p for p in filters if p.active]
+        self.access: List[Tuple[Predicate, int]] = []
+        self.keys: Optional[Iterable[str]] = None
+        self.pushed: List[Tuple[str, Any, bool]] = []
+        if not hasattr(table, "has_index"):
+            return
+        if hasattr(table, "select"):
+            # Tables backed by a query engine take every indexed equality at once
+            self.pushed = [(p.column, p.value, p.kind == "casefold") for p in self.filters
+                           if p.kind in ("eq", "id", "casefold") and table.has_index(p.column, p.kind == "casefold")]
+            return
+
+        paths = []
+        for predicate in self.filters:
+            keys = _access_keys(table, predicate)
+            if keys is not None:
+                paths.append((len(keys), predicate, keys))
+        paths.sort(key=lambda path: path[0])
+        for size, predicate, keys in paths:
+            if self.keys is None:
+                self.keys = keys
+            elif isinstance(keys, (set, frozenset)):
+                # Set intersection walks the smaller side, so it never costs more than checking
+                self.keys = keys & _as_set(self.keys)
+            elif size <= INTERSECT_RATIO * len(self.keys):
+                self.keys = _as_set(self.keys).intersection(keys)
+            else:
+                continue
+            self.access.append((predicate, size))
+            if not self.keys:
+                break
+
+    def candidates(self) -> Iterable[Dict[str, Any]]:
+        """Rows the access paths leave, in table order; every row when no index applies"""
+        if self.pushed:
+            return self.table.select(self.pushed)
+        if self.keys is None:
+            return self.table.values()
+        return self.table.rows_for_keys(self.keys)
+
+    def _ordered(self) -> List[Predicate]:
+        served = {id(predicate) for predicate, _ in self.access}
+        return sorted(self.filters, key=lambda p: (id(p) in served, PREDICATE_COST[p.kind]))
+
+    def checks(self) -> List[Callable[[Dict[str, Any]], bool]]:
+        """Row predicates, cheapest first; those an index served go last since they rarely reject"""
+        return [predicate.matcher() for predicate in self._ordered()]
+
+    def rows(self) -> Iterable[Dict[str, Any]]:
+        """Matching rows in table order, produced lazily"""
+        checks = self.checks()
+        for row in self.candidates():
+            if all(check(row) for check in checks):
+                yield row
+
+    def explain(self) -> Dict[str, Any]:
+        return {
+            "table": getattr(self.table, "name", None),
+            "access": [{"kind": p.kind, "column": p.column, "rows": size} for p, size in self.access],
+            "pushed": [column for column, _, _ in self.pushed],
+            "candidates": None if self.keys is None else len(self.keys),
+            "checks": [p.column for p in self._ordered()],
+        }
+
+
+def find_rows(table: Dict[str, Any], ids: Optional[Dict[str, Any]] = None,
+              casefold: Optional[Dict[str, Any]] = None, contains: Optional[Dict[str, Any]] = None,
+              ranges: Optional[Dict[str, Tuple[Optional[str], Optional[str]]]] = None,
+              **criteria: Any) -> List[Dict[str, Any]]:
+    """Rows of table matching every set filter, in table order.
+
+    ids are compared as strings, criteria for plain equality, casefold
+    lowercased, contains as lowercased substrings and ranges as inclusive
+    ISO-8601 bounds; filters with a falsy value are skipped.
+    """
+    return list(QueryPlan(table, predicates(ids, casefold, contains, ranges, **criteria)).rows())
+
+
+def find_page(table: Dict[str, Any], limit: Optional[int] = None, cursor: Optional[str] = None,
+              order_by: Optional[str] = None, ids: Optional[Dict[str, Any]] = None,
+              casefold: Optional[Dict[str, Any]] = None, contains: Optional[Dict[str, Any]] = None,
+              ranges: Optional[Dict[str, Tuple[Optional[str], Optional[str]]]] = None,
+              **criteria: Any) -> Any:
+    """find_rows() with paging: one {"results", "next_cursor"} page when limit or cursor is set.
+
+    Without either, every matching row is returned as a list as before,
+    sorted when order_by is given. See paginate() for the ordering; raises
+    ValueError for a bad limit or cursor.
+    """
+    rows = QueryPlan(table, predicates(ids, casefold, contains, ranges, **criteria)).rows()
+    if limit is None and not cursor:
+        return paginate(table, rows, order_by=order_by)["results"] if order_by else list(rows)
+    return paginate(table, rows, limit, cursor, order_by)
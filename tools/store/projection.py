@@ -0,0 +1,167 @@
+"""Field projection for the get tools' output.
+
+A read with fields set serializes only those fields of each row. Tables
+that publish change notifications also get a ProjectionCache: once a field
+subset has been requested HOT_AFTER times, the JSON text of each projected
+row is kept, and a write to a row drops that row's text from every cached
+subset that includes the written field. Fields that no row of the table
+holds are rejected rather than silently left out of every row.
+"""
+import json
+from collections import Counter, OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional, Sequence, Set, Tuple
+
+# Uses of a field subset before its serialized rows are cached
+HOT_AFTER = 3
+
+# Field subsets cached per table, least recently used evicted first
+MAX_PROJECTIONS = 8
+
+# Distinct field subsets counted per table before the counts start over
+MAX_TRACKED = 256
+
+
+def project(row: Dict[str, Any], fields: Sequence[str]) -> Dict[str, Any]:
+    """The listed fields of a row, in the order listed; fields the row lacks are left out"""
+    return {field: row[field] for field in fields if field in row}
+
+
+def projection_fields(fields: Any) -> Optional[Tuple[str, ...]]:
+    """Normalized fields argument: a tuple without duplicates, or None for whole rows"""
+    if not fields:
+        return None
+    if isinstance(fields, str) or not all(isinstance(field, str) for field in fields):
+        raise ValueError("fields must be a list of field names")
+    return tuple(dict.fromkeys(fields))
+
+
+def _row_fields(rows: Iterable[Dict[str, Any]]) -> Set[str]:
+    fields: Set[str] = set()
+    for row in rows:
+        fields.update(row.keys())
+    return fields
+
+
+class ProjectionCache:
+    """Serialized projections of one table's rows for its most used field subsets"""
+
+    def __init__(self, table: Any):
+        self.table = table
+        self.uses: Counter = Counter()
+        self.texts: "OrderedDict[Tuple[str, ...], Dict[str, str]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._columns: Optional[Set[str]] = None
+        table.subscribe(self._changed)
+
+    def _changed(self, table: Any, key: str, field: Optional[str], old: Any, new: Any) -> None:
+        if self._columns is not None:
+            if field is not None:
+                self._columns.add(field)
+            elif hasattr(new, "keys"):
+                self._columns.update(new.keys())
+        for fields, texts in self.texts.items():
+            if field is None or field in fields:
+                texts.pop(key, None)
+
+    def columns(self) -> Set[str]:
+        """Every field some row of the table holds or has held, kept current from its writes"""
+        if self._columns is None:
+            self._columns = _row_fields(self.table.values())
+        return self._columns
+
+    def clear(self) -> None:
+        self.uses.clear()
+        self.texts.clear()
+
+    def serializer(self, fields: Tuple[str, ...]) -> Optional[Callable[[Dict[str, Any]], str]]:
+        """Function from a row of the table to the JSON text of its projection onto fields.
+
+        None while the subset is not hot yet: one json.dumps over the
+        projected rows is faster than serializing them one at a time.
+        """
+        if len(self.uses) >= MAX_TRACKED and fields not in self.uses:
+            self.uses.clear()
+        self.uses[fields] += 1
+        texts = self.texts.get(fields)
+        if texts is not None:
+            self.texts.move_to_end(fields)
+        elif self.uses[fields] >= HOT_AFTER:
+            texts = self.texts[fields] = {}
+            if len(self.texts) > MAX_PROJECTIONS:
+                self.texts.popitem(last=False)
+        else:
+            return None
+
+        table = self.table
+
+        def dump(row: Dict[str, Any]) -> str:
+            # Only rows the table handed out carry the key their writes are reported under
+            key = getattr(row, "_key", None) if getattr(row, "_table", None) is table else None
+            text = texts.get(key) if key is not None else None
+            if text is not None:
+                self.hits += 1
+                return text
+            self.misses += 1
+            text = json.dumps(project(row, fields))
+            if key is not None:
+                texts[key] = text
+            return text
+        return dump
+
+
+def projection_cache(table: Any) -> Optional[ProjectionCache]:
+    """The table's ProjectionCache, created on first use; None for tables without change notification"""
+    cache = getattr(table, "_projections", None)
+    if cache is None and hasattr(table, "subscribe"):
+        cache = ProjectionCache(table)
+        try:
+            table._projections = cache
+        except AttributeError:
+            table.unsubscribe(cache._changed)
+            return None
+    return cache
+
+
+def check_fields(table: Any, fields: Sequence[str], rows: Iterable[Dict[str, Any]] = ()) -> None:
+    """Raise ValueError naming the fields that no row of the table holds.
+
+    The rows about to be returned are looked at first, so the table's
+    columns are only consulted for fields none of them has.
+    """
+    unknown = set(fields)
+    for row in rows:
+        unknown.difference_update(row.keys())
+        if not unknown:
+            return
+    cache = projection_cache(table)
+    unknown -= cache.columns() if cache is not None else _row_fields(table.values())
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+
+
+def _dump_array(rows: Iterable[Dict[str, Any]], dump: Callable[[Dict[str, Any]], str]) -> str:
+    # Same text as json.dumps(list) with the default separators
+    return "[" + ", ".join(map(dump, rows)) + "]"
+
+
+def dump_rows(table: Any, results: Any, fields: Any = None) -> str:
+    """JSON text of a find_rows() list or find_page() page, rows projected onto fields when given.
+
+    Raises ValueError when fields names a field no row of the table holds.
+    """
+    fields = projection_fields(fields)
+    if fields is None:
+        return json.dumps(results)
+    check_fields(table, fields, results["results"] if isinstance(results, dict) else results)
+    cache = projection_cache(table)
+    dump = cache.serializer(fields) if cache is not None else None
+    if dump is None:
+        if isinstance(results, dict):
+            return json.dumps({"results": [project(row, fields) for row in results["results"]],
+                               "next_cursor": results["next_cursor"]})
+        return json.dumps([project(row, fields) for row in results])
+    if isinstance(results, dict):
+        return '{"results": ' + _dump_array(results["results"], dump) + \
+            ', "next_cursor": ' + json.dumps(results["next_cursor"]) + "}"
+    return _dump_array(results, dump)
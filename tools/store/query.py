@@ -0,0 +1,57 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .planner import QueryPlan, predicates
+from .textindex import TextIndex
+
+
+def _indexed(table: Any) -> bool:
+    """Whether a table exposes the has_index/lookup/rows_for_keys index protocol"""
+    return hasattr(table, "has_index")
+
+
+def candidate_rows(table: Dict[str, Any], casefold: Optional[Dict[str, Any]] = None,
+                   ranges: Optional[Dict[str, Tuple[Optional[str], Optional[str]]]] = None,
+                   contains: Optional[Dict[str, Any]] = None, **criteria: Any) -> Iterable[Dict[str, Any]]:
+    """Rows that may satisfy the equality criteria, narrowed through the table's indexes.
+
+    Criteria with a falsy value are ignored, matching how the get tools skip
+    unset filters; casefold holds criteria compared case-insensitively,
+    ranges maps timestamp columns to inclusive (from, to) ISO-8601 bounds, and
+    contains holds case-insensitive substring filters served by trigram
+    indexes (needles under three characters narrow nothing). The
+    result is a superset of the matching rows in table order, so callers still
+    apply their own predicates. Plain dict tables, or criteria on unindexed
+    columns only, fall back to every row. See find_rows() for the whole read.
+    """
+    return QueryPlan(table, predicates(casefold=casefold, contains=contains, ranges=ranges,
+                                       **criteria)).candidates()
+
+
+def value_exists(table: Dict[str, Any], column: str, value: Any,
+                 exclude_key: Optional[str] = None) -> bool:
+    """Whether a row other than exclude_key already holds value in column.
+
+    Served by the table's unique index in O(1) when there is one; plain dict
+    tables are scanned.
+    """
+    if _indexed(table) and table.has_index(column):
+        keys = table.lookup(column, value) if value is not None else table.keys()
+        return any(key != exclude_key and table[key].get(column) == value for key in keys)
+    return any(key != exclude_key and row.get(column) == value for key, row in table.items())
+
+
+def search_rows(table: Dict[str, Any], column: str, query: str,
+                limit: Optional[int] = 10) -> List[Tuple[Dict[str, Any], float]]:
+    """(row, BM25 score) of the rows whose text column best matches query, best first.
+
+    Served by the table's inverted index when it keeps one on column; other
+    tables are tokenized into a throwaway index first, which ranks the same.
+    """
+    if hasattr(table, "has_text_index") and table.has_text_index(column):
+        return [(table[key], score) for key, score in table.text_search(column, query, limit)]
+    index = TextIndex(column)
+    positions = {}
+    for position, (key, row) in enumerate(table.items()):
+        index.add(row.get(column), key)
+        positions[key] = position
+    return [(table[key], score) for key, score in index.search(query, limit, positions.__getitem__)]
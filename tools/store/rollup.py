@@ -0,0 +1,181 @@
+"""Materialized per-incident rollups of performance_metrics.
+
+A MetricRollup groups the metric rows of a table by (incident_id,
+metric_type) and keeps each group's values with their count, sum, min and
+max. It is built with one scan the first time a table is asked for it and
+then follows the table's change notifications, so a metric insert costs O(1)
+and reading an incident's metrics never touches the rest of the table.
+
+Values are kept in table order and an incident's metric types in the order
+their first row appears, which is what a scan of the table produces.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+
+from .table import MISSING
+
+# Row fields the rollup is keyed and aggregated on
+GROUP_FIELDS = ("incident_id", "metric_type", "calculated_value_minutes")
+
+
+def _numeric(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class MetricGroup:
+    """Values of one (incident_id, metric_type) group with their count, sum, min and max"""
+    __slots__ = ("values", "count", "sum", "min", "max")
+
+    def __init__(self):
+        # metric key -> (sequence number, value), in table order
+        self.values: Dict[str, Tuple[int, Any]] = {}
+        self.count = 0
+        self.sum = 0
+        self.min = None
+        self.max = None
+
+    @property
+    def first(self) -> int:
+        return next(iter(self.values.values()))[0]
+
+    def add(self, key: str, sequence: int, value: Any) -> None:
+        values = self.values
+        out_of_order = bool(values) and next(reversed(values.values()))[0] > sequence
+        values[key] = (sequence, value)
+        if out_of_order:
+            # A row moved in from another group: restore table order
+            self.values = dict(sorted(values.items(), key=lambda item: item[1][0]))
+        if _numeric(value):
+            self.count += 1
+            self.sum += value
+            self.min = value if self.min is None or value < self.min else self.min
+            self.max = value if self.max is None or value > self.max else self.max
+
+    def remove(self, key: str) -> None:
+        _, value = self.values.pop(key)
+        if _numeric(value):
+            self.count -= 1
+            self.sum -= value
+            if value == self.min or value == self.max:
+                numbers = [v for _, v in self.values.values() if _numeric(v)]
+                self.min = min(numbers, default=None)
+                self.max = max(numbers, default=None)
+
+    def summary(self) -> Dict[str, Any]:
+        return {"count": self.count, "sum": self.sum, "min": self.min, "max": self.max,
+                "avg": self.sum / self.count if self.count else None,
+                "values": [value for _, value in self.values.values()]}
+
+
+class MetricRollup:
+    """Metric rows of a table grouped by incident_id, then metric_type, kept current on every write"""
+
+    def __init__(self, table: Any):
+        self.table = table
+        self.incidents: Dict[Any, Dict[Any, MetricGroup]] = {}
+        # metric key -> (sequence number, incident_id, metric_type), mirroring the table's key order
+        self._rows: Dict[str, Tuple[int, Any, Any]] = {}
+        self._sequence = 0
+        for key, row in table.items():
+            self._add(key, row, None)
+        table.subscribe(self._changed)
+
+    def _add(self, key: str, row: Dict[str, Any], sequence: Optional[int]) -> None:
+        if sequence is None:
+            sequence = self._sequence
+            self._sequence += 1
+        incident_id, metric_type = row.get("incident_id"), row.get("metric_type")
+        self._rows[key] = (sequence, incident_id, metric_type)
+        groups = self.incidents.setdefault(incident_id, {})
+        group = groups.get(metric_type)
+        if group is None:
+            group = groups[metric_type] = MetricGroup()
+        group.add(key, sequence, row.get("calculated_value_minutes"))
+
+    def _remove(self, key: str) -> int:
+        sequence, incident_id, metric_type = self._rows.pop(key)
+        groups = self.incidents[incident_id]
+        group = groups[metric_type]
+        group.remove(key)
+        if not group.values:
+            del groups[metric_type]
+            if not groups:
+                del self.incidents[incident_id]
+        return sequence
+
+    def _changed(self, table: Any, key: str, field: Optional[str], old: Any, new: Any) -> None:
+        if field is None:
+            # Insert, replace or delete; a replaced row keeps its place in the table
+            sequence = self._remove(key) if key in self._rows else None
+            if new is not MISSING:
+                self._add(key, new, sequence)
+        elif field in GROUP_FIELDS and key in self._rows:
+            self._add(key, table[key], self._remove(key))
+
+    def groups(self, incident_id: Any) -> List[Tuple[Any, MetricGroup]]:
+        """(metric_type, group) pairs of an incident, types in the order their first row appears"""
+        groups = self.incidents.get(incident_id)
+        if not groups:
+            return []
+        return sorted(groups.items(), key=lambda item: item[1].first)
+
+    def values(self, incident_id: Any) -> Dict[Any, List[Any]]:
+        """{metric_type: [calculated_value_minutes, ...]} for an incident"""
+        return {metric_type: [value for _, value in group.values.values()]
+                for metric_type, group in self.groups(incident_id)}
+
+    def summary(self, incident_id: Any, metric_type: Any) -> Optional[Dict[str, Any]]:
+        """count/sum/min/max/avg and values of one group; None if the incident has no such metrics"""
+        group = self.incidents.get(incident_id, {}).get(metric_type)
+        return group.summary() if group is not None else None
+
+
+def metric_rollup(table: Any) -> Optional[MetricRollup]:
+    """The table's MetricRollup, built on first use; None for tables without change notification"""
+    rollup = getattr(table, "_rollup", None)
+    if rollup is None and hasattr(table, "subscribe"):
+        rollup = MetricRollup(table)
+        try:
+            table._rollup = rollup
+        except AttributeError:
+            table.unsubscribe(rollup._changed)
+            return None
+    return rollup
+
+
+def incident_metric_values(table: Dict[str, Any], incident_id: Any) -> Dict[Any, List[Any]]:
+    """{metric_type: [calculated_value_minutes, ...]} of an incident's metrics, in table order"""
+    rollup = metric_rollup(table)
+    if rollup is not None:
+        return rollup.values(incident_id)
+    calculated_values: Dict[Any, List[Any]] = {}
+    for metric in table.values():
+        if metric.get("incident_id") == incident_id:
+            calculated_values.setdefault(metric.get("metric_type"), []).append(
+                metric.get("calculated_value_minutes"))
+    return calculated_values
+
+
+def incident_metric_summary(table: Dict[str, Any], incident_id: Any,
+                            metric_type: Any) -> Optional[Dict[str, Any]]:
+    """count/sum/min/max/avg and values of an incident's metrics of one type; None if there are none"""
+    rollup = metric_rollup(table)
+    if rollup is not None:
+        return rollup.summary(incident_id, metric_type)
+    group = MetricGroup()
+    for key, metric in table.items():
+        if metric.get("incident_id") == incident_id and metric.get("metric_type") == metric_type:
+            group.add(key, len(group.values), metric.get("calculated_value_minutes"))
+    return group.summary() if group.values else None
+
+
+def first_metric_values(table: Dict[str, Any], metric_type: Any) -> Dict[Any, Any]:
+    """{incident_id: calculated_value_minutes of its first metric of metric_type} for every incident"""
+    rollup = metric_rollup(table)
+    if rollup is not None:
+        return {incident_id: next(iter(groups[metric_type].values.values()))[1]
+                for incident_id, groups in rollup.incidents.items() if metric_type in groups}
+    values: Dict[Any, Any] = {}
+    for metric in table.values():
+        if metric.get("metric_type") == metric_type:
+            values.setdefault(metric.get("incident_id"), metric.get("calculated_value_minutes"))
+    return values
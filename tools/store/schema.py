@@ -0,0 +1,153 @@
+import os
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DATA_DIR = os.path.join(REPO_ROOT, "data")
+ENUMS_PATH = os.path.join(REPO_ROOT, "enums.yaml")
+RELATIONSHIPS_PATH = os.path.join(REPO_ROOT, "relationships.yaml")
+
+# Primary key column of every table under data/
+PRIMARY_KEYS = {
+    "audit_logs": "audit_id",
+    "change_requests": "change_id",
+    "clients": "client_id",
+    "communications": "communication_id",
+    "incident_escalations": "escalation_id",
+    "incident_reports": "report_id",
+    "incident_updates": "update_id",
+    "incidents": "incident_id",
+    "infrastructure_components": "component_id",
+    "knowledge_base_articles": "article_id",
+    "performance_metrics": "metric_id",
+    "post_incident_reviews": "review_id",
+    "problem_tickets": "problem_id",
+    "products": "product_id",
+    "rollback_requests": "rollback_id",
+    "root_cause_analysis": "analysis_id",
+    "service_level_agreements": "sla_id",
+    "subscriptions": "subscription_id",
+    "users": "user_id",
+    "vendors": "vendor_id",
+    "work_orders": "workorder_id",
+    "workarounds": "workaround_id",
+}
+
+# Columns the create/update tools keep unique
+UNIQUE_COLUMNS = {
+    "clients": ["registration_number", "contact_email"],
+    "infrastructure_components": ["component_name"],
+    "products": ["product_name"],
+    "users": ["email"],
+    "vendors": ["vendor_name", "contact_email", "contact_phone"],
+}
+
+# Columns matched case-insensitively by the get tools
+CASEFOLD_COLUMNS = {
+    "clients": ["contact_email"],
+    "users": ["email"],
+    "vendors": ["contact_email"],
+}
+
+# ISO-8601 columns with a sorted time index, besides created_at on every table
+TIME_COLUMNS = {
+    "communications": ["sent_at"],
+    "incident_escalations": ["escalated_at"],
+    "incident_reports": ["generated_at"],
+    "incidents": ["detection_timestamp", "resolution_timestamp"],
+    "performance_metrics": ["recorded_at"],
+}
+
+# Free-text columns with an inverted index for ranked search
+TEXT_COLUMNS = {
+    "incidents": ["title"],
+    "knowledge_base_articles": ["title"],
+    "problem_tickets": ["title"],
+}
+
+# Name columns filtered by case-insensitive substring, with a trigram index
+TRIGRAM_COLUMNS = {
+    "clients": ["client_name"],
+    "infrastructure_components": ["component_name"],
+    "products": ["product_name"],
+    "vendors": ["vendor_name"],
+}
+
+# High-cardinality tables that can be stored as compact records (see compact.py)
+COMPACT_TABLES = ["audit_logs", "communications", "incident_updates", "performance_metrics"]
+
+
+def _load_yaml(path: str) -> Dict[str, Any]:
+    """Read a YAML file, returning an empty mapping when it is not shipped"""
+    if not os.path.exists(path):
+        return {}
+    import yaml
+    with open(path) as f:
+        return yaml.safe_load(f) or {}
+
+
+@lru_cache(maxsize=None)
+def load_enums() -> Dict[str, Dict[str, List[str]]]:
+    """Enum columns per table, as declared in enums.yaml"""
+    return _load_yaml(ENUMS_PATH).get("enums", {})
+
+
+@lru_cache(maxsize=None)
+def load_foreign_keys() -> Tuple[Dict[str, str], ...]:
+    """Foreign key declarations from relationships.yaml"""
+    return tuple(_load_yaml(RELATIONSHIPS_PATH).get("foreign_keys", []))
+
+
+def primary_key(table_name: str) -> str:
+    """Primary key column of a table, defaulting to the first *_id column convention"""
+    if table_name in PRIMARY_KEYS:
+        return PRIMARY_KEYS[table_name]
+    return f"{table_name.rstrip('s')}_id"
+
+
+def foreign_key_columns(table_name: str) -> List[str]:
+    """Child columns of a table that reference another table"""
+    columns = []
+    for fk in load_foreign_keys():
+        if fk.get("child_table") == table_name and fk["child_column"] not in columns:
+            columns.append(fk["child_column"])
+    return columns
+
+
+def enum_columns(table_name: str) -> List[str]:
+    """Columns of a table restricted to an enum in enums.yaml"""
+    return list(load_enums().get(table_name, {}))
+
+
+def indexed_columns(table_name: str) -> List[str]:
+    """Columns that get a secondary hash index: primary key, foreign keys and enums"""
+    columns = [primary_key(table_name)]
+    for column in foreign_key_columns(table_name) + enum_columns(table_name):
+        if column not in columns:
+            columns.append(column)
+    return columns
+
+
+def unique_columns(table_name: str) -> List[str]:
+    """Columns of a table with a unique index"""
+    return list(UNIQUE_COLUMNS.get(table_name, []))
+
+
+def casefold_columns(table_name: str) -> List[str]:
+    """Columns of a table with an additional case-folded index"""
+    return list(CASEFOLD_COLUMNS.get(table_name, []))
+
+
+def time_columns(table_name: str) -> List[str]:
+    """Timestamp columns of a table with a sorted time index"""
+    return TIME_COLUMNS.get(table_name, []) + ["created_at"]
+
+
+def text_columns(table_name: str) -> List[str]:
+    """Free-text columns of a table with an inverted index"""
+    return list(TEXT_COLUMNS.get(table_name, []))
+
+
+def trigram_columns(table_name: str) -> List[str]:
+    """Columns of a table with a trigram index for substring filters"""
+    return list(TRIGRAM_COLUMNS.get(table_name, []))
@@ -0,0 +1,188 @@
+"""SLA compliance of incidents, evaluated a column at a time.
+
+An incident's SLA is resolved through incidents.client_id ->
+subscriptions.client_id -> service_level_agreements (subscription_id,
+severity_level). A client with several subscriptions uses the one for the
+product of the incident's component when there is one, active subscriptions
+before the rest, and the first of those with an SLA for the incident's
+severity.
+
+sla_compliance() builds parallel column lists from the incident rows, joins
+them against maps built once from the subscription, SLA, component and
+metric tables, and computes response and resolution times, margins and
+breach flags for every incident in a single pass over the columns.
+
+Both clocks start at detection. The response clock runs while the status is
+"open" and stops when it leaves "open": an incident that has left it is
+measured by its first response_time metric, else by the first status update
+in incident_updates moving it off "open", else not at all. The resolution
+clock runs until the status is resolved or closed and is measured from the
+resolution timestamp or resolution_time metric. Running clocks are measured
+up to as_of. deadlines.py schedules response deadlines by the same rule.
+"""
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .rollup import first_metric_values
+from .timeindex import to_epoch
+
+# Time incidents that are still open are measured up to, the tools' "now"
+DEFAULT_AS_OF = "2025-10-01T00:00:00"
+
+# Incident status the response clock runs in
+RESPONSE_STATUS = "open"
+
+# Incident statuses that stop the resolution clock
+CLOSED_STATUSES = frozenset(("resolved", "closed"))
+
+# Tables sla_compliance() reads from its data argument
+SLA_COMPLIANCE_TABLES = ("incidents", "subscriptions", "service_level_agreements", "infrastructure_components",
+                         "performance_metrics", "incident_updates")
+
+# Output columns of sla_compliance(), in order
+COLUMNS = (
+    "incident_id", "client_id", "severity", "status", "subscription_id", "sla_id", "sla_tier",
+    "response_target_minutes", "response_minutes", "response_margin_minutes", "response_breached",
+    "resolution_target_minutes", "resolution_minutes", "resolution_margin_minutes", "resolution_breached",
+)
+
+
+class SlaMap:
+    """Join maps from a client, product and severity to its subscription and SLA"""
+
+    def __init__(self, subscriptions: Dict[str, Any], slas: Dict[str, Any]):
+        self.slas: Dict[Tuple[str, Any], Dict[str, Any]] = {}
+        for sla in slas.values():
+            key = (str(sla.get("subscription_id")), sla.get("severity_level"))
+            self.slas.setdefault(key, sla)
+        # client_id -> its subscriptions, active ones first, each in table order
+        self.subscriptions: Dict[str, List[Dict[str, Any]]] = {}
+        for subscription in subscriptions.values():
+            self.subscriptions.setdefault(str(subscription.get("client_id")), []).append(subscription)
+        for ranked in self.subscriptions.values():
+            ranked.sort(key=lambda s: s.get("status") != "active")
+        self._resolved: Dict[Tuple[str, Any, Any], Tuple[Optional[Dict], Optional[Dict]]] = {}
+
+    def resolve(self, client_id: Any, product_id: Any,
+                severity: Any) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """(subscription, sla) of an incident, or (None, None) when the client has no SLA for the severity"""
+        key = (str(client_id), product_id, severity)
+        resolved = self._resolved.get(key)
+        if resolved is None:
+            resolved = (None, None)
+            ranked = self.subscriptions.get(key[0], [])
+            matching = [s for s in ranked if product_id is not None and s.get("product_id") == product_id]
+            for subscription in matching + ranked:
+                sla = self.slas.get((str(subscription.get("subscription_id")), severity))
+                if sla is not None:
+                    resolved = (subscription, sla)
+                    break
+            self._resolved[key] = resolved
+        return resolved
+
+
+def _minutes(start: Optional[int], end: Optional[int]) -> Optional[float]:
+    if start is None or end is None:
+        return None
+    return round(max(end - start, 0) / 60, 1)
+
+
+def _margin(target: Any, actual: Any) -> Tuple[Optional[float], Optional[bool]]:
+    if target is None or actual is None:
+        return None, None
+    return round(target - actual, 1), actual > target
+
+
+def left_open_times(updates: Dict[str, Any]) -> Dict[Any, int]:
+    """{incident_id: epoch of the first status update moving it off "open"} from incident_updates rows"""
+    times: Dict[Any, int] = {}
+    for update in updates.values():
+        if update.get("field_changed") != "status" or update.get("old_value") != RESPONSE_STATUS:
+            continue
+        changed = to_epoch(update.get("created_at"))
+        incident_id = update.get("incident_id")
+        if changed is not None and (incident_id not in times or changed < times[incident_id]):
+            times[incident_id] = changed
+    return times
+
+
+def sla_compliance(data: Dict[str, Any], incidents: Optional[Iterable[Dict[str, Any]]] = None,
+                   as_of: Optional[str] = None) -> Dict[str, List[Any]]:
+    """{column: [value per incident]} of SLA targets, measured minutes, margins and breach flags.
+
+    incidents defaults to every row of data["incidents"]. Margins are target
+    minus measured minutes, so a negative margin is a breach; columns are
+    None where the incident has no SLA or nothing to measure yet.
+    """
+    as_of_epoch = to_epoch(as_of or DEFAULT_AS_OF)
+    if as_of_epoch is None:
+        raise ValueError(f"Invalid as_of timestamp: {as_of}")
+    if incidents is None:
+        incidents = data.get("incidents", {}).values()
+    rows = list(incidents)
+    sla_map = SlaMap(data.get("subscriptions", {}), data.get("service_level_agreements", {}))
+    components = data.get("infrastructure_components", {})
+    metrics = data.get("performance_metrics", {})
+    response_metrics = first_metric_values(metrics, "response_time")
+    resolution_metrics = first_metric_values(metrics, "resolution_time")
+    left_open = left_open_times(data.get("incident_updates", {}))
+
+    # Incident columns
+    incident_ids = [row.get("incident_id") for row in rows]
+    client_ids = [row.get("client_id") for row in rows]
+    severities = [row.get("severity") for row in rows]
+    statuses = [row.get("status") for row in rows]
+    detected = [to_epoch(row.get("detection_timestamp")) for row in rows]
+    resolved = [to_epoch(row.get("resolution_timestamp")) for row in rows]
+    open_flags = [status not in CLOSED_STATUSES for status in statuses]
+    product_ids = []
+    for row in rows:
+        component = components.get(str(row.get("component_id"))) if row.get("component_id") else None
+        product_ids.append(component.get("product_id") if component else None)
+
+    # Joins
+    joined = [sla_map.resolve(*key) for key in zip(client_ids, product_ids, severities)]
+    subscriptions = [subscription for subscription, _ in joined]
+    slas = [sla for _, sla in joined]
+    response_targets = [sla.get("response_time_minutes") if sla else None for sla in slas]
+    resolution_targets = [sla["resolution_time_hours"] * 60 if sla and sla.get("resolution_time_hours") is not None
+                          else None for sla in slas]
+
+    # Measured minutes: metrics and timestamps, running clocks up to as_of
+    elapsed = [_minutes(start, as_of_epoch) if is_open else None for start, is_open in zip(detected, open_flags)]
+    response_minutes = []
+    for incident_id, status, start, waited in zip(incident_ids, statuses, detected, elapsed):
+        if status == RESPONSE_STATUS:
+            response_minutes.append(waited)
+        else:
+            minutes = response_metrics.get(incident_id)
+            response_minutes.append(minutes if minutes is not None else _minutes(start, left_open.get(incident_id)))
+    resolution_minutes = []
+    for incident_id, start, end, waited in zip(incident_ids, detected, resolved, elapsed):
+        minutes = _minutes(start, end) if end is not None else resolution_metrics.get(incident_id)
+        resolution_minutes.append(minutes if minutes is not None else waited)
+
+    response = [_margin(target, actual) for target, actual in zip(response_targets, response_minutes)]
+    resolution = [_margin(target, actual) for target, actual in zip(resolution_targets, resolution_minutes)]
+
+    return {
+        "incident_id": incident_ids,
+        "client_id": client_ids,
+        "severity": severities,
+        "status": statuses,
+        "subscription_id": [s.get("subscription_id") if s else None for s in subscriptions],
+        "sla_id": [sla.get("sla_id") if sla else None for sla in slas],
+        "sla_tier": [s.get("sla_tier") if s else None for s in subscriptions],
+        "response_target_minutes": response_targets,
+        "response_minutes": response_minutes,
+        "response_margin_minutes": [margin for margin, _ in response],
+        "response_breached": [breached for _, breached in response],
+        "resolution_target_minutes": resolution_targets,
+        "resolution_minutes": resolution_minutes,
+        "resolution_margin_minutes": [margin for margin, _ in resolution],
+        "resolution_breached": [breached for _, breached in resolution],
+    }
+
+
+def sla_rows(columns: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """Per-incident dicts of sla_compliance() columns"""
+    return [dict(zip(COLUMNS, values)) for values in zip(*(columns[column] for column in COLUMNS))]
@@ -0,0 +1,405 @@
+"""Memory-mapped binary snapshot of the data tables.
+
+Layout (little endian, sections 8-byte aligned):
+
+    header     magic, version, table count, string table offset, directory offset
+    strings    u32 count, u64 offsets[count + 1], utf-8 blob
+    per table  u32 key string ids[row_count], fixed-width row records
+    directory  u64 length, JSON table directory (columns, dictionaries, offsets)
+
+Every distinct string is stored once in the string table. Columns whose values
+are all strings with at most 253 distinct values (every enums.yaml column, plus
+other low-cardinality ones such as timezone) are dictionary-encoded as one byte
+per row; all other columns use a 9 byte tagged cell. Rows are decoded from the
+mapping the first time they are read.
+"""
+import json
+import mmap
+import os
+import struct
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from .ids import IdSequence
+
+MAGIC = b"IMSNAP\x00\x01"
+VERSION = 1
+HEADER = struct.Struct("<8sIIQQ")
+
+# One-byte codes of dictionary-encoded columns
+MAX_DICTIONARY = 253
+CODE_ABSENT = 0xFE
+CODE_NULL = 0xFF
+
+# Tags of generic cells, followed by an 8 byte payload
+TAG_ABSENT, TAG_NULL, TAG_STR, TAG_INT, TAG_FLOAT, TAG_TRUE, TAG_FALSE, TAG_JSON = range(8)
+
+_ABSENT = object()
+_DOUBLE = struct.Struct("<d")
+_INT64 = struct.Struct("<q")
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+class _StringTableBuilder:
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+
+    def add(self, value: str) -> int:
+        sid = self.ids.get(value)
+        if sid is None:
+            sid = self.ids[value] = len(self.ids)
+        return sid
+
+    def encode(self) -> bytes:
+        blobs = [s.encode("utf-8") for s in self.ids]
+        offsets = [0]
+        for blob in blobs:
+            offsets.append(offsets[-1] + len(blob))
+        head = struct.pack("<I4x", len(blobs)) + struct.pack(f"<{len(offsets)}Q", *offsets)
+        return head + b"".join(blobs)
+
+
+def _column_layout(rows: List[Dict[str, Any]]) -> List[str]:
+    columns: Dict[str, None] = {}
+    for row in rows:
+        for column in row:
+            columns.setdefault(column, None)
+    return list(columns)
+
+
+def _dictionary_for(rows: List[Dict[str, Any]], column: str) -> Optional[List[str]]:
+    values: Dict[str, None] = {}
+    for row in rows:
+        value = row.get(column)
+        if value is None:
+            continue
+        if not isinstance(value, str):
+            return None
+        values.setdefault(value, None)
+        if len(values) > MAX_DICTIONARY:
+            return None
+    return list(values)
+
+
+def _encode_cell(value: Any, strings: _StringTableBuilder) -> Tuple[int, int]:
+    if value is _ABSENT:
+        return TAG_ABSENT, 0
+    if value is None:
+        return TAG_NULL, 0
+    if value is True:
+        return TAG_TRUE, 0
+    if value is False:
+        return TAG_FALSE, 0
+    if isinstance(value, str):
+        return TAG_STR, strings.add(value)
+    if isinstance(value, int) and -(1 << 63) <= value < (1 << 63):
+        return TAG_INT, value
+    if isinstance(value, float):
+        return TAG_FLOAT, _INT64.unpack(_DOUBLE.pack(value))[0]
+    return TAG_JSON, strings.add(json.dumps(value))
+
+
+def write_snapshot(data: Dict[str, Dict[str, Dict[str, Any]]], path: str) -> None:
+    """Compile {table: {key: row}} into a snapshot file at path"""
+    strings = _StringTableBuilder()
+    directory = []
+    sections = []
+    for table_name, table in data.items():
+        keys = list(table.keys())
+        rows = [table[key] for key in keys]
+        columns = []
+        row_format = "<"
+        for column in _column_layout(rows):
+            dictionary = _dictionary_for(rows, column)
+            if dictionary is not None:
+                columns.append({"name": column, "dictionary": dictionary})
+                row_format += "B"
+            else:
+                columns.append({"name": column})
+                row_format += "Bq"
+        codes = [{value: code for code, value in enumerate(c["dictionary"])} if "dictionary" in c else None
+                 for c in columns]
+        row_struct = struct.Struct(row_format)
+
+        key_ids = struct.pack(f"<{len(keys)}I", *(strings.add(str(key)) for key in keys))
+        records = bytearray(row_struct.size * len(rows))
+        for i, row in enumerate(rows):
+            cells = []
+            for column, code_map in zip(columns, codes):
+                value = row.get(column["name"], _ABSENT)
+                if code_map is not None:
+                    cells.append(CODE_ABSENT if value is _ABSENT else CODE_NULL if value is None else code_map[value])
+                else:
+                    cells.extend(_encode_cell(value, strings))
+            row_struct.pack_into(records, i * row_struct.size, *cells)
+
+        dense = all(key == str(i + 1) for i, key in enumerate(keys))
+        directory.append({"name": table_name, "rows": len(rows), "columns": columns,
+                          "row_format": row_format, "dense_keys": dense})
+        sections.append((key_ids, bytes(records)))
+
+    string_blob = strings.encode()
+    strings_offset = _align(HEADER.size)
+    with open(path, "wb") as f:
+        f.seek(strings_offset)
+        f.write(string_blob)
+        cursor = _align(strings_offset + len(string_blob))
+        for entry, (key_ids, records) in zip(directory, sections):
+            entry["keys_offset"] = cursor
+            f.seek(cursor)
+            f.write(key_ids)
+            entry["rows_offset"] = cursor = _align(cursor + len(key_ids))
+            f.seek(cursor)
+            f.write(records)
+            cursor = _align(cursor + len(records))
+        directory_blob = json.dumps(directory).encode("utf-8")
+        f.seek(cursor)
+        f.write(struct.pack("<Q", len(directory_blob)) + directory_blob)
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, VERSION, len(directory), strings_offset, cursor))
+
+
+def convert_json_dir(data_dir: str, path: str) -> None:
+    """Compile every data_dir/<table>.json file into one snapshot"""
+    data = {}
+    for file_name in sorted(os.listdir(data_dir)):
+        if file_name.endswith(".json"):
+            with open(os.path.join(data_dir, file_name)) as f:
+                data[file_name[:-len(".json")]] = json.load(f)
+    write_snapshot(data, path)
+
+
+class Snapshot:
+    """Read-only view of a snapshot file through mmap.
+
+    close() releases the mapping and the file, after which neither the
+    snapshot nor tables opened from it can be read; a Snapshot is also a
+    context manager closing itself on exit. Copies and pickles reopen the file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._buffer = memoryview(self._mmap)
+        # Views into the mapping handed out so far, released by close()
+        self._views: List[memoryview] = []
+        magic, version, _, strings_offset, directory_offset = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {VERSION} snapshot")
+        (count,) = struct.unpack_from("<I", self._mmap, strings_offset)
+        offsets_start = strings_offset + 8
+        self._string_offsets = self.view(offsets_start, offsets_start + 8 * (count + 1), "Q")
+        self._string_base = offsets_start + 8 * (count + 1)
+        self._strings: List[Optional[str]] = [None] * count
+        (length,) = struct.unpack_from("<Q", self._mmap, directory_offset)
+        directory = json.loads(self._mmap[directory_offset + 8:directory_offset + 8 + length])
+        self._directory = {entry["name"]: entry for entry in directory}
+
+    def view(self, start: int, end: int, fmt: str) -> memoryview:
+        """Typed view of a byte range of the mapping, valid until close()"""
+        with self._buffer[start:end] as part:
+            view = part.cast(fmt)
+        self._views.append(view)
+        return view
+
+    @property
+    def closed(self) -> bool:
+        return self._mmap.closed
+
+    def close(self) -> None:
+        """Release the mapping and the file behind it"""
+        if self._mmap.closed:
+            return
+        for view in self._views:
+            view.release()
+        self._views.clear()
+        self._buffer.release()
+        self._mmap.close()
+
+    def __enter__(self) -> "Snapshot":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.close()
+        return False
+
+    def __reduce__(self):
+        return (Snapshot, (self.path,))
+
+    def string(self, sid: int) -> str:
+        value = self._strings[sid]
+        if value is None:
+            start = self._string_base + self._string_offsets[sid]
+            end = self._string_base + self._string_offsets[sid + 1]
+            value = self._strings[sid] = self._mmap[start:end].decode("utf-8")
+        return value
+
+    def table_names(self) -> List[str]:
+        return list(self._directory)
+
+    def table(self, table_name: str) -> "SnapshotTable":
+        return SnapshotTable(self, self._directory[table_name])
+
+    def tables(self) -> Dict[str, "SnapshotTable"]:
+        return {name: self.table(name) for name in self._directory}
+
+
+def open_snapshot(path: str) -> Dict[str, "SnapshotTable"]:
+    """Open a snapshot as a data dict of lazily decoded tables"""
+    return Snapshot(path).tables()
+
+
+class SnapshotTable(MutableMapping):
+    """Table mapping that decodes snapshot rows on first access.
+
+    Decoded rows are cached, so in-place field writes persist; inserts and
+    deletes are kept in an overlay on top of the read-only base rows.
+    """
+
+    def __init__(self, snapshot: Snapshot, entry: Dict[str, Any]):
+        self.name = entry["name"]
+        self._snapshot = snapshot
+        self._base_count = entry["rows"]
+        self._dense_keys = entry["dense_keys"]
+        self._row_struct = struct.Struct(entry["row_format"])
+        self._rows_offset = entry["rows_offset"]
+        self._key_ids = snapshot.view(entry["keys_offset"], entry["keys_offset"] + 4 * self._base_count, "I")
+        self._decoders = [(column["name"], column.get("dictionary")) for column in entry["columns"]]
+        self._key_index: Optional[Dict[str, int]] = None
+        self._rows: Dict[str, Dict[str, Any]] = {}
+        self._removed: Set[str] = set()
+        self._added: Dict[str, None] = {}
+        self._ids: Optional[IdSequence] = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # The key view and row struct are rebuilt from the reopened snapshot; the id
+        # sequence from the keys on first use
+        state = dict(self.__dict__)
+        for name in ("_key_ids", "_row_struct"):
+            del state[name]
+        state["_ids"] = None
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        entry = self._snapshot._directory[self.name]
+        self._row_struct = struct.Struct(entry["row_format"])
+        self._key_ids = self._snapshot.view(entry["keys_offset"], entry["keys_offset"] + 4 * self._base_count, "I")
+
+    # Base row access
+
+    def _base_key(self, index: int) -> str:
+        return self._snapshot.string(self._key_ids[index])
+
+    def _base_index(self, key: Any) -> Optional[int]:
+        if self._dense_keys:
+            # Keys are "1".."n" in order, so the row index follows from the key itself
+            if not isinstance(key, str) or not key.isdigit():
+                return None
+            index = int(key) - 1
+            if 0 <= index < self._base_count and key == str(index + 1):
+                return index
+            return None
+        if self._key_index is None:
+            self._key_index = {self._base_key(i): i for i in range(self._base_count)}
+        return self._key_index.get(key)
+
+    def _decode(self, index: int) -> Dict[str, Any]:
+        values = self._row_struct.unpack_from(self._snapshot._mmap, self._rows_offset + index * self._row_struct.size)
+        string = self._snapshot.string
+        row = {}
+        position = 0
+        for name, dictionary in self._decoders:
+            if dictionary is not None:
+                code = values[position]
+                position += 1
+                if code == CODE_ABSENT:
+                    continue
+                row[name] = None if code == CODE_NULL else dictionary[code]
+                continue
+            tag, payload = values[position], values[position + 1]
+            position += 2
+            if tag == TAG_ABSENT:
+                continue
+            if tag == TAG_STR:
+                row[name] = string(payload)
+            elif tag == TAG_INT:
+                row[name] = payload
+            elif tag == TAG_NULL:
+                row[name] = None
+            elif tag == TAG_FLOAT:
+                row[name] = _DOUBLE.unpack(_INT64.pack(payload))[0]
+            elif tag == TAG_TRUE:
+                row[name] = True
+            elif tag == TAG_FALSE:
+                row[name] = False
+            else:
+                row[name] = json.loads(string(payload))
+        return row
+
+    # Mapping protocol
+
+    def __getitem__(self, key: str) -> Dict[str, Any]:
+        row = self._rows.get(key)
+        if row is not None:
+            return row
+        if key in self._removed:
+            raise KeyError(key)
+        index = self._base_index(key)
+        if index is None:
+            raise KeyError(key)
+        row = self._rows[key] = self._decode(index)
+        return row
+
+    def __contains__(self, key: Any) -> bool:
+        if key in self._rows:
+            return True
+        return key not in self._removed and self._base_index(key) is not None
+
+    def __setitem__(self, key: str, row: Dict[str, Any]) -> None:
+        if key not in self:
+            self._added[key] = None
+            if self._ids is not None:
+                self._ids.observe(key)
+        self._rows[key] = row
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self:
+            raise KeyError(key)
+        self._rows.pop(key, None)
+        if key in self._added:
+            del self._added[key]
+        else:
+            self._removed.add(key)
+        if self._ids is not None:
+            self._ids.forget(key)
+
+    def __iter__(self) -> Iterator[str]:
+        removed = self._removed
+        for index in range(self._base_count):
+            key = self._base_key(index)
+            if key not in removed:
+                yield key
+        yield from list(self._added)
+
+    def __len__(self) -> int:
+        return self._base_count - len(self._removed) + len(self._added)
+
+    @property
+    def ids(self) -> IdSequence:
+        if self._ids is None:
+            if self._dense_keys and not self._removed and not self._added:
+                self._ids = IdSequence([self._base_count])
+            else:
+                self._ids = IdSequence(self)
+            self._ids.bind(self)
+        return self._ids
+
+    def materialize(self) -> Dict[str, Dict[str, Any]]:
+        """Decode every row into a plain dict table"""
+        return {key: self[key] for key in self}
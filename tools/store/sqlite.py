@@ -0,0 +1,361 @@
+"""SQLite-backed data dict for datasets that do not fit in memory.
+
+Each table is stored as
+
+    CREATE TABLE "<table>" (
+        key TEXT PRIMARY KEY,
+        row TEXT NOT NULL,              -- the full row as JSON
+        "<column>" TEXT REFERENCES ..., -- one per indexed column
+        ...
+    )
+
+with one shadow column per primary key, foreign key (relationships.yaml) and
+enum (enums.yaml) column of the schema, plus the unique columns the
+create/update tools check. Shadow columns hold the same normalized value a
+HashIndex would, and each has a SQL index; case-folded columns get an
+additional expression index on casefold(). The query planner (planner.py) pushes its
+equality filters down as one indexed SELECT, and rows come back in insertion
+(rowid) order like a dict.
+"""
+import json
+import os
+import sqlite3
+import threading
+import weakref
+from collections.abc import ItemsView, MutableMapping, ValuesView
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .ids import IdSequence
+from .schema import casefold_columns, indexed_columns, load_foreign_keys, primary_key, unique_columns
+from .table import ViewRow, index_key
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _casefold(value: Optional[str]) -> Optional[str]:
+    return None if value is None else value.casefold()
+
+
+def connect(path: str) -> sqlite3.Connection:
+    connection = sqlite3.connect(path, check_same_thread=False)
+    connection.create_function("casefold", 1, _casefold, deterministic=True)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    return connection
+
+
+def table_columns(table_name: str) -> List[str]:
+    """Shadow columns stored for a table: indexed, then unique columns"""
+    columns = list(indexed_columns(table_name))
+    for column in unique_columns(table_name) + casefold_columns(table_name):
+        if column not in columns:
+            columns.append(column)
+    return columns
+
+
+def create_table_sql(table_name: str) -> List[str]:
+    """CREATE TABLE and CREATE INDEX statements for a table"""
+    references = {fk["child_column"]: fk for fk in load_foreign_keys() if fk.get("child_table") == table_name}
+    definitions = ["key TEXT PRIMARY KEY", "row TEXT NOT NULL"]
+    for column in table_columns(table_name):
+        definition = f"{_quote(column)} TEXT"
+        fk = references.get(column)
+        if fk is not None and fk["parent_column"] == primary_key(fk["parent_table"]):
+            definition += f" REFERENCES {_quote(fk['parent_table'])}(key)"
+        definitions.append(definition)
+    statements = [f"CREATE TABLE IF NOT EXISTS {_quote(table_name)} ({', '.join(definitions)})"]
+    for column in table_columns(table_name):
+        if column == primary_key(table_name):
+            continue
+        statements.append(f"CREATE INDEX IF NOT EXISTS {_quote(f'{table_name}.{column}')} "
+                          f"ON {_quote(table_name)}({_quote(column)})")
+    for column in casefold_columns(table_name):
+        statements.append(f"CREATE INDEX IF NOT EXISTS {_quote(f'{table_name}.{column}:casefold')} "
+                          f"ON {_quote(table_name)}(casefold({_quote(column)}))")
+    return statements
+
+
+class SqliteRow(ViewRow):
+    """Row of a SqliteTable; field writes are persisted as they happen"""
+    __slots__ = ()
+
+
+class _Values(ValuesView):
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for _, row in self._mapping._scan():
+            yield row
+
+
+class _Items(ItemsView):
+    def __iter__(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        yield from self._mapping._scan()
+
+
+class SqliteTable(MutableMapping):
+    """{id: row} view of one SQLite table.
+
+    Rows handed out are cached while referenced, so a tool writing through a
+    row it holds and then reading it again sees one object. Field writes go
+    straight to the database; writes nested inside a field's dict or list value
+    are not seen until the field itself is assigned.
+    """
+
+    frozen = False
+
+    def __init__(self, data: "SqliteData", name: str):
+        self.name = name
+        self.primary_key = primary_key(name)
+        self._data = data
+        self._db = data.connection
+        self._table = _quote(name)
+        self._columns = table_columns(name)
+        self._casefold = set(casefold_columns(name))
+        self._cache: "weakref.WeakValueDictionary[str, SqliteRow]" = weakref.WeakValueDictionary()
+        self._ids: Optional[IdSequence] = None
+        placeholders = ", ".join("?" * (len(self._columns) + 2))
+        names = ", ".join(["key", "row"] + [_quote(c) for c in self._columns])
+        updates = ", ".join(f"{c} = excluded.{c}" for c in ["row"] + [_quote(c) for c in self._columns])
+        self._upsert = (f"INSERT INTO {self._table} ({names}) VALUES ({placeholders}) "
+                        f"ON CONFLICT(key) DO UPDATE SET {updates}")
+
+    def __reduce__(self):
+        # Copies and pickles go through the database, which the table belongs to
+        return (_table_of, (self._data, self.name))
+
+    # Row encoding
+
+    def _params(self, key: str, row: Dict[str, Any]) -> List[Any]:
+        return [key, json.dumps(row)] + [index_key(row.get(column)) for column in self._columns]
+
+    def _row(self, key: str, encoded: str) -> SqliteRow:
+        row = self._cache.get(key)
+        if row is None:
+            row = SqliteRow(json.loads(encoded), self, key)
+            self._cache[key] = row
+        return row
+
+    def _scan(self, where: str = "", params: Iterable[Any] = ()) -> Iterator[Tuple[str, SqliteRow]]:
+        cursor = self._db.execute(f"SELECT key, row FROM {self._table} {where} ORDER BY rowid", list(params))
+        for key, encoded in cursor:
+            yield key, self._row(key, encoded)
+
+    def _row_changed(self, key: str, field: str, old: Any, new: Any) -> None:
+        row = self._cache.get(key)
+        if row is not None:
+            with self._data.lock:
+                self._db.execute(self._upsert, self._params(key, row))
+
+    # Mapping protocol
+
+    def __getitem__(self, key: str) -> SqliteRow:
+        row = self._cache.get(key)
+        if row is not None:
+            return row
+        found = self._db.execute(f"SELECT row FROM {self._table} WHERE key = ?", (key,)).fetchone()
+        if found is None:
+            raise KeyError(key)
+        return self._row(key, found[0])
+
+    def __contains__(self, key: Any) -> bool:
+        if not isinstance(key, str):
+            return False
+        return self._db.execute(f"SELECT 1 FROM {self._table} WHERE key = ?", (key,)).fetchone() is not None
+
+    def __setitem__(self, key: str, row: Dict[str, Any]) -> None:
+        with self._data.lock:
+            self._db.execute(self._upsert, self._params(key, row))
+        old = self._cache.pop(key, None)
+        if old is not None and old is not row:
+            old._table = None
+        if isinstance(row, SqliteRow) and (row._table is None or row is old):
+            row._table, row._key = self, key
+            self._cache[key] = row
+        self.ids.observe(key)
+
+    def __delitem__(self, key: str) -> None:
+        with self._data.lock:
+            deleted = self._db.execute(f"DELETE FROM {self._table} WHERE key = ?", (key,)).rowcount
+        if not deleted:
+            raise KeyError(key)
+        old = self._cache.pop(key, None)
+        if old is not None:
+            old._table = None
+        self.ids.forget(key)
+
+    def __iter__(self) -> Iterator[str]:
+        for (key,) in self._db.execute(f"SELECT key FROM {self._table} ORDER BY rowid"):
+            yield key
+
+    def __len__(self) -> int:
+        return self._db.execute(f"SELECT COUNT(*) FROM {self._table}").fetchone()[0]
+
+    def values(self) -> ValuesView:
+        return _Values(self)
+
+    def items(self) -> ItemsView:
+        return _Items(self)
+
+    @property
+    def ids(self) -> IdSequence:
+        if self._ids is None:
+            # Seeded from the largest integer key, without reading every key
+            self._ids = IdSequence()
+            self._ids.bind(self)
+            found = self._db.execute(
+                f"SELECT MAX(CAST(key AS INTEGER)) FROM {self._table} WHERE key GLOB '[0-9]*'").fetchone()
+            if found[0] is not None:
+                self._ids.observe(found[0])
+        return self._ids
+
+    # Index protocol used by candidate_rows/value_exists
+
+    def has_index(self, column: str, casefold: bool = False) -> bool:
+        if casefold:
+            return column in self._casefold
+        return column in self._columns
+
+    def lookup(self, column: str, value: Any, casefold: bool = False) -> Set[str]:
+        where, params = self._where([(column, value, casefold)])
+        return {key for (key,) in self._db.execute(f"SELECT key FROM {self._table} {where}", params)}
+
+    def rows_for_keys(self, keys: Iterable[str]) -> List[SqliteRow]:
+        keys = list(keys)
+        found = []
+        # Stay under SQLite's bound parameter limit
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            found.extend(self._db.execute(
+                f"SELECT rowid, key, row FROM {self._table} WHERE key IN ({', '.join('?' * len(chunk))})", chunk))
+        found.sort()
+        return [self._row(key, encoded) for _, key, encoded in found]
+
+    def select(self, criteria: Iterable[Tuple[str, Any, bool]]) -> Iterator[SqliteRow]:
+        """Rows matching every (column, value, casefold) equality on an indexed column, in one query.
+
+        Rows are decoded as the cursor reaches them, so a caller that stops
+        early or streams the result never holds more than the current row.
+        """
+        where, params = self._where(criteria)
+        for _, row in self._scan(where, params):
+            yield row
+
+    @staticmethod
+    def _where(criteria: Iterable[Tuple[str, Any, bool]]) -> Tuple[str, List[Any]]:
+        clauses, params = [], []
+        for column, value, folded in criteria:
+            value = index_key(value)
+            if value is None:
+                clauses.append("0")
+            elif folded:
+                clauses.append(f"casefold({_quote(column)}) = ?")
+                params.append(value.casefold())
+            else:
+                clauses.append(f"{_quote(column)} = ?")
+                params.append(value)
+        return (f"WHERE {' AND '.join(clauses)}" if clauses else ""), params
+
+
+def _table_of(data: "SqliteData", table_name: str) -> SqliteTable:
+    return data[table_name]
+
+
+class SqliteData(MutableMapping):
+    """data dict over a SQLite file, one SqliteTable per table.
+
+    Writes are visible immediately through the same object and made durable
+    by commit().
+    """
+
+    def __init__(self, path: str, image: Optional[bytes] = None):
+        self.path = path
+        self.connection = connect(path)
+        self.lock = threading.RLock()
+        if image is not None:
+            self.connection.deserialize(_rollback_journal(image))
+        self._tables: Dict[str, SqliteTable] = {}
+        for (table_name,) in self.connection.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' ORDER BY rowid"):
+            self._tables[table_name] = SqliteTable(self, table_name)
+
+    def create_table(self, table_name: str) -> SqliteTable:
+        with self.lock:
+            for statement in create_table_sql(table_name):
+                self.connection.execute(statement)
+        table = self._tables[table_name] = SqliteTable(self, table_name)
+        return table
+
+    def __getitem__(self, table_name: str) -> SqliteTable:
+        return self._tables[table_name]
+
+    def __setitem__(self, table_name: str, rows: Dict[str, Any]) -> None:
+        """Replace a table's contents with rows"""
+        if table_name in self._tables:
+            with self.lock:
+                self.connection.execute(f"DELETE FROM {_quote(table_name)}")
+        table = self.create_table(table_name)
+        with self.lock:
+            self.connection.executemany(table._upsert, (table._params(key, row) for key, row in rows.items()))
+
+    def __delitem__(self, table_name: str) -> None:
+        del self._tables[table_name]
+        with self.lock:
+            self.connection.execute(f"DROP TABLE {_quote(table_name)}")
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._tables))
+
+    def __len__(self) -> int:
+        return len(self._tables)
+
+    def copy(self) -> "SqliteData":
+        """Independent in-memory database holding this one's current contents, uncommitted writes included"""
+        return SqliteData(":memory:", self._image())
+
+    def _image(self) -> bytes:
+        with self.lock:
+            return self.connection.serialize()
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "SqliteData":
+        return self.copy()
+
+    def __reduce__(self):
+        # Pickles carry the database image and load as an in-memory database
+        return (SqliteData, (":memory:", self._image()))
+
+    def commit(self) -> None:
+        with self.lock:
+            self.connection.commit()
+
+    def close(self) -> None:
+        self.commit()
+        self.connection.close()
+
+
+def _rollback_journal(image: bytes) -> bytes:
+    # An in-memory database cannot use WAL: mark the image's header (file format
+    # read/write versions) as a rollback-journal database
+    return image[:18] + b"\x01\x01" + image[20:] if image[18:20] == b"\x02\x02" else image
+
+
+def write_sqlite(data: Dict[str, Dict[str, Dict[str, Any]]], path: str) -> None:
+    """Store every table of data in a SQLite file"""
+    database = SqliteData(path)
+    for table_name, rows in data.items():
+        database[table_name] = rows
+    database.close()
+
+
+def convert_json_dir_to_sqlite(data_dir: str, path: str) -> None:
+    """Build a SQLite file from the data/<table>.json files"""
+    data = {}
+    for file_name in sorted(os.listdir(data_dir)):
+        if file_name.endswith(".json"):
+            with open(os.path.join(data_dir, file_name)) as f:
+                data[file_name[:-len(".json")]] = json.load(f)
+    write_sqlite(data, path)
+
+
+def open_sqlite(path: str) -> SqliteData:
+    return SqliteData(path)
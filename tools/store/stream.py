@@ -0,0 +1,71 @@
+"""Streaming reads for exports and offline analytics.
+
+The generators here take the same filters as find_rows(), which every
+discover/fetch/list/get tool passes through, but hand rows out one at a time
+instead of building a list and a JSON array around it. Rows come in table
+order straight from the query plan, so memory stays flat however many rows
+match (benchmarks/stream_export.py measures it); the projection cache is
+deliberately not used, since an export would fill it with every row of the
+table.
+
+Filters use find_rows()'s keyword forms, not the tools' argument names.
+The tools translate their arguments like this:
+
+    <entity>_id=x                      ids={"<entity>_id": x}      compared as strings
+    status=x, severity=x, ...          status=x, severity=x        plain equality
+    email=x, contact_email=x           casefold={"email": x}       case-insensitive equality
+    vendor_email=x                     casefold={"contact_email": x}
+    client_name=x, product_name=x, ... contains={"client_name": x} case-insensitive substring
+    created_from=a, created_to=b       ranges={"created_at": (a, b)}
+    detection_from=a, detection_to=b   ranges={"detection_timestamp": (a, b)}
+
+Range bounds are inclusive ISO-8601 timestamps; a date alone means midnight.
+As in the tools, a filter whose value is falsy is ignored.
+"""
+import json
+from typing import IO, Any, Dict, Iterator, List, Optional, Tuple
+
+from .planner import QueryPlan, predicates
+from .projection import project, projection_fields
+
+
+def stream_rows(table: Dict[str, Any], fields: Optional[List[str]] = None,
+                ids: Optional[Dict[str, Any]] = None, casefold: Optional[Dict[str, Any]] = None,
+                contains: Optional[Dict[str, Any]] = None,
+                ranges: Optional[Dict[str, Tuple[Optional[str], Optional[str]]]] = None,
+                **criteria: Any) -> Iterator[Dict[str, Any]]:
+    """Rows matching the filters, lazily and in table order, projected onto fields when given"""
+    fields = projection_fields(fields)
+    rows = QueryPlan(table, predicates(ids, casefold, contains, ranges, **criteria)).rows()
+    if fields is None:
+        yield from rows
+    else:
+        for row in rows:
+            yield project(row, fields)
+
+
+def stream_ndjson(table: Dict[str, Any], fields: Optional[List[str]] = None, chunk_size: int = 1,
+                  **filters: Any) -> Iterator[str]:
+    """NDJSON text of stream_rows(), in chunks of up to chunk_size newline-terminated lines"""
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be a positive integer")
+    dumps = json.JSONEncoder().encode
+    chunk: List[str] = []
+    for row in stream_rows(table, fields, **filters):
+        chunk.append(dumps(row))
+        if len(chunk) >= chunk_size:
+            yield "\n".join(chunk) + "\n"
+            chunk = []
+    if chunk:
+        yield "\n".join(chunk) + "\n"
+
+
+def write_ndjson(file: IO[str], table: Dict[str, Any], fields: Optional[List[str]] = None,
+                 chunk_size: int = 1000, **filters: Any) -> int:
+    """Write the rows matching filters to a text file object as NDJSON; returns the row count"""
+    count = 0
+    for chunk in stream_ndjson(table, fields, chunk_size, **filters):
+        file.write(chunk)
+        # Encoded rows escape their newlines, so each one ends exactly one line
+        count += chunk.count("\n")
+    return count
@@ -0,0 +1,389 @@
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from .ids import IdSequence
+from .textindex import TextIndex
+from .timeindex import TimeIndex
+from .trigram import TrigramIndex
+
+# Marks an absent row or field in change notifications
+MISSING = object()
+_EMPTY: Set[str] = frozenset()
+
+
+def index_key(value: Any) -> Optional[str]:
+    """Normalize a column value into a hash index key; None means not indexed"""
+    if value is None or isinstance(value, (dict, list)):
+        return None
+    return str(value)
+
+
+class HashIndex:
+    """Column value -> set of row keys, optionally case-folded"""
+    __slots__ = ("column", "casefold", "unique", "buckets")
+
+    def __init__(self, column: str, casefold: bool = False, unique: bool = False):
+        self.column = column
+        self.casefold = casefold
+        self.unique = unique
+        self.buckets: Dict[str, Set[str]] = {}
+
+    def key(self, value: Any) -> Optional[str]:
+        value = index_key(value)
+        if value is not None and self.casefold:
+            return value.casefold()
+        return value
+
+    def add(self, value: Any, row_key: str) -> None:
+        value = self.key(value)
+        if value is not None:
+            self.buckets.setdefault(value, set()).add(row_key)
+
+    def remove(self, value: Any, row_key: str) -> None:
+        value = self.key(value)
+        bucket = self.buckets.get(value)
+        if bucket is not None:
+            bucket.discard(row_key)
+            if not bucket:
+                del self.buckets[value]
+
+    def get(self, value: Any) -> Set[str]:
+        return self.buckets.get(self.key(value), _EMPTY)
+
+
+class Row(dict):
+    """A table row that reports every field write back to its owning table"""
+    __slots__ = ("_table", "_key")
+
+    def __init__(self, values: Any = (), table: Optional["IndexedTable"] = None,
+                 key: Optional[str] = None):
+        dict.__init__(self, values)
+        self._table = table
+        self._key = key
+
+    def _changed(self, field: str, old: Any, new: Any) -> None:
+        if self._table is not None:
+            self._table._row_changed(self._key, field, old, new)
+
+    def _redirect(self) -> Optional[Dict[str, Any]]:
+        """Private copy to write to instead of this row, when its table is frozen or a copy-on-write view"""
+        table = self._table
+        if table is not None and table.frozen:
+            return table.writable_row(self._key)
+        return None
+
+    def __setitem__(self, field: str, value: Any) -> None:
+        target = self._redirect()
+        if target is not None:
+            target[field] = value
+            return
+        old = dict.get(self, field, MISSING)
+        dict.__setitem__(self, field, value)
+        self._changed(field, old, value)
+
+    def __delitem__(self, field: str) -> None:
+        target = self._redirect()
+        if target is not None:
+            del target[field]
+            return
+        old = dict.pop(self, field)
+        self._changed(field, old, MISSING)
+
+    def pop(self, field: str, *default: Any) -> Any:
+        target = self._redirect()
+        if target is not None:
+            return target.pop(field, *default)
+        if field not in self:
+            return dict.pop(self, field, *default)
+        old = dict.pop(self, field)
+        self._changed(field, old, MISSING)
+        return old
+
+    def popitem(self):
+        target = self._redirect()
+        if target is not None:
+            return target.popitem()
+        field, old = dict.popitem(self)
+        self._changed(field, old, MISSING)
+        return field, old
+
+    def setdefault(self, field: str, default: Any = None) -> Any:
+        target = self._redirect()
+        if target is not None:
+            return target.setdefault(field, default)
+        if field not in self:
+            self[field] = default
+        return dict.__getitem__(self, field)
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        for field, value in dict(*args, **kwargs).items():
+            self[field] = value
+
+    def __ior__(self, other: Any) -> "Row":
+        self.update(other)
+        return self
+
+    def clear(self) -> None:
+        for field in list(self):
+            del self[field]
+
+    def copy(self) -> Dict[str, Any]:
+        return dict(self)
+
+    def __reduce__(self):
+        # Copies and pickles detach from the table and become plain dicts
+        return (dict, (dict(self),))
+
+
+class ViewRow(Row):
+    """Row materialized from a table's own storage; weakly referenceable so the
+    table can keep handing out the same object while a caller holds it"""
+    __slots__ = ("__weakref__",)
+
+
+# Change callback: (table, key, field, old, new). field is None for whole-row
+# inserts, replacements and deletes, where old/new are rows or MISSING.
+Observer = Callable[["IndexedTable", str, Optional[str], Any, Any], None]
+
+
+class IndexedTable(dict):
+    """Rows keyed by primary key, with hash indexes kept current on every write"""
+
+    def __init__(self, name: str, rows: Optional[Dict[str, Any]] = None,
+                 primary_key: Optional[str] = None, indexed_columns: Iterable[str] = (),
+                 unique_columns: Iterable[str] = (), casefold_columns: Iterable[str] = (),
+                 time_columns: Iterable[str] = (), text_columns: Iterable[str] = (),
+                 trigram_columns: Iterable[str] = ()):
+        dict.__init__(self)
+        self.name = name
+        self.primary_key = primary_key
+        self.frozen = False
+        self._indexes: Dict[str, HashIndex] = {}
+        self._column_indexes: Dict[str, List[HashIndex]] = {}
+        self._positions: Dict[str, int] = {}
+        self._next_position = 0
+        self._observers: List[Observer] = []
+        self.ids = IdSequence()
+        self.ids.bind(self)
+        unique_columns = set(unique_columns)
+        for column in indexed_columns:
+            self.add_index(column, unique=column in unique_columns)
+        for column in unique_columns:
+            self.add_index(column, unique=True)
+        for column in casefold_columns:
+            self.add_index(column, casefold=True, unique=column in unique_columns)
+        for column in time_columns:
+            self.add_time_index(column)
+        for column in text_columns:
+            self.add_text_index(column)
+        for column in trigram_columns:
+            self.add_trigram_index(column)
+        if rows:
+            for key, row in rows.items():
+                self[key] = row
+
+    # Index maintenance
+
+    def _index_row(self, key: str, row: Dict[str, Any]) -> None:
+        for index in self._indexes.values():
+            index.add(row.get(index.column), key)
+
+    def _unindex_row(self, key: str, row: Dict[str, Any]) -> None:
+        for index in self._indexes.values():
+            index.remove(row.get(index.column), key)
+
+    def _row_changed(self, key: str, field: str, old: Any, new: Any) -> None:
+        for index in self._column_indexes.get(field, ()):
+            if old is not MISSING and new is not MISSING and index.key(old) == index.key(new):
+                continue
+            if old is not MISSING:
+                index.remove(old, key)
+            if new is not MISSING:
+                index.add(new, key)
+        for observer in self._observers:
+            observer(self, key, field, old, new)
+
+    def _attach(self, key: str, row: Any) -> Row:
+        if not isinstance(row, Row) or row._table is not None:
+            row = Row(row)
+        row._table = self
+        row._key = key
+        return row
+
+    def _detach(self, key: str, row: Row) -> None:
+        self._unindex_row(key, row)
+        row._table = None
+
+    # Mapping writes
+
+    def _check_writable(self) -> None:
+        if self.frozen:
+            raise TypeError(f"table {self.name} is frozen; write through a copy-on-write overlay")
+
+    def writable_row(self, key: str) -> Dict[str, Any]:
+        """The stored row; rows of a frozen table are written through the overlay that served them"""
+        self._check_writable()
+        return dict.__getitem__(self, key)
+
+    def __setitem__(self, key: str, row: Any) -> None:
+        self._check_writable()
+        old = dict.get(self, key)
+        if old is not None:
+            self._detach(key, old)
+        else:
+            self._positions[key] = self._next_position
+            self._next_position += 1
+            self.ids.observe(key)
+        row = self._attach(key, row)
+        dict.__setitem__(self, key, row)
+        self._index_row(key, row)
+        for observer in self._observers:
+            observer(self, key, None, MISSING if old is None else old, row)
+
+    def __delitem__(self, key: str) -> None:
+        self._check_writable()
+        row = dict.pop(self, key)
+        del self._positions[key]
+        self.ids.forget(key)
+        self._detach(key, row)
+        for observer in self._observers:
+            observer(self, key, None, row, MISSING)
+
+    def pop(self, key: str, *default: Any) -> Any:
+        if key not in self:
+            return dict.pop(self, key, *default)
+        row = dict.__getitem__(self, key)
+        del self[key]
+        return row
+
+    def popitem(self):
+        key = next(reversed(self))
+        return key, self.pop(key)
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        if key not in self:
+            self[key] = default if default is not None else {}
+        return dict.__getitem__(self, key)
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        for key, row in dict(*args, **kwargs).items():
+            self[key] = row
+
+    def __ior__(self, other: Any) -> "IndexedTable":
+        self.update(other)
+        return self
+
+    def clear(self) -> None:
+        for key in list(self):
+            del self[key]
+
+    def _index_spec(self):
+        hashed = [i for i in self._indexes.values() if isinstance(i, HashIndex)]
+        indexed = tuple(i.column for i in hashed if not i.casefold)
+        unique = tuple(i.column for i in hashed if i.unique)
+        casefold = tuple(i.column for i in hashed if i.casefold)
+        timed = tuple(i.column for i in self._indexes.values() if isinstance(i, TimeIndex))
+        text = tuple(i.column for i in self._indexes.values() if isinstance(i, TextIndex))
+        trigram = tuple(i.column for i in self._indexes.values() if isinstance(i, TrigramIndex))
+        return indexed, unique, casefold, timed, text, trigram
+
+    def copy(self) -> "IndexedTable":
+        return IndexedTable(self.name, self, self.primary_key, *self._index_spec())
+
+    def __reduce__(self):
+        return (self.__class__, (self.name, dict(self), self.primary_key) + self._index_spec())
+
+    # Change notification
+
+    def subscribe(self, observer: Observer) -> None:
+        """Call observer after every row insert, replace, delete and field write"""
+        self._observers.append(observer)
+
+    def unsubscribe(self, observer: Observer) -> None:
+        self._observers.remove(observer)
+
+    # Index reads
+
+    def add_index(self, column: str, casefold: bool = False, unique: bool = False) -> None:
+        """Start maintaining a hash index on a column, building it from the current rows"""
+        name = f"{column}:casefold" if casefold else column
+        if name in self._indexes:
+            self._indexes[name].unique = self._indexes[name].unique or unique
+            return
+        index = HashIndex(column, casefold, unique)
+        for key, row in dict.items(self):
+            index.add(row.get(column), key)
+        self._indexes[name] = index
+        self._column_indexes.setdefault(column, []).append(index)
+
+    def add_time_index(self, column: str) -> None:
+        """Start maintaining a sorted index on an ISO-8601 timestamp column"""
+        self._add_derived_index(f"{column}:time", TimeIndex(column))
+
+    def add_text_index(self, column: str) -> None:
+        """Start maintaining an inverted full-text index on a text column"""
+        self._add_derived_index(f"{column}:text", TextIndex(column))
+
+    def add_trigram_index(self, column: str) -> None:
+        """Start maintaining a trigram index for case-insensitive substring filters on a column"""
+        self._add_derived_index(f"{column}:trigram", TrigramIndex(column))
+
+    def _add_derived_index(self, name: str, index: Any) -> None:
+        if name in self._indexes:
+            return
+        column = index.column
+        for key, row in dict.items(self):
+            index.add(row.get(column), key)
+        self._indexes[name] = index
+        self._column_indexes.setdefault(column, []).append(index)
+
+    def has_index(self, column: str, casefold: bool = False) -> bool:
+        return (f"{column}:casefold" if casefold else column) in self._indexes
+
+    def has_time_index(self, column: str) -> bool:
+        return f"{column}:time" in self._indexes
+
+    def range_lookup(self, column: str, start: Optional[str] = None, end: Optional[str] = None) -> List[str]:
+        """Keys of the rows whose timestamp column lies within [start, end], oldest first"""
+        return self._indexes[f"{column}:time"].range(start, end)
+
+    def has_trigram_index(self, column: str) -> bool:
+        return f"{column}:trigram" in self._indexes
+
+    def substring_lookup(self, column: str, needle: str) -> Optional[Set[str]]:
+        """Superset of the keys whose column contains needle, ignoring case; None if needle is too short"""
+        return self._indexes[f"{column}:trigram"].candidates(needle)
+
+    def has_text_index(self, column: str) -> bool:
+        return f"{column}:text" in self._indexes
+
+    def text_search(self, column: str, query: str, limit: Optional[int] = 10) -> List[Tuple[str, float]]:
+        """(key, BM25 score) of the rows best matching query in a text column; ties in table order"""
+        return self._indexes[f"{column}:text"].search(query, limit, self._positions.__getitem__)
+
+    def lookup(self, column: str, value: Any, casefold: bool = False) -> Set[str]:
+        """Keys of the rows whose column equals value; the returned set must not be mutated"""
+        return self._indexes[f"{column}:casefold" if casefold else column].get(value)
+
+    def index_buckets(self, column: str) -> Optional[Dict[str, Set[str]]]:
+        """Index key -> keys of the rows holding it for a hash-indexed column; None without an index.
+
+        Rows whose value is None are in no bucket. The mapping must not be mutated.
+        """
+        index = self._indexes.get(column)
+        return index.buckets if index is not None else None
+
+    def unique_columns(self) -> List[str]:
+        return [i.column for i in self._indexes.values() if i.unique and not i.casefold]
+
+    @property
+    def keys_ascending(self) -> bool:
+        """Whether table order is ascending integer key order: each key was inserted above the last"""
+        return self.ids.ascending
+
+    def order_keys(self, keys: Iterable[str]) -> List[str]:
+        """Keys sorted into table order"""
+        return sorted(keys, key=self._positions.__getitem__)
+
+    def rows_for_keys(self, keys: Iterable[str]) -> List[Row]:
+        """Rows for a set of keys, in table order"""
+        return [dict.__getitem__(self, key) for key in self.order_keys(keys)]
@@ -0,0 +1,100 @@
+import heapq
+import math
+import re
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: Any) -> List[str]:
+    """Lowercase alphanumeric terms of a text value"""
+    if not isinstance(text, str):
+        return []
+    return _TOKEN.findall(text.lower())
+
+
+class TextIndex:
+    """Inverted index over a text column: term -> {row key: term frequency}.
+
+    Shares the add/remove/key interface of HashIndex so tables maintain it
+    alongside their other indexes, and ranks rows for a query with BM25.
+    """
+    __slots__ = ("column", "casefold", "unique", "postings", "lengths", "total_length")
+
+    def __init__(self, column: str):
+        self.column = column
+        self.casefold = False
+        self.unique = False
+        self.postings: Dict[str, Dict[str, int]] = {}
+        self.lengths: Dict[str, int] = {}
+        self.total_length = 0
+
+    def key(self, value: Any) -> Tuple[str, ...]:
+        return tuple(tokenize(value))
+
+    def add(self, value: Any, row_key: str) -> None:
+        terms = tokenize(value)
+        if not terms:
+            return
+        for term, count in Counter(terms).items():
+            self.postings.setdefault(term, {})[row_key] = count
+        self.lengths[row_key] = len(terms)
+        self.total_length += len(terms)
+
+    def remove(self, value: Any, row_key: str) -> None:
+        length = self.lengths.pop(row_key, None)
+        if length is None:
+            return
+        self.total_length -= length
+        for term in set(tokenize(value)):
+            posting = self.postings.get(term)
+            if posting is not None:
+                posting.pop(row_key, None)
+                if not posting:
+                    del self.postings[term]
+
+    def idf(self, term: str) -> float:
+        frequency = len(self.postings.get(term, ()))
+        count = len(self.lengths)
+        return math.log(1 + (count - frequency + 0.5) / (frequency + 0.5))
+
+    def search(self, query: str, limit: Optional[int] = 10,
+               tiebreak: Optional[Callable[[str], Any]] = None) -> List[Tuple[str, float]]:
+        """Row keys ranked by BM25 score for query, best first; tiebreak orders equal scores.
+
+        Terms are scored rarest first. Once the best score the remaining terms
+        could add is no higher than the current limit-th score, rows not seen
+        yet cannot reach the top results, so only rows already scored are
+        updated from then on instead of walking whole postings lists.
+        """
+        terms = [term for term in dict.fromkeys(tokenize(query)) if term in self.postings]
+        if not terms or not self.lengths:
+            return []
+        average = self.total_length / len(self.lengths)
+        weights = sorted(((self.idf(term), term) for term in terms), reverse=True)
+        # Upper bound of what terms i.. can add to any row's score
+        remaining = [0.0] * (len(weights) + 1)
+        for i in range(len(weights) - 1, -1, -1):
+            remaining[i] = remaining[i + 1] + weights[i][0] * (K1 + 1)
+
+        scores: Dict[str, float] = {}
+        lengths = self.lengths
+        for i, (idf, term) in enumerate(weights):
+            posting = self.postings[term]
+            if limit and len(scores) >= limit and remaining[i] < heapq.nlargest(limit, scores.values())[-1]:
+                keys = [key for key in scores if key in posting]
+            else:
+                keys = posting
+            for key in keys:
+                frequency = posting[key]
+                norm = K1 * (1 - B + B * lengths[key] / average)
+                scores[key] = scores.get(key, 0.0) + idf * frequency * (K1 + 1) / (frequency + norm)
+
+        tiebreak = tiebreak or str
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], tiebreak(item[0])))
+        return ranked[:limit] if limit else ranked
@@ -0,0 +1,76 @@
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone
+from typing import Any, List, Optional
+
+
+def to_epoch(value: Any) -> Optional[int]:
+    """Seconds since the epoch for an ISO-8601 timestamp or date; naive values are UTC"""
+    if not isinstance(value, str) or not value:
+        return None
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    try:
+        moment = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return int(moment.timestamp())
+
+
+def in_time_range(value: Any, start: Optional[str] = None, end: Optional[str] = None) -> bool:
+    """Whether an ISO-8601 value falls within [start, end]; unset bounds are open"""
+    if not start and not end:
+        return True
+    moment = to_epoch(value)
+    low, high = to_epoch(start), to_epoch(end)
+    if moment is None or (start and low is None) or (end and high is None):
+        return False
+    return (low is None or moment >= low) and (high is None or moment <= high)
+
+
+class TimeIndex:
+    """Row keys sorted by a timestamp column, parsed once into epoch seconds.
+
+    Shares the add/remove/key interface of HashIndex so tables maintain it
+    alongside their hash indexes; rows arriving in time order append at the
+    end. Values that do not parse as ISO-8601 are left out.
+    """
+    __slots__ = ("column", "casefold", "unique", "epochs", "keys")
+
+    def __init__(self, column: str):
+        self.column = column
+        self.casefold = False
+        self.unique = False
+        self.epochs: List[int] = []
+        self.keys: List[str] = []
+
+    def key(self, value: Any) -> Optional[int]:
+        return to_epoch(value)
+
+    def add(self, value: Any, row_key: str) -> None:
+        moment = to_epoch(value)
+        if moment is None:
+            return
+        position = bisect_right(self.epochs, moment)
+        self.epochs.insert(position, moment)
+        self.keys.insert(position, row_key)
+
+    def remove(self, value: Any, row_key: str) -> None:
+        moment = to_epoch(value)
+        if moment is None:
+            return
+        for position in range(bisect_left(self.epochs, moment), bisect_right(self.epochs, moment)):
+            if self.keys[position] == row_key:
+                del self.epochs[position]
+                del self.keys[position]
+                return
+
+    def range(self, start: Optional[str] = None, end: Optional[str] = None) -> List[str]:
+        """Keys of the rows whose timestamp lies within [start, end], oldest first"""
+        low, high = to_epoch(start), to_epoch(end)
+        if (start and low is None) or (end and high is None):
+            return []
+        low = bisect_left(self.epochs, low) if low is not None else 0
+        high = bisect_right(self.epochs, high) if high is not None else len(self.epochs)
+        return self.keys[low:high]
@@ -0,0 +1,181 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+from .cow import CowData
+from .loader import build_table
+from .table import MISSING, IndexedTable
+
+# Undo entry: (table, key, field, old value). field is None for whole-row
+# changes, where old is the previous row or MISSING for an insert.
+UndoEntry = Tuple[IndexedTable, str, Optional[str], Any]
+
+
+class Savepoint:
+    """Position in a transaction's undo log that can be rolled back to or released"""
+
+    def __init__(self, transaction: "Transaction", position: int, ids: Dict[str, Tuple[int, int, bool]]):
+        self.transaction = transaction
+        self.position = position
+        self.ids = ids
+        self.active = True
+
+    def rollback(self) -> None:
+        self.transaction.rollback_to(self)
+
+    def release(self) -> None:
+        self.transaction.release(self)
+
+    def __enter__(self) -> "Savepoint":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        if not self.active:
+            return False
+        if exc_type is None:
+            self.release()
+        else:
+            self.rollback()
+            self.release()
+        return False
+
+
+class Transaction:
+    """Undo log over a data dict, so a multi-step SOP can be rolled back when a later step halts.
+
+    Every row insert, replacement, delete and field write made through the
+    tables is recorded with its previous value; rolling back replays the log
+    backwards through the tables' normal write path, so indexes and id
+    sequences end up as they were. While it is active, next_id() reserves the
+    ids it hands out (see IdSequence). Cost is proportional to the writes made,
+    not to the size of the data. Plain dict tables are converted to indexed
+    tables when the transaction begins. Rows deleted and then restored by a
+    rollback move to the end of their table's iteration order. Copy-on-write
+    overlays (CowData) do not report their writes and are rejected with a
+    TypeError; an overlay is rolled back by dropping it.
+
+        with Transaction(data) as txn:
+            SubmitEscalation.invoke(data, ...)
+            with txn.savepoint():
+                LogAudit.invoke(data, ...)
+    """
+
+    def __init__(self, data: Dict[str, Any]):
+        self._data = data
+        self._log: List[UndoEntry] = []
+        self._savepoints: List[Savepoint] = []
+        self._replaying = False
+        self._tables: Dict[str, IndexedTable] = {}
+        if isinstance(data, CowData):
+            raise TypeError("a copy-on-write overlay cannot be observed by a Transaction; "
+                            "discard an episode's writes by starting a new CowData over the same base")
+        # Check every table before subscribing to any, so a rejected transaction leaves nothing behind
+        for table_name, table in data.items():
+            if not hasattr(table, "subscribe") and type(table) is not dict:
+                raise TypeError(f"table {table_name} of type {type(table).__name__} cannot be observed")
+        for table_name, table in list(data.items()):
+            if not hasattr(table, "subscribe"):
+                table = data[table_name] = build_table(table_name, table)
+            table.subscribe(self._record)
+            table.ids.begin_reservations()
+            self._tables[table_name] = table
+        self._begin = self.savepoint()
+
+    def _record(self, table: IndexedTable, key: str, field: Optional[str], old: Any, new: Any) -> None:
+        if not self._replaying:
+            self._log.append((table, key, field, old))
+
+    @property
+    def active(self) -> bool:
+        return self._begin.active
+
+    def _check_active(self) -> None:
+        if not self.active:
+            raise RuntimeError("transaction already committed or rolled back")
+
+    def changes(self) -> int:
+        """Number of writes recorded so far"""
+        return len(self._log)
+
+    # Savepoints
+
+    def savepoint(self) -> Savepoint:
+        """Mark the current state; rolling back to it undoes only the later writes"""
+        if self._savepoints:
+            self._check_active()
+        ids = {table_name: table.ids.state() for table_name, table in self._tables.items()}
+        savepoint = Savepoint(self, len(self._log), ids)
+        self._savepoints.append(savepoint)
+        return savepoint
+
+    def _check_savepoint(self, savepoint: Savepoint) -> None:
+        self._check_active()
+        if savepoint.transaction is not self or not savepoint.active:
+            raise ValueError("savepoint is not active in this transaction")
+
+    def rollback_to(self, savepoint: Savepoint) -> None:
+        """Undo the writes made since savepoint, which stays active; nested savepoints are released"""
+        self._check_savepoint(savepoint)
+        self._replaying = True
+        try:
+            while len(self._log) > savepoint.position:
+                self._undo(*self._log.pop())
+        finally:
+            self._replaying = False
+        for table_name, state in savepoint.ids.items():
+            self._tables[table_name].ids.restore(state)
+        self._drop_after(savepoint)
+
+    def release(self, savepoint: Savepoint) -> None:
+        """Forget savepoint and those nested in it, keeping their writes"""
+        self._check_savepoint(savepoint)
+        self._drop_after(savepoint)
+        savepoint.active = False
+        self._savepoints.pop()
+
+    def _drop_after(self, savepoint: Savepoint) -> None:
+        while self._savepoints[-1] is not savepoint:
+            self._savepoints.pop().active = False
+
+    @staticmethod
+    def _undo(table: IndexedTable, key: str, field: Optional[str], old: Any) -> None:
+        if field is not None:
+            row = table[key]
+            if old is MISSING:
+                del row[field]
+            else:
+                row[field] = old
+        elif old is MISSING:
+            del table[key]
+        else:
+            table[key] = old
+
+    # Commit / rollback
+
+    def commit(self) -> None:
+        """Keep every write and stop recording"""
+        self._check_active()
+        self._close()
+
+    def rollback(self) -> None:
+        """Undo every write made since the transaction began and stop recording"""
+        self.rollback_to(self._begin)
+        self._close()
+
+    def _close(self) -> None:
+        for table in self._tables.values():
+            table.unsubscribe(self._record)
+            table.ids.end_reservations()
+        for savepoint in self._savepoints:
+            savepoint.active = False
+        self._savepoints.clear()
+        self._log.clear()
+
+    def __enter__(self) -> "Transaction":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        if self.active:
+            if exc_type is None:
+                self.commit()
+            else:
+                self.rollback()
+        return False
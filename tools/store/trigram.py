@@ -0,0 +1,54 @@
+from typing import Any, Dict, FrozenSet, Optional, Set
+
+
+def trigrams(text: Any) -> FrozenSet[str]:
+    """Distinct three-character substrings of a lowercased string value"""
+    if not isinstance(text, str):
+        return frozenset()
+    text = text.lower()
+    return frozenset(text[i:i + 3] for i in range(len(text) - 2))
+
+
+class TrigramIndex:
+    """Row keys by the trigrams of a lowercased string column.
+
+    Shares the add/remove/key interface of HashIndex so tables maintain it
+    alongside their other indexes. A row whose value contains a needle
+    contains every trigram of the needle, so intersecting their posting sets
+    gives a superset of the rows matching a case-insensitive substring filter.
+    """
+    __slots__ = ("column", "casefold", "unique", "postings")
+
+    def __init__(self, column: str):
+        self.column = column
+        self.casefold = True
+        self.unique = False
+        self.postings: Dict[str, Set[str]] = {}
+
+    def key(self, value: Any) -> FrozenSet[str]:
+        return trigrams(value)
+
+    def add(self, value: Any, row_key: str) -> None:
+        for gram in trigrams(value):
+            self.postings.setdefault(gram, set()).add(row_key)
+
+    def remove(self, value: Any, row_key: str) -> None:
+        for gram in trigrams(value):
+            posting = self.postings.get(gram)
+            if posting is not None:
+                posting.discard(row_key)
+                if not posting:
+                    del self.postings[gram]
+
+    def candidates(self, needle: str) -> Optional[Set[str]]:
+        """Keys of the rows that may contain needle, or None when it is under three characters"""
+        grams = trigrams(needle)
+        if not grams:
+            return None
+        postings = sorted((self.postings.get(gram, set()) for gram in grams), key=len)
+        keys = set(postings[0])
+        for posting in postings[1:]:
+            if not keys:
+                break
+            keys &= posting
+        return keys
@@ -0,0 +1,221 @@
+"""Write-ahead log of row-level mutations, with checkpoints into the table files.
+
+The log is an append-only file of JSON lines, one per mutation:
+
+    {"lsn": 7, "op": "put", "table": "incidents", "key": "41", "row": {...}}
+    {"lsn": 8, "op": "set", "table": "incidents", "key": "41", "field": "status", "value": "resolved"}
+    {"lsn": 9, "op": "unset", "table": "incidents", "key": "41", "field": "closed_at"}
+    {"lsn": 10, "op": "del", "table": "incidents", "key": "41"}
+
+Every record carries absolute values, so replaying a record twice is harmless.
+A checkpoint rewrites the tables named in the log since the previous checkpoint,
+records the last applied LSN in wal.checkpoint next to the table files, and
+truncates the log. Recovery loads the table files and replays only the records
+past that LSN; a torn final line left by a crash is discarded.
+"""
+import json
+import os
+import threading
+from typing import Any, Dict, Iterator, List, Optional
+
+from .lazy import LazyData
+from .loader import build_table, save_table, subscribe_tables, write_json_atomic
+from .schema import DATA_DIR
+from .table import MISSING, IndexedTable
+
+CHECKPOINT_FILE = "wal.checkpoint"
+LOG_FILE = "wal.log"
+
+
+def read_checkpoint_lsn(data_dir: str) -> int:
+    """LSN of the last mutation already contained in the table files"""
+    path = os.path.join(data_dir, CHECKPOINT_FILE)
+    if not os.path.exists(path):
+        return 0
+    with open(path) as f:
+        return json.load(f)["lsn"]
+
+
+def read_log(path: str) -> Iterator[Dict[str, Any]]:
+    """Records of a log file in order, stopping at a torn trailing line"""
+    if not os.path.exists(path):
+        return
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                return
+            try:
+                yield json.loads(line)
+            except ValueError:
+                return
+
+
+def apply_record(data: Dict[str, Any], record: Dict[str, Any]) -> None:
+    """Redo one logged mutation against a data dict"""
+    table_name, key, op = record["table"], record["key"], record["op"]
+    if table_name not in data:
+        data[table_name] = build_table(table_name)
+    table = data[table_name]
+    if op == "put":
+        table[key] = record["row"]
+    elif op == "del":
+        table.pop(key, None)
+    elif key in table:
+        if op == "set":
+            table[key][record["field"]] = record["value"]
+        else:
+            table[key].pop(record["field"], None)
+
+
+class WriteAheadLog:
+    """Append-only, group-committed log of the writes made to a data dict's tables.
+
+    Mutations are encoded as they happen and buffered in memory; sync() writes
+    the buffer and fsyncs once for every record appended so far, so concurrent
+    callers waiting on the same fsync share it. The buffer is also synced on its
+    own once batch_size records are pending. commit() is the durability point
+    to call after each tool invocation: it syncs, then checkpoints once
+    checkpoint_every records have accumulated since the last checkpoint.
+    """
+
+    def __init__(self, data_dir: str = DATA_DIR, log_path: Optional[str] = None,
+                 batch_size: int = 256, checkpoint_every: int = 10000):
+        self.data_dir = data_dir
+        self.log_path = log_path or os.path.join(data_dir, LOG_FILE)
+        self.batch_size = batch_size
+        self.checkpoint_every = checkpoint_every
+        self.checkpoint_lsn = read_checkpoint_lsn(data_dir)
+        self._data: Optional[Dict[str, Any]] = None
+        self._subscribed: List[Any] = []
+        self._lock = threading.Lock()
+        self._synced = threading.Condition(self._lock)
+        self._syncing = False
+        self._buffer: List[str] = []
+        self._logged_tables: Dict[str, None] = {}
+        self.lsn = self.checkpoint_lsn
+        self.synced_lsn = self.checkpoint_lsn
+        for record in read_log(self.log_path):
+            self.lsn = self.synced_lsn = max(self.lsn, record["lsn"])
+        self._file = open(self.log_path, "ab")
+
+    # Recovery and attachment
+
+    def recover(self, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Replay the log tail over the checkpointed tables and start logging their writes.
+
+        data defaults to a LazyData over data_dir, so only the tables named in
+        the tail are read before the first tool call.
+        """
+        if data is None:
+            data = LazyData(self.data_dir)
+        for record in read_log(self.log_path):
+            if record["lsn"] > self.checkpoint_lsn:
+                apply_record(data, record)
+                self._logged_tables[record["table"]] = None
+        # Drop any torn tail so later appends start on a clean line
+        self._file.truncate(self._valid_length())
+        self.attach(data)
+        return data
+
+    def _valid_length(self) -> int:
+        length = 0
+        with open(self.log_path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    json.loads(line)
+                except ValueError:
+                    break
+                length += len(line)
+        return length
+
+    def attach(self, data: Dict[str, Any]) -> None:
+        """Log every later write to the tables of data"""
+        self._data = data
+        self._subscribed = subscribe_tables(data, self._record)
+
+    def close(self) -> None:
+        self.sync()
+        for subscribed in self._subscribed:
+            subscribed.unsubscribe(self._record)
+        self._subscribed = []
+        self._file.close()
+
+    # Appending
+
+    def _record(self, table: IndexedTable, key: str, field: Optional[str], old: Any, new: Any) -> None:
+        record: Dict[str, Any] = {"table": table.name, "key": key}
+        if field is None:
+            if new is MISSING:
+                record["op"] = "del"
+            else:
+                record["op"], record["row"] = "put", new
+        elif new is MISSING:
+            record["op"], record["field"] = "unset", field
+        else:
+            record["op"], record["field"], record["value"] = "set", field, new
+        self.append(record)
+
+    def append(self, record: Dict[str, Any]) -> int:
+        """Buffer one record and return its LSN"""
+        with self._lock:
+            self.lsn += 1
+            lsn = self.lsn
+            self._buffer.append(json.dumps({"lsn": lsn, **record}, default=str) + "\n")
+            self._logged_tables[record["table"]] = None
+            pending = len(self._buffer)
+        if pending >= self.batch_size:
+            self.sync(lsn)
+        return lsn
+
+    def sync(self, lsn: Optional[int] = None) -> None:
+        """Make every record up to lsn (default: all appended) durable"""
+        with self._lock:
+            target = self.lsn if lsn is None else lsn
+            while self.synced_lsn < target:
+                if self._syncing:
+                    # Another caller is writing; its fsync may already cover target
+                    self._synced.wait()
+                    continue
+                self._syncing = True
+                buffer, self._buffer, batch_lsn = self._buffer, [], self.lsn
+                self._lock.release()
+                try:
+                    self._file.write("".join(buffer).encode())
+                    self._file.flush()
+                    os.fsync(self._file.fileno())
+                finally:
+                    self._lock.acquire()
+                    self._syncing = False
+                    self._synced.notify_all()
+                self.synced_lsn = batch_lsn
+
+    def commit(self) -> None:
+        """Durability point after a tool call: sync, and checkpoint when the log has grown"""
+        self.sync()
+        if self.lsn - self.checkpoint_lsn >= self.checkpoint_every:
+            self.checkpoint()
+
+    # Checkpointing
+
+    def checkpoint(self) -> List[str]:
+        """Rewrite the tables logged since the last checkpoint, then truncate the log.
+
+        Callers must not write to the tables while a checkpoint runs. Returns
+        the names of the tables written.
+        """
+        self.sync()
+        with self._lock:
+            lsn = self.lsn
+            table_names = [name for name in self._logged_tables if name in self._data]
+            self._logged_tables = {}
+        for table_name in table_names:
+            save_table(table_name, self._data[table_name], self.data_dir)
+        write_json_atomic(os.path.join(self.data_dir, CHECKPOINT_FILE), {"lsn": lsn})
+        with self._lock:
+            # Records appended meanwhile stay in the log; replay skips the rest
+            if self.lsn == lsn and not self._buffer:
+                self._file.truncate(0)
+            self.checkpoint_lsn = lsn
+        return table_names